@@ -0,0 +1,75 @@
+# benchmarks/backup_benchmark.py
+# -*- coding: utf-8 -*-
+"""
+Misst die Dauer und Größe eines Backup-Archivs für einen erzeugten Ausgabeordner.
+
+Verglichen werden das bisherige Schreiben (alle Dateien nacheinander mit ZIP_DEFLATED)
+und der ParallelerZipSchreiber (DOCX nur gespeichert, übrige Dateien parallel komprimiert).
+Neben den Berichten enthält der Korpus eine Datenbank-ähnliche Datei und JSON-Dateien,
+die sich gut komprimieren lassen.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.backup_benchmark [Anzahl Berichte]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+from benchmarks.import_benchmark import erzeuge_korpus
+from services.zip_schreiber import ParallelerZipSchreiber
+
+
+def erzeuge_daten(ordner: str, anzahl: int) -> list:
+    """Schreibt komprimierbare Dateien: eine große Binärdatei mit Wiederholungen und JSON-Dateien."""
+    pfade = []
+    datenbank = os.path.join(ordner, "berichtsheft.db")
+    with open(datenbank, "wb") as f:
+        for i in range(anzahl * 20):
+            f.write(f"Bericht {i}: Umsetzung, Tests und Dokumentation;".encode() * 40 + os.urandom(64))
+    pfade.append(datenbank)
+    for i in range(anzahl // 10 or 1):
+        pfad = os.path.join(ordner, f"daten_{i}.json")
+        with open(pfad, "w", encoding="utf-8") as f:
+            json.dump([{"woche": w, "taetigkeiten": "Tests und Dokumentation " * 20} for w in range(200)], f)
+        pfade.append(pfad)
+    return pfade
+
+
+def miss(bezeichnung: str, ziel: str, schreibe) -> float:
+    """Schreibt das Archiv mit der angegebenen Funktion und gibt Dauer und Größe aus."""
+    start = time.perf_counter()
+    with zipfile.ZipFile(ziel, "w", zipfile.ZIP_DEFLATED) as zipf:
+        schreibe(zipf)
+    dauer = time.perf_counter() - start
+    with zipfile.ZipFile(ziel) as zipf:
+        assert zipf.testzip() is None
+    print(f"{bezeichnung:<10} {dauer:6.2f} s  {os.path.getsize(ziel) / (1 << 20):7.1f} MB")
+    return dauer
+
+
+def main() -> None:
+    anzahl = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    with tempfile.TemporaryDirectory() as ordner:
+        print(f"Erzeuge {anzahl} Berichte und Datendateien...")
+        pfade = erzeuge_korpus(ordner, anzahl) + erzeuge_daten(ordner, anzahl)
+        namen = [(pfad, os.path.relpath(pfad, ordner)) for pfad in pfade]
+
+        def bisher(zipf: zipfile.ZipFile) -> None:
+            for pfad, name in namen:
+                zipf.write(pfad, arcname=name)
+
+        def parallel(zipf: zipfile.ZipFile) -> None:
+            with ParallelerZipSchreiber(zipf) as schreiber:
+                for pfad, name in namen:
+                    schreiber.schreibe(pfad, name)
+
+        langsam = miss("bisher", os.path.join(ordner, "bisher.zip"), bisher)
+        schnell = miss("parallel", os.path.join(ordner, "parallel.zip"), parallel)
+        print(f"Faktor: {langsam / schnell:.1f}x ({os.cpu_count()} CPU-Kerne)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/import_benchmark.py
+# -*- coding: utf-8 -*-
+"""
+Misst den Durchsatz des DOCX-Imports (Dateien pro Sekunde) auf einem erzeugten Korpus.
+
+Verglichen werden das Einlesen mit python-docx und das gestreamte Einlesen mit
+`iterparse`; beide Wege verwenden dieselbe Auswertung der Absätze.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.import_benchmark [Anzahl Dateien]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from docx import Document
+
+from generators.docx_generator import DocxGenerator
+from services import docx_stream
+from services.importer_service import ImporterService
+
+
+def erzeuge_korpus(ordner: str, anzahl: int) -> list:
+    """Schreibt `anzahl` Berichte mit unterschiedlich langen Tätigkeitslisten als DOCX-Dateien."""
+    pfade = []
+    for i in range(anzahl):
+        taetigkeiten = "\n".join(f"Tätigkeit {j} in Woche {i}: Umsetzung, Tests und Dokumentation" for j in range(1 + i % 8))
+        context = {
+            "fortlaufende_nr": i + 1,
+            "name_azubi": "Max Mustermann",
+            "zeitraum_von": "07.10.2024",
+            "zeitraum_bis": "11.10.2024",
+            "ausbildungsjahr": 1 + i // 52,
+            "tage_daten": [{"typ": "Betrieb", "stunden": "08:00", "taetigkeiten": taetigkeiten}] * 5,
+        }
+        pfad = os.path.join(ordner, f"bericht_{i:04d}.docx")
+        with open(pfad, "wb") as f:
+            DocxGenerator(context).render_to_stream(f)
+        pfade.append(pfad)
+    return pfade
+
+
+def miss(bezeichnung: str, pfade: list, lesen) -> float:
+    """Wertet alle Dateien mit der angegebenen Lesefunktion aus und gibt die Dauer aus."""
+    service = ImporterService()
+    start = time.perf_counter()
+    for pfad in pfade:
+        context, fehler = service.analysiere_absaetze(lesen(pfad))
+        assert context is not None, fehler
+    dauer = time.perf_counter() - start
+    print(f"{bezeichnung:<12} {dauer:6.2f} s  {len(pfade) / dauer:8.1f} Dateien/s")
+    return dauer
+
+
+def main() -> None:
+    anzahl = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with tempfile.TemporaryDirectory() as ordner:
+        print(f"Erzeuge {anzahl} Berichte...")
+        pfade = erzeuge_korpus(ordner, anzahl)
+        langsam = miss("python-docx", pfade, lambda pfad: (p.text for p in Document(pfad).paragraphs))
+        schnell = miss("iterparse", pfade, docx_stream.lies_absaetze)
+        print(f"Faktor: {langsam / schnell:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
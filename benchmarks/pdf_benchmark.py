@@ -0,0 +1,94 @@
+# benchmarks/pdf_benchmark.py
+# -*- coding: utf-8 -*-
+"""
+Misst die Dauer der PDF-Erstellung für erzeugte Berichte.
+
+Verglichen werden die bisherige Ausgabe der Tätigkeiten (ein `multi_cell` pro
+Aufzählungspunkt, fpdf misst jeden Text neu aus) und der vorberechnete Umbruch aus
+generators.pdf_layout (Zeichenbreiten-Tabelle und Umbruch-Cache, danach nur `cell`).
+Wie in echten Berichtsheften wiederholen sich die Tätigkeiten von Woche zu Woche.
+Vorab wird geprüft, dass beide Wege dieselben Zeilen liefern.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.pdf_benchmark [Anzahl Berichte]
+"""
+import sys
+import time
+
+from fpdf.enums import XPos, YPos
+
+from generators.layout import leere_cache
+from generators.pdf_generator import PdfGenerator
+from generators.pdf_layout import leere_caches, zeilen_umbrechen
+
+# Wiederkehrende Tätigkeiten, wie sie Woche für Woche in Berichten stehen
+_TAETIGKEITEN = [
+    "Code-Review",
+    "Besprechung mit dem Ausbilder über das Lernfeld Netzwerktechnik und die Projektplanung",
+    "Umsetzung neuer Funktionen in der Kundenverwaltung inklusive Tests und Dokumentation",
+    "Fehleranalyse im Ticketsystem",
+    "Einrichtung und Konfiguration eines Testservers für die Abteilung Vertrieb",
+]
+
+
+class MultiCellPdfGenerator(PdfGenerator):
+    """Der bisherige Weg: jeder Aufzählungspunkt wird mit `multi_cell` umbrochen und ausgegeben."""
+    def _create_body(self) -> None:
+        for tag in self.layout.tage:
+            self._zeile(tag.ueberschrift, 7)
+            self.pdf.set_font('Verdana', '', 11)
+            for punkt in tag.punkte:
+                self.pdf.multi_cell(0, 6, f"• {punkt.text}", 0, align='L',
+                                    new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+
+def erzeuge_kontexte(anzahl: int) -> list:
+    """Erzeugt Render-Kontexte mit wechselnden Kombinationen der wiederkehrenden Tätigkeiten."""
+    kontexte = []
+    for i in range(anzahl):
+        tage = []
+        for tag in range(5):
+            punkte = [_TAETIGKEITEN[(i + tag + j) % len(_TAETIGKEITEN)] for j in range(1 + (i + tag) % 4)]
+            tage.append({"typ": "Betrieb", "stunden": "08:00", "taetigkeiten": "\n".join(punkte)})
+        kontexte.append({
+            "fortlaufende_nr": i + 1, "name_azubi": "Max Mustermann", "zeitraum_von": "07.10.2024",
+            "zeitraum_bis": "11.10.2024", "ausbildungsjahr": 1 + i // 52, "tage_daten": tage,
+        })
+    return kontexte
+
+
+def pruefe_gleiche_zeilen() -> None:
+    """Stellt sicher, dass der vorberechnete Umbruch dieselben Zeilen wie `multi_cell` liefert."""
+    generator = PdfGenerator({})
+    generator._setup_document()
+    pdf = generator.pdf
+    pdf.set_font('Verdana', '', 11)
+    for text in _TAETIGKEITEN:
+        assert list(zeilen_umbrechen(pdf, f"• {text}")) == pdf.multi_cell(
+            0, 6, f"• {text}", dry_run=True, output="LINES"), text
+
+
+def miss(bezeichnung: str, generator_klasse, kontexte: list) -> float:
+    """Erstellt alle Berichte als PDF im Speicher und gibt die Dauer aus."""
+    leere_cache()
+    leere_caches()
+    start = time.perf_counter()
+    for kontext in kontexte:
+        generator_klasse(kontext).render_to_bytes()
+    dauer = time.perf_counter() - start
+    print(f"{bezeichnung:<12} {dauer:6.2f} s  {len(kontexte) / dauer:8.1f} Berichte/s")
+    return dauer
+
+
+def main() -> None:
+    anzahl = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pruefe_gleiche_zeilen()
+    kontexte = erzeuge_kontexte(anzahl)
+    print(f"Erstelle {anzahl} PDF-Berichte...")
+    langsam = miss("multi_cell", MultiCellPdfGenerator, kontexte)
+    schnell = miss("vorberechnet", PdfGenerator, kontexte)
+    print(f"Faktor: {langsam / schnell:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ Zentrale Konfigurationsdatei für Konstanten und Einstellungen.
 
 import os
 import sys
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 import customtkinter as ctk
 
 # --- Anwendungsinformationen ---
@@ -47,6 +47,8 @@ ICON_FILE: str = os.path.join(ASSETS_FOLDER, "icon.ico")
 
 # --- Kernlogik ---
 DAYS_IN_WEEK: List[str] = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag"]
+# Rollen mit Unterschriftsfeld in der Fußzeile (Schlüssel -> Bezeichnung im Dokument)
+SIGNATURE_ROLES: Dict[str, str] = {"azubi": "Auszubildender", "ausbilder": "Ausbildender bzw. Ausbilder"}
 
 # --- GUI-Schriftarten und -Größen ---
 def get_ui_font() -> str:
@@ -4,20 +4,37 @@
 Steuert die Anwendungslogik und agiert als Bindeglied zwischen GUI und Daten.
 """
 import logging
-from datetime import date
-from typing import Dict, Any, Tuple, List
+from datetime import date, datetime
+from typing import Callable, Dict, Any, Tuple, List, Iterable, Iterator, Optional, Type, TYPE_CHECKING
 import os
+import threading
+import zipfile
 
+from core import config
 from core.logic import BerichtsheftLogik
 from core.data_manager import DataManager
-from generators.docx_generator import DocxGenerator
-from generators.pdf_generator import PdfGenerator
-from services.backup_service import BackupService
-from services.importer_service import ImporterService
+from generators import bild_cache, registry
+from generators.base_generator import BaseGenerator, GenerierungAbgebrochen, ProgressCallback
+
+# Die Dienste und Generatoren werden erst bei Bedarf importiert, damit python-docx,
+# lxml und fpdf den Programmstart nicht verlangsamen.
+if TYPE_CHECKING:
+    from services.backup_service import BackupService
+    from services.importer_service import ImporterService, ImportPlan
+    from services.migration_service import MigrationService, MigrationsCallback
 
 # Logger für dieses Modul initialisieren
 logger = logging.getLogger(__name__)
 
+# Zustand der Ausgabedatei eines Berichts laut Ausgabe-Index
+AUSGABE_AKTUELL = "aktuell"
+AUSGABE_VERALTET = "veraltet"
+AUSGABE_FEHLT = "fehlt"
+
+# Verarbeitete Dateien pro Schreibvorgang ins Import-Journal bzw. Berichte pro Transaktion beim Speichern
+_IMPORT_JOURNAL_BATCH = 50
+_IMPORT_SPEICHER_BATCH = 200
+
 class AppController:
     """
     Das "Gehirn" der Anwendung. Kapselt die Hauptlogik.
@@ -30,17 +47,47 @@ class AppController:
             data_manager: Eine Instanz des DataManagers für den Datenzugriff.
         """
         self.data_manager = data_manager
-        self.backup_service = BackupService(self.data_manager) # DataManager übergeben
-        self.importer_service = ImporterService()
+        self._backup_service: Optional["BackupService"] = None
+        self._importer_service: Optional["ImporterService"] = None
+        self._migration_service: Optional["MigrationService"] = None
         logger.info("AppController wurde initialisiert.")
 
-    def create_report(self, context: Dict[str, Any], format: str) -> Tuple[bool, str]:
+    @property
+    def backup_service(self) -> "BackupService":
+        """Erzeugt den BackupService beim ersten Zugriff."""
+        if self._backup_service is None:
+            from services.backup_service import BackupService
+            self._backup_service = BackupService(self.data_manager) # DataManager übergeben
+        return self._backup_service
+
+    @property
+    def importer_service(self) -> "ImporterService":
+        """Erzeugt den ImporterService (und lädt damit python-docx) beim ersten Zugriff."""
+        if self._importer_service is None:
+            from services.importer_service import ImporterService
+            self._importer_service = ImporterService(self.data_manager)
+        return self._importer_service
+
+    @property
+    def migration_service(self) -> "MigrationService":
+        """Erzeugt den MigrationService für die alten JSON-Dateien beim ersten Zugriff."""
+        if self._migration_service is None:
+            from services.migration_service import MigrationService
+            self._migration_service = MigrationService(self.data_manager)
+        return self._migration_service
+
+    def create_report(self, context: Dict[str, Any], format: str,
+                      progress_callback: Optional[ProgressCallback] = None,
+                      cancel_event: Optional[threading.Event] = None) -> Tuple[bool, str]:
         """
         Validiert die Daten, erstellt den Bericht und speichert Konfiguration sowie Statistik.
+        Kann aus einem Hintergrund-Thread aufgerufen werden.
 
         Args:
             context: Die aus der GUI gesammelten Daten.
-            format: Das gewünschte Ausgabeformat ("docx" oder "pdf").
+            format: Das gewünschte Ausgabeformat (ein registrierter Formatschlüssel, z.B. "docx").
+            progress_callback: Optionaler Callback für den Fortschritt der einzelnen Schritte.
+            cancel_event: Optionales Event zum Abbrechen, solange die Datei noch nicht geschrieben ist.
 
         Returns:
             Ein Tupel bestehend aus einem Boolean für den Erfolg und einer Statusnachricht.
@@ -50,27 +97,24 @@ class AppController:
             # 1. Daten anreichern und validieren (wird bereits in sammle_daten erledigt)
             # Hier wird angenommen, dass 'context' bereits alle nötigen Daten enthält.
             
-            # 2. Dateinamen generieren
-            logic = BerichtsheftLogik()
-            dateiname_basis = logic.generate_filename(
-                ausbildungsjahr=context["ausbildungsjahr"],
-                kw=context["kalenderwoche"],
-                jahr=context["jahr"],
-                name_azubi=context["name_azubi"],
-                fortlauf_nr=context["fortlaufende_nr"]
-            )
-            dateiname = f"{dateiname_basis}.{format}"
+            # 2. Dateinamen generieren und hinterlegte Unterschriftsbilder ergänzen
+            dateiname = self._erzeuge_dateiname(context, format)
+            self.ergaenze_unterschriften(context)
+            self.ergaenze_vorlage(context, format)
             logger.debug(f"Dateiname generiert: {dateiname}")
 
             # 3. Passenden Generator auswählen und ausführen
-            generator = DocxGenerator(context) if format == "docx" else PdfGenerator(context)
-            generator.generate(dateiname)
+            generator_klasse = self._generator_fuer(context, format)
+            generator_klasse(context).generate(dateiname, progress_callback, cancel_event)
 
             # 4. Daten in der Datenbank speichern (wird jetzt separat gehandhabt)
             self.speichere_bericht_daten(context)
+            self._aktualisiere_manifest(context, format, generator_klasse.GENERATOR_VERSION, dateiname)
 
             return True, f"Bericht '{dateiname}' erfolgreich erstellt!"
 
+        except GenerierungAbgebrochen:
+            return False, "Die Berichtserstellung wurde abgebrochen."
         except ValueError as e:
             logger.error(f"Ungültige Daten bei der Berichtserstellung: {e}", exc_info=True)
             return False, f"Fehler in den Eingabedaten: {e}"
@@ -104,6 +148,402 @@ class AppController:
             return False, "Ein Fehler ist beim Speichern aufgetreten. Details in der Log-Datei."
 
 
+    @staticmethod
+    def _erzeuge_dateiname(context: Dict[str, Any], format: str) -> str:
+        """Erzeugt den Dateinamen (inkl. Endung) für einen Bericht."""
+        dateiname_basis = BerichtsheftLogik.generate_filename(
+            ausbildungsjahr=context["ausbildungsjahr"],
+            kw=int(context["kalenderwoche"]),
+            jahr=int(context["jahr"]),
+            name_azubi=context["name_azubi"],
+            fortlauf_nr=int(context["fortlaufende_nr"])
+        )
+        return f"{dateiname_basis}.{format}"
+
+    @staticmethod
+    def _waehle_generator_klasse(format: str) -> Type[BaseGenerator]:
+        """Gibt die Generator-Klasse für das gewünschte Format aus der Registry zurück."""
+        return registry.lade_generator_klasse(format)
+
+    def _generator_fuer(self, context: Dict[str, Any], format: str) -> Type[BaseGenerator]:
+        """Wie _waehle_generator_klasse, berücksichtigt aber eine im Kontext hinterlegte DOCX-Vorlage."""
+        if format == "docx" and context.get("docx_vorlage"):
+            from generators.docx_template import DocxVorlagenGenerator
+            return DocxVorlagenGenerator
+        return self._waehle_generator_klasse(format)
+
+    @staticmethod
+    def _bericht_id(context: Dict[str, Any]) -> str:
+        """Bildet die Bericht-ID (z.B. "2024-39") aus Jahr und Kalenderwoche."""
+        return f"{context['jahr']}-{int(context['kalenderwoche']):02d}"
+
+    def _aktualisiere_manifest(self, context: Dict[str, Any], format: str, generator_version: str, dateiname: str) -> None:
+        """Hält im Ausgabe-Index fest, mit welchem Inhalt die Ausgabedatei erzeugt wurde."""
+        inhalt_hash = BerichtsheftLogik.berechne_inhalts_hash(context)
+        self._speichere_index_eintrag(self._bericht_id(context), format, inhalt_hash, generator_version, dateiname)
+
+    def _speichere_index_eintrag(self, bericht_id: str, format: str, inhalt_hash: str,
+                                 generator_version: str, dateiname: str) -> None:
+        """Speichert den Index-Eintrag einer soeben geschriebenen Datei samt Größe und Änderungszeit."""
+        try:
+            stat = os.stat(os.path.join(config.OUTPUT_FOLDER, dateiname))
+            groesse, mtime = stat.st_size, stat.st_mtime
+        except OSError:
+            logger.warning(f"Ausgabedatei '{dateiname}' konnte nicht gelesen werden.", exc_info=True)
+            groesse, mtime = None, None
+        if not self.data_manager.speichere_manifest_eintrag(
+                bericht_id, format, inhalt_hash, generator_version, dateiname, groesse, mtime):
+            logger.warning(f"Manifest-Eintrag für '{dateiname}' konnte nicht gespeichert werden.")
+
+    @staticmethod
+    def _scanne_ausgabeordner() -> Dict[str, os.stat_result]:
+        """Liest den Ausgabeordner in einem einzigen Durchlauf ein (Dateiname -> stat)."""
+        try:
+            with os.scandir(config.OUTPUT_FOLDER) as eintraege:
+                return {eintrag.name: eintrag.stat() for eintrag in eintraege if eintrag.is_file()}
+        except FileNotFoundError:
+            return {}
+
+    def gleiche_ausgabe_index_ab(self) -> int:
+        """
+        Gleicht den Ausgabe-Index beim Programmstart mit dem Ausgabeordner ab.
+        Einträge, deren Datei nicht mehr existiert, werden entfernt; Einträge aus älteren
+        Versionen ohne Größe und Änderungszeit werden mit den Werten der Datei ergänzt.
+
+        Returns:
+            Die Anzahl der entfernten Einträge.
+        """
+        dateien = self._scanne_ausgabeordner()
+        entfernen, dateiinfos = [], []
+        for schluessel, eintrag in self.data_manager.lade_ausgabe_manifest().items():
+            stat = dateien.get(eintrag["dateiname"])
+            if stat is None:
+                entfernen.append(schluessel)
+            elif eintrag["groesse"] is None:
+                dateiinfos.append((stat.st_size, stat.st_mtime, *schluessel))
+
+        if (entfernen or dateiinfos) and self.data_manager.gleiche_manifest_ab(entfernen, dateiinfos):
+            logger.info(f"Ausgabe-Index abgeglichen: {len(entfernen)} fehlende Dateien entfernt, "
+                        f"{len(dateiinfos)} Einträge ergänzt.")
+        return len(entfernen)
+
+    def _lade_unterschriften(self) -> Dict[str, str]:
+        """
+        Gibt die Schlüssel der hinterlegten Unterschriftsbilder zurück (Rolle -> SHA-256).
+        Bilder, die in diesem Prozess noch nicht vorbereitet wurden, werden dabei einmalig
+        aus der Datenbank geladen und in den Bild-Cache gelegt.
+        """
+        schluessel = self.data_manager.lade_unterschrift_schluessel()
+        for rolle, sha in list(schluessel.items()):
+            if bild_cache.ist_geladen(sha):
+                continue
+            daten = self.data_manager.lade_unterschrift(rolle)
+            try:
+                if daten is None:
+                    raise ValueError("Keine Bilddaten vorhanden.")
+                bild_cache.registriere_bild(daten)
+            except ValueError as e:
+                logger.warning(f"Unterschrift '{rolle}' kann nicht verwendet werden: {e}")
+                del schluessel[rolle]
+        return schluessel
+
+    def ergaenze_unterschriften(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Ergänzt den Kontext um die Schlüssel der hinterlegten Unterschriftsbilder (falls vorhanden)."""
+        unterschriften = self._lade_unterschriften()
+        if unterschriften:
+            context["unterschriften"] = unterschriften
+        else:
+            context.pop("unterschriften", None)
+        return context
+
+    def speichere_unterschrift(self, rolle: str, pfad: str) -> Tuple[bool, str]:
+        """
+        Liest ein Unterschriftsbild ein, prüft es und speichert es für die angegebene Rolle.
+
+        Args:
+            rolle: Ein Schlüssel aus config.SIGNATURE_ROLES ("azubi" oder "ausbilder").
+            pfad: Der Pfad zur Bilddatei.
+
+        Returns:
+            Ein Tupel aus Erfolg und Statusnachricht.
+        """
+        if rolle not in config.SIGNATURE_ROLES:
+            return False, f"Unbekannte Rolle: '{rolle}'"
+        try:
+            with open(pfad, "rb") as f:
+                daten = f.read()
+            sha = bild_cache.registriere_bild(daten)
+        except OSError as e:
+            logger.error(f"Unterschriftsbild '{pfad}' konnte nicht gelesen werden.", exc_info=True)
+            return False, f"Die Datei konnte nicht gelesen werden: {e}"
+        except ValueError as e:
+            return False, str(e)
+
+        if not self.data_manager.speichere_unterschrift(rolle, daten, sha):
+            return False, "Die Unterschrift konnte nicht gespeichert werden. Details in der Log-Datei."
+        return True, f"Unterschrift für '{config.SIGNATURE_ROLES[rolle]}' gespeichert."
+
+    def entferne_unterschrift(self, rolle: str) -> bool:
+        """Entfernt das Unterschriftsbild einer Rolle."""
+        return self.data_manager.loesche_unterschrift(rolle)
+
+    def _lade_docx_vorlage(self) -> Optional[Dict[str, str]]:
+        """
+        Gibt Pfad und SHA-256 der eingestellten DOCX-Vorlage zurück oder None, wenn keine
+        Vorlage eingestellt ist bzw. die Datei nicht mehr gelesen werden kann.
+        """
+        pfad = self.data_manager.lade_konfiguration().get("einstellungen", {}).get("docx_vorlage")
+        if not pfad:
+            return None
+        from generators import docx_template
+        try:
+            return {"pfad": pfad, "sha256": docx_template.vorlagen_schluessel(pfad)}
+        except OSError as e:
+            logger.warning(f"DOCX-Vorlage '{pfad}' kann nicht gelesen werden, verwende Standardlayout: {e}")
+            return None
+
+    def ergaenze_vorlage(self, context: Dict[str, Any], format: str) -> Dict[str, Any]:
+        """Ergänzt den Kontext um die eingestellte DOCX-Vorlage, sofern im DOCX-Format erstellt wird."""
+        vorlage = self._lade_docx_vorlage() if format == "docx" else None
+        if vorlage:
+            context["docx_vorlage"] = vorlage
+        else:
+            context.pop("docx_vorlage", None)
+        return context
+
+    def pruefe_docx_vorlage(self, pfad: str) -> Tuple[bool, str]:
+        """
+        Kompiliert eine DOCX-Vorlage probeweise, damit Fehler schon bei der Auswahl auffallen.
+
+        Args:
+            pfad: Der Pfad zur .docx-Vorlage.
+
+        Returns:
+            Ein Tupel aus Erfolg und Statusnachricht (inkl. unbekannter Platzhalter).
+        """
+        from generators import docx_template
+        try:
+            plan = docx_template.lade_plan(pfad)
+        except OSError as e:
+            logger.error(f"DOCX-Vorlage '{pfad}' konnte nicht gelesen werden.", exc_info=True)
+            return False, f"Die Vorlage konnte nicht gelesen werden: {e}"
+        except ValueError as e:
+            return False, str(e)
+        if plan.unbekannte_felder:
+            return True, f"Vorlage geladen. Unbekannte Platzhalter bleiben leer: {', '.join(plan.unbekannte_felder)}"
+        return True, "Vorlage geladen."
+
+    def _lade_kontexte_aus_db(self, format: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Baut für alle gespeicherten Berichte den vollständigen Render-Kontext auf.
+
+        Args:
+            format: Optional das Ausgabeformat, für das die Kontexte bestimmt sind
+                    (ergänzt z.B. die DOCX-Vorlage).
+
+        Yields:
+            Tupel aus Bericht-ID und Kontext.
+
+        Raises:
+            ValueError: Wenn kein gültiges Startdatum der Ausbildung konfiguriert ist.
+        """
+        konfig = self.data_manager.lade_konfiguration()
+        startdatum_str = konfig.get("startdatum_ausbildung", "")
+        if not BerichtsheftLogik.valide_datumsformat(startdatum_str):
+            raise ValueError("Kein gültiges Startdatum der Ausbildung in den Einstellungen hinterlegt.")
+        startdatum = datetime.strptime(startdatum_str, "%d.%m.%Y").date()
+        unterschriften = self._lade_unterschriften()
+        vorlage = self._lade_docx_vorlage() if format == "docx" else None
+
+        for bericht_id, bericht in sorted(self.data_manager.lade_berichte().items()):
+            tage = {tag.get("tag_name"): tag for tag in bericht.get("tage_daten", [])}
+            context = {
+                "fortlaufende_nr": bericht["fortlaufende_nr"],
+                "name_azubi": bericht["name_azubi"],
+                "jahr": int(bericht["jahr"]),
+                "kalenderwoche": int(bericht["kalenderwoche"]),
+                "tage_daten": [tage[tag_name] for tag_name in config.DAYS_IN_WEEK if tag_name in tage],
+            }
+            if unterschriften:
+                context["unterschriften"] = dict(unterschriften)
+            if vorlage:
+                context["docx_vorlage"] = vorlage
+            yield bericht_id, BerichtsheftLogik.vervollstaendige_kontext(context, startdatum)
+
+    @staticmethod
+    def _ausgabe_status(eintrag: Optional[Dict[str, Any]], inhalt_hash: str, generator_version: str,
+                        dateien: Dict[str, os.stat_result]) -> str:
+        """
+        Bestimmt den Zustand einer Ausgabedatei anhand des Index-Eintrags und des Ordnerinhalts.
+        Weichen Größe oder Änderungszeit vom Index ab, wurde die Datei außerhalb der
+        Anwendung verändert und gilt ebenfalls als veraltet.
+        """
+        stat = dateien.get(eintrag["dateiname"]) if eintrag else None
+        if stat is None:
+            return AUSGABE_FEHLT
+        if eintrag["inhalt_hash"] != inhalt_hash or eintrag["generator_version"] != generator_version:
+            return AUSGABE_VERALTET
+        if eintrag["groesse"] is not None and (eintrag["groesse"] != stat.st_size or eintrag["mtime"] != stat.st_mtime):
+            return AUSGABE_VERALTET
+        return AUSGABE_AKTUELL
+
+    def ermittle_ausgabe_status(self, format: str) -> Dict[str, str]:
+        """
+        Ermittelt für alle gespeicherten Berichte den Zustand der Ausgabedatei im gewünschten Format.
+
+        Args:
+            format: Das Ausgabeformat (z.B. "docx").
+
+        Returns:
+            Ein Dictionary Bericht-ID -> AUSGABE_AKTUELL, AUSGABE_VERALTET oder AUSGABE_FEHLT.
+
+        Raises:
+            ValueError: Wenn kein gültiges Startdatum konfiguriert oder das Format unbekannt ist.
+        """
+        generator_version = self._waehle_generator_klasse(format).GENERATOR_VERSION
+        manifest = self.data_manager.lade_ausgabe_manifest(format)
+        dateien = self._scanne_ausgabeordner()
+        return {
+            bericht_id: self._ausgabe_status(manifest.get((bericht_id, format)),
+                                             BerichtsheftLogik.berechne_inhalts_hash(context),
+                                             generator_version, dateien)
+            for bericht_id, context in self._lade_kontexte_aus_db(format)
+        }
+
+    def finde_veraltete_ausgaben(self, format: str) -> List[str]:
+        """
+        Ermittelt alle Berichte, deren Ausgabedatei im gewünschten Format fehlt oder veraltet ist.
+
+        Args:
+            format: Das Ausgabeformat ("docx" oder "pdf").
+
+        Returns:
+            Eine sortierte Liste der betroffenen Bericht-IDs.
+        """
+        return [bericht_id for bericht_id, status in self.ermittle_ausgabe_status(format).items()
+                if status != AUSGABE_AKTUELL]
+
+    def finde_ausgabedatei(self, bericht_id: str, format: Optional[str] = None) -> Optional[str]:
+        """
+        Gibt den Pfad der zuletzt erzeugten Ausgabedatei eines Berichts aus dem Index zurück.
+
+        Args:
+            bericht_id: Die ID des Berichts (z.B. "2024-39").
+            format: Optional nur Dateien dieses Formats berücksichtigen.
+
+        Returns:
+            Den vollständigen Pfad oder None, wenn keine existierende Datei bekannt ist.
+        """
+        eintraege = [eintrag for (eid, _), eintrag in self.data_manager.lade_ausgabe_manifest(format).items()
+                     if eid == bericht_id]
+        for eintrag in sorted(eintraege, key=lambda e: e["erstellt_am"] or "", reverse=True):
+            pfad = os.path.join(config.OUTPUT_FOLDER, eintrag["dateiname"])
+            if os.path.isfile(pfad):
+                return pfad
+        return None
+
+    def regeneriere_berichte(self, format: str, erzwingen: bool = False) -> Dict[str, List[str]]:
+        """
+        Erstellt die Ausgabedateien aller gespeicherten Berichte neu.
+        Dateien, deren Inhalts-Hash und Generator-Version zum Index passen und die seit
+        ihrer Erstellung unverändert im Ausgabeordner liegen, werden übersprungen.
+
+        Args:
+            format: Das Ausgabeformat ("docx" oder "pdf").
+            erzwingen: Wenn True, werden alle Dateien ohne Manifest-Prüfung neu erstellt.
+
+        Returns:
+            Ein Dictionary mit den Listen 'erstellt', 'uebersprungen' und 'fehler' (Bericht-IDs).
+        """
+        logger.info(f"Starte Neuerstellung aller Berichte im Format '{format}' (erzwingen={erzwingen}).")
+        ergebnis: Dict[str, List[str]] = {"erstellt": [], "uebersprungen": [], "fehler": []}
+        generator_klasse = self._waehle_generator_klasse(format)
+        manifest = self.data_manager.lade_ausgabe_manifest(format)
+        dateien = self._scanne_ausgabeordner()
+
+        for bericht_id, context in self._lade_kontexte_aus_db(format):
+            inhalt_hash = BerichtsheftLogik.berechne_inhalts_hash(context)
+            if not erzwingen and self._ausgabe_status(
+                    manifest.get((bericht_id, format)), inhalt_hash, generator_klasse.GENERATOR_VERSION,
+                    dateien) == AUSGABE_AKTUELL:
+                ergebnis["uebersprungen"].append(bericht_id)
+                continue
+            try:
+                dateiname = self._erzeuge_dateiname(context, format)
+                self._generator_fuer(context, format)(context).generate(dateiname)
+                self._speichere_index_eintrag(
+                    bericht_id, format, inhalt_hash, generator_klasse.GENERATOR_VERSION, dateiname)
+                ergebnis["erstellt"].append(bericht_id)
+            except Exception:
+                logger.error(f"Fehler bei der Neuerstellung von Bericht '{bericht_id}'.", exc_info=True)
+                ergebnis["fehler"].append(bericht_id)
+
+        logger.info(
+            f"Neuerstellung abgeschlossen: {len(ergebnis['erstellt'])} erstellt, "
+            f"{len(ergebnis['uebersprungen'])} übersprungen, {len(ergebnis['fehler'])} fehlerhaft."
+        )
+        return ergebnis
+
+    def exportiere_berichte_als_zip(self, zip_path: str, format: str) -> Tuple[bool, str]:
+        """
+        Erstellt alle gespeicherten Berichte im Speicher und schreibt sie direkt
+        in ein ZIP-Archiv, ohne Zwischendateien im Ausgabeordner.
+
+        Args:
+            zip_path: Der Pfad des zu erstellenden ZIP-Archivs.
+            format: Das Ausgabeformat ("docx" oder "pdf").
+
+        Returns:
+            Ein Tupel bestehend aus einem Boolean für den Erfolg und einer Statusnachricht.
+        """
+        logger.info(f"Starte Export aller Berichte als {format.upper()} nach: {zip_path}")
+        self._waehle_generator_klasse(format)  # Unbekannte Formate vor dem Anlegen des Archivs abweisen
+        # DOCX ist bereits ZIP-komprimiert, eine erneute Kompression würde nur Zeit kosten.
+        compress_type = zipfile.ZIP_STORED if format == "docx" else zipfile.ZIP_DEFLATED
+        anzahl = 0
+        try:
+            with zipfile.ZipFile(zip_path, "w", compress_type) as zipf:
+                for _, context in self._lade_kontexte_aus_db(format):
+                    with zipf.open(self._erzeuge_dateiname(context, format), "w") as eintrag:
+                        self._generator_fuer(context, format)(context).render_to_stream(eintrag)
+                    anzahl += 1
+            logger.info(f"{anzahl} Berichte erfolgreich nach '{zip_path}' exportiert.")
+            return True, f"{anzahl} Bericht(e) wurden als {format.upper()} in das ZIP-Archiv exportiert."
+        except ValueError as e:
+            logger.error(f"Ungültige Daten beim Export der Berichte: {e}", exc_info=True)
+            return False, f"Fehler in den Daten: {e}"
+        except Exception as e:
+            logger.error(f"Fehler beim Export der Berichte nach '{zip_path}'.", exc_info=True)
+            return False, f"Fehler beim Exportieren der Berichte: {e}"
+
+    def exportiere_html_archiv(self, zielordner: str) -> Tuple[bool, str]:
+        """
+        Exportiert alle gespeicherten Berichte als HTML-Archiv mit Übersichtsseiten pro Jahr.
+        Bei wiederholtem Export in denselben Ordner werden nur geänderte Berichte neu geschrieben.
+
+        Args:
+            zielordner: Der Ordner des Archivs.
+
+        Returns:
+            Ein Tupel bestehend aus einem Boolean für den Erfolg und einer Statusnachricht.
+        """
+        logger.info(f"Starte Export des HTML-Archivs nach: {zielordner}")
+        from generators import html_archiv
+        try:
+            statistik = html_archiv.schreibe_archiv(self._lade_kontexte_aus_db("html"), zielordner)
+        except ValueError as e:
+            logger.error(f"Ungültige Daten beim Export des HTML-Archivs: {e}", exc_info=True)
+            return False, f"Fehler in den Daten: {e}"
+        except Exception as e:
+            logger.error(f"Fehler beim Export des HTML-Archivs nach '{zielordner}'.", exc_info=True)
+            return False, f"Fehler beim Exportieren des HTML-Archivs: {e}"
+
+        konfig = self.data_manager.lade_konfiguration()
+        konfig.setdefault("einstellungen", {})["html_archiv_ordner"] = zielordner
+        self.data_manager.speichere_konfiguration(konfig)
+        return True, (f"HTML-Archiv aktualisiert: {statistik['erstellt']} Seite(n) neu erstellt, "
+                      f"{statistik['unveraendert']} unverändert, {statistik['entfernt']} entfernt.")
+
     def _aktualisiere_konfiguration(self, updates: Dict[str, Any]) -> None:
         """Lädt die Konfig, aktualisiert sie und speichert sie wieder."""
         konfig = self.data_manager.lade_konfiguration()
@@ -114,48 +554,221 @@ class AppController:
             logger.warning("Konfiguration konnte nicht gespeichert werden.")
 
 
-    def export_all_data(self, zip_path: str) -> Tuple[bool, str]:
-        """Delegiert den Export an den BackupService."""
-        logger.info(f"Starte Datenexport nach: {zip_path}")
-        return self.backup_service.export_all_data_to_zip(zip_path)
+    def export_all_data(self, zip_path: str, fortschritt_callback: Optional[Callable[[str], None]] = None,
+                        vollstaendig: bool = False) -> Tuple[bool, str]:
+        """Delegiert den Export an den BackupService (inkrementell, wenn es ein letztes Backup gibt)."""
+        logger.info(f"Starte {'vollständigen ' if vollstaendig else ''}Datenexport nach: {zip_path}")
+        return self.backup_service.export_all_data_to_zip(zip_path, fortschritt_callback, vollstaendig)
 
-    def import_all_data(self, zip_path: str) -> Tuple[bool, str]:
-        """Delegiert den Import an den BackupService."""
-        logger.info(f"Starte Datenimport von: {zip_path}")
-        return self.backup_service.import_all_data_from_zip(zip_path)
-        
-    def import_docx_berichte(self, file_paths: List[str]) -> Tuple[int, int, bool, Dict[str, str]]:
+    def letztes_backup_pfad(self) -> Optional[str]:
+        """Gibt den Pfad des letzten Backups zurück, auf das ein inkrementelles Backup aufbauen kann."""
+        letztes = self.backup_service.letztes_backup()
+        return letztes["pfad"] if letztes else None
+
+    def import_all_data(self, zip_path: str, umfang: Optional[str] = None) -> Tuple[bool, str]:
         """
-        Importiert Berichtsdaten aus DOCX-Dateien und gibt detailliertes Feedback.
+        Delegiert den Import an den BackupService.
+
+        Args:
+            zip_path: Das Backup-Archiv.
+            umfang: Optional nur die Datenbank oder nur die Dokumente (siehe services.backup_service).
         """
-        logger.info(f"Starte DOCX-Import für {len(file_paths)} Dateien.")
-        
-        importierte_daten = {}
-        error_details = {}
-        erfolgreich = 0
-        fehlerhaft = 0
-
-        for path in file_paths:
-            logger.debug(f"Verarbeite Datei: {os.path.basename(path)}")
-            bericht_daten, error_msg = self.importer_service.parse_docx(path)
-            
-            if bericht_daten:
-                schluessel = f"{bericht_daten['jahr']}-{int(bericht_daten['kalenderwoche']):02d}"
-                if schluessel in importierte_daten:
-                    logger.warning(f"Doppelter Eintrag für Schlüssel '{schluessel}'. Bisheriger Bericht wird überschrieben.")
-                    error_details[path] = f"Doppelter Bericht für KW {schluessel}, alter Eintrag wurde überschrieben."
-                importierte_daten[schluessel] = bericht_daten
-                erfolgreich += 1
-            else:
-                fehlerhaft += 1
-                error_details[path] = error_msg or "Unbekannter Fehler."
+        from services.backup_service import UMFANG_ALLES
+        logger.info(f"Starte Datenimport ({umfang or UMFANG_ALLES}) von: {zip_path}")
+        return self.backup_service.import_all_data_from_zip(zip_path, umfang=umfang or UMFANG_ALLES)
+
+    def lies_backup_inhalt(self, zip_path: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Ermittelt den Inhalt eines Backups, ohne es zu entpacken."""
+        return self.backup_service.lies_inhalt(zip_path)
+
+    def importiere_jahre_aus_backup(self, zip_path: str, jahre: Iterable[int]) -> Tuple[bool, str]:
+        """Übernimmt die Berichte der angegebenen Jahre aus einem Backup in die aktuelle Datenbank."""
+        jahre = list(jahre)
+        logger.info(f"Übernehme Berichte der Jahre {jahre} aus: {zip_path}")
+        return self.backup_service.importiere_jahre_aus_zip(zip_path, jahre)
         
+    def json_migration_offen(self) -> bool:
+        """Prüft, ob alte JSON-Datendateien vorhanden und noch nicht vollständig übernommen sind."""
+        return bool(self.migration_service.offene_dateien())
+
+    def migriere_json_daten(self, callback: Optional["MigrationsCallback"] = None,
+                            cancel_event: Optional[threading.Event] = None) -> Tuple[bool, str]:
+        """
+        Übernimmt die alten JSON-Dateien in die Datenbank bzw. setzt eine unterbrochene
+        Übernahme fort. Kann aus einem Hintergrund-Thread aufgerufen werden.
+        """
+        logger.info("Starte Übernahme der alten JSON-Daten.")
+        return self.migration_service.migriere(callback, cancel_event)
+
+    def plane_docx_import(self, file_paths: Iterable[str],
+                          datei_callback: Optional[Callable[[str, Optional[str], bool], None]] = None,
+                          cancel_event: Optional[threading.Event] = None) -> "ImportPlan":
+        """
+        Probelauf des DOCX-Imports: Liest alle Dateien ein und stuft die Berichte gegenüber
+        der Datenbank als neu, identisch, geändert oder widersprüchlich ein. Es werden keine
+        Berichte gespeichert, die Ergebnisse aber laufend in einem Import-Journal festgehalten,
+        damit ein unterbrochener Import mit `setze_docx_import_fort` fortgesetzt werden kann.
+        Kann aus einem Hintergrund-Thread aufgerufen werden.
+
+        Args:
+            file_paths: DOCX-Dateien, Ordner (rekursiv) oder ZIP-Archive. Die enthaltenen
+                        Dateien werden erst während des Imports aufgezählt.
+            datei_callback: Optionaler Callback (Pfad, Fehlermeldung oder None, unverändert),
+                            sobald eine Datei verarbeitet ist.
+            cancel_event: Optionales Event zum Abbrechen.
+
+        Returns:
+            Den Import-Plan, der mit `uebernehme_import_plan` gespeichert werden kann.
+        """
+        quellen = list(file_paths)
+        auftrag_id = self.data_manager.erstelle_import_auftrag(quellen)
+        logger.info("Starte DOCX-Import (Probelauf).")
+        return self._plane_import(quellen, auftrag_id, {}, datei_callback, cancel_event)
+
+    def offener_import_auftrag(self) -> Optional[Dict[str, Any]]:
+        """Gibt den unterbrochenen Import-Auftrag zurück (Quellen, Anzahl verarbeiteter Dateien) oder None."""
+        return self.data_manager.lade_import_auftrag()
+
+    def setze_docx_import_fort(self, datei_callback: Optional[Callable[[str, Optional[str], bool], None]] = None,
+                               cancel_event: Optional[threading.Event] = None) -> Optional["ImportPlan"]:
+        """
+        Setzt einen unterbrochenen Import fort. Bereits im Journal stehende Dateien werden
+        nicht erneut analysiert. Argumente und Rückgabe wie bei `plane_docx_import`;
+        None, wenn kein unterbrochener Import vorliegt.
+        """
+        auftrag = self.data_manager.lade_import_auftrag()
+        if auftrag is None:
+            return None
+        journal = self.data_manager.lade_import_journal(auftrag["auftrag_id"])
+        logger.info(f"Setze DOCX-Import fort ({len(journal)} Dateien bereits verarbeitet).")
+        return self._plane_import(auftrag["quellen"], auftrag["auftrag_id"], journal, datei_callback, cancel_event)
+
+    def verwerfe_import_auftrag(self) -> bool:
+        """Verwirft einen unterbrochenen Import samt Journal."""
+        auftrag = self.data_manager.lade_import_auftrag()
+        return auftrag is None or self.data_manager.loesche_import_auftrag(auftrag["auftrag_id"])
+
+    def _plane_import(self, quellen: List[str], auftrag_id: Optional[int], journal: Dict[str, Dict[str, Any]],
+                      datei_callback: Optional[Callable[[str, Optional[str], bool], None]],
+                      cancel_event: Optional[threading.Event]) -> "ImportPlan":
+        """Liest die Quellen ein und schreibt neue Ergebnisse in Batches in das Journal des Auftrags."""
+        from services import import_quellen
+        from services.importer_service import ImportPlan
+
+        plan = ImportPlan(auftrag_id=auftrag_id)
+        neue_eintraege: List[Dict[str, Any]] = []
+        # Eigener Archiv-Cache pro Lauf: Ein gleichzeitiger (z.B. automatischer) Import schließt ihn nicht.
+        archive = import_quellen.ArchivCache()
+        try:
+            for ergebnis in self.importer_service.importiere_dateien(import_quellen.iteriere_quellen(quellen, archive),
+                                                                     cancel_event, journal=journal, archive=archive):
+                logger.debug(f"Datei verarbeitet: {os.path.basename(ergebnis.pfad)}")
+                meldung = plan.fuege_hinzu(ergebnis)
+                if auftrag_id is not None and ergebnis.pfad not in journal:
+                    neue_eintraege.append(ergebnis.als_journal_eintrag())
+                    if len(neue_eintraege) >= _IMPORT_JOURNAL_BATCH:
+                        self.data_manager.schreibe_import_journal(auftrag_id, neue_eintraege)
+                        neue_eintraege.clear()
+                if datei_callback:
+                    datei_callback(ergebnis.pfad, meldung, ergebnis.unveraendert)
+        finally:
+            # Während des Imports offen gehaltene ZIP-Archive wieder freigeben
+            archive.schliesse()
+            if neue_eintraege:
+                self.data_manager.schreibe_import_journal(auftrag_id, neue_eintraege)
+
+        plan.vergleiche(self.data_manager.lade_bericht_hashes())
+        logger.info(f"DOCX-Import: {plan.erfolgreich} eingelesen, {plan.uebersprungen} unverändert, "
+                    f"{plan.fehlerhaft} fehlerhaft; " +
+                    ", ".join(f"{len(plan.nach_status(status))} {status}" for status in sorted(set(plan.status.values()))))
+        return plan
+
+    def uebernehme_import_plan(self, plan: "ImportPlan", freigegeben: Optional[Iterable[str]] = None) -> bool:
+        """
+        Speichert die freigegebenen Berichte eines Import-Plans in Transaktionen zu höchstens
+        `_IMPORT_SPEICHER_BATCH` Berichten und schließt danach den Import-Auftrag ab.
+        Identische Berichte werden nicht erneut geschrieben; nicht freigegebene Dateien
+        gelten nicht als importiert und werden beim nächsten Import wieder angeboten.
+        Schlägt ein Batch fehl, bleibt der Auftrag offen und kann fortgesetzt werden.
+
+        Args:
+            plan: Der Plan aus `plane_docx_import`.
+            freigegeben: Die zu speichernden Bericht-IDs; None übernimmt alle nicht identischen.
+
+        Returns:
+            True, wenn gespeichert wurde.
+        """
+        from services.importer_service import IMPORT_IDENTISCH
+        if freigegeben is None:
+            freigegeben = plan.status
+        zu_speichern = sorted(bericht_id for bericht_id in set(freigegeben)
+                              if plan.status.get(bericht_id, IMPORT_IDENTISCH) != IMPORT_IDENTISCH)
+        # Fingerabdrücke identischer Berichte gehen mit dem ersten Batch
+        fingerabdruecke = [fingerabdruck for bericht_id in plan.nach_status(IMPORT_IDENTISCH)
+                           for fingerabdruck in plan.fingerabdruecke.get(bericht_id, [])]
+
         erfolg_speichern = False
-        if importierte_daten:
-            logger.info(f"Speichere {len(importierte_daten)} importierte Berichte.")
-            erfolg_speichern = self.data_manager.importiere_berichte(importierte_daten)
-        
-        return erfolgreich, fehlerhaft, erfolg_speichern, error_details
+        for start in range(0, max(len(zu_speichern), 1), _IMPORT_SPEICHER_BATCH):
+            batch = zu_speichern[start:start + _IMPORT_SPEICHER_BATCH]
+            fingerabdruecke.extend(fingerabdruck for bericht_id in batch
+                                   for fingerabdruck in plan.fingerabdruecke.get(bericht_id, []))
+            if not batch and not fingerabdruecke:
+                continue
+            logger.info(f"Speichere Berichte {start + 1} bis {start + len(batch)} von {len(zu_speichern)}.")
+            if not self.data_manager.importiere_berichte({bericht_id: plan.berichte[bericht_id] for bericht_id in batch},
+                                                         fingerabdruecke):
+                return False
+            fingerabdruecke = []
+            erfolg_speichern = True
+        if plan.sonstige_fingerabdruecke:
+            self.data_manager.speichere_import_fingerabdruecke(plan.sonstige_fingerabdruecke)
+        if plan.auftrag_id is not None:
+            self.data_manager.loesche_import_auftrag(plan.auftrag_id)
+        return erfolg_speichern
+
+    def importiere_automatisch(self, file_paths: List[str]) -> Tuple[int, bool]:
+        """
+        Importiert Dateien aus dem überwachten Ordner ohne Rückfrage: neue und geänderte
+        Berichte werden gespeichert. Wochen, für die mehrere Dateien mit unterschiedlichem
+        Inhalt vorliegen (Konflikte), werden nicht übernommen; sie warten auf die Freigabe
+        im manuellen Import. Verwendet kein Import-Journal, damit ein gleichzeitig
+        laufender oder unterbrochener Import in der Import-Ansicht unberührt bleibt.
+        Kann aus einem Hintergrund-Thread aufgerufen werden.
+
+        Returns:
+            Ein Tupel (Anzahl gespeicherter Berichte, Erfolg).
+        """
+        from services.importer_service import IMPORT_IDENTISCH, IMPORT_KONFLIKT
+        logger.info(f"Automatischer Import von {len(file_paths)} Dateien aus dem überwachten Ordner.")
+        plan = self._plane_import(file_paths, None, {}, None, None)
+        konflikte = plan.nach_status(IMPORT_KONFLIKT)
+        if konflikte:
+            logger.warning(f"Automatischer Import: {len(konflikte)} Woche(n) mit widersprüchlichen Dateien "
+                           f"werden nicht übernommen ({', '.join(konflikte)}).")
+        freigegeben = [bericht_id for bericht_id, status in plan.status.items()
+                       if status not in (IMPORT_IDENTISCH, IMPORT_KONFLIKT)]
+        if not freigegeben:
+            self.uebernehme_import_plan(plan, freigegeben)  # speichert nur Fingerabdrücke
+            return 0, True
+        erfolg = self.uebernehme_import_plan(plan, freigegeben)
+        return (len(freigegeben) if erfolg else 0), erfolg
+
+    def import_docx_berichte(self, file_paths: Iterable[str],
+                             datei_callback: Optional[Callable[[str, Optional[str], bool], None]] = None,
+                             cancel_event: Optional[threading.Event] = None) -> Tuple[int, int, int, bool, Dict[str, str]]:
+        """
+        Importiert Berichtsdaten aus DOCX-Dateien ohne Rückfrage: Alle neuen und geänderten
+        Berichte werden gespeichert (siehe `plane_docx_import` und `uebernehme_import_plan`).
+
+        Returns:
+            Ein Tupel (erfolgreich, übersprungen, fehlerhaft, gespeichert, Fehlerdetails pro Datei).
+        """
+        plan = self.plane_docx_import(file_paths, datei_callback, cancel_event)
+        if cancel_event is not None and cancel_event.is_set():
+            logger.info("DOCX-Import abgebrochen, es wurden keine Berichte gespeichert.")
+            return plan.erfolgreich, plan.uebersprungen, plan.fehlerhaft, False, plan.fehler
+        erfolg_speichern = self.uebernehme_import_plan(plan)
+        return plan.erfolgreich, plan.uebersprungen, plan.fehlerhaft, erfolg_speichern, plan.fehler
 
 
     def delete_bericht(self, bericht_id: str) -> bool:
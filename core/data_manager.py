@@ -5,8 +5,9 @@ Modul zur zentralen Verwaltung aller Lese- und Schreibvorgänge für Daten mitte
 Diese Klasse agiert als Fassade und Repository für die Datenbank.
 """
 import json
+from datetime import datetime
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple
 
 from db.database import Database
 from db.models import Bericht, Tagebucheintrag, Vorlage
@@ -44,20 +45,25 @@ class DataManager:
 
     def speichere_konfiguration(self, config_data: Dict[str, Any]) -> bool:
         """Speichert die Konfiguration in der Datenbank (UPSERT)."""
-        query = "INSERT OR REPLACE INTO konfiguration (schluessel, wert) VALUES (?, ?)"
         try:
             with self.db.transaction() as cursor:
-                for key, value in config_data.items():
-                    # Komplexe Typen (dict, list) als JSON-String speichern
-                    if isinstance(value, (dict, list)):
-                        cursor.execute(query, (key, json.dumps(value)))
-                    else:
-                        cursor.execute(query, (key, value))
+                self._speichere_konfiguration_in_transaktion(cursor, config_data)
             return True
         except self.db._conn.Error as e:
             logger.error(f"Fehler beim Speichern der Konfiguration: {e}", exc_info=True)
             return False
 
+    @staticmethod
+    def _speichere_konfiguration_in_transaktion(cursor: Any, config_data: Dict[str, Any]) -> None:
+        """Schreibt Konfigurationswerte innerhalb einer bestehenden Transaktion."""
+        query = "INSERT OR REPLACE INTO konfiguration (schluessel, wert) VALUES (?, ?)"
+        for key, value in config_data.items():
+            # Komplexe Typen (dict, list) als JSON-String speichern
+            if isinstance(value, (dict, list)):
+                cursor.execute(query, (key, json.dumps(value)))
+            else:
+                cursor.execute(query, (key, value))
+
     def lade_berichte(self) -> Dict[str, Dict[str, Any]]:
         """Lädt alle Berichte und die zugehörigen Tagebucheinträge."""
         berichte_query = "SELECT * FROM berichte"
@@ -180,21 +186,289 @@ class DataManager:
             logger.error(f"Fehler beim Löschen aller Berichte: {e}", exc_info=True)
             return False
             
-    def importiere_berichte(self, berichte_daten: Dict[str, Any]) -> bool:
+    def importiere_berichte(self, berichte_daten: Dict[str, Any],
+                            fingerabdruecke: Optional[List[Dict[str, Any]]] = None,
+                            konfiguration: Optional[Dict[str, Any]] = None) -> bool:
         """
         Importiert mehrere Berichte in einer einzigen, performanten Transaktion.
         Gibt bei einem Fehler `False` zurück, damit der Controller den Fehler anzeigen kann.
+
+        Args:
+            berichte_daten: Bericht-ID -> Kontext.
+            fingerabdruecke: Optional die Fingerabdrücke der analysierten Dateien; sie werden
+                             in derselben Transaktion gespeichert, damit eine Datei nur dann als
+                             importiert gilt, wenn ihr Bericht auch tatsächlich gespeichert wurde.
+            konfiguration: Optional Konfigurationswerte (z.B. ein Fortschritt), die ebenfalls
+                           in derselben Transaktion gespeichert werden.
         """
         try:
             with self.db.transaction() as cursor:
                 for bericht_id, context in berichte_daten.items():
                     self._aktualisiere_bericht_in_transaktion(cursor, context)
+                if fingerabdruecke:
+                    self._speichere_fingerabdruecke_in_transaktion(cursor, fingerabdruecke)
+                if konfiguration:
+                    self._speichere_konfiguration_in_transaktion(cursor, konfiguration)
             logger.info(f"{len(berichte_daten)} Berichte erfolgreich importiert.")
             return True
         except self.db._conn.Error as e:
             logger.error(f"Fehler beim Massenimport von Berichten: {e}", exc_info=True)
             return False # Wichtig: Signalisiert dem Controller einen Fehler
             
+    def lade_bericht_ids(self) -> Set[str]:
+        """Lädt nur die IDs aller gespeicherten Berichte."""
+        try:
+            with self.db.transaction(read_only=True) as cursor:
+                return {row['bericht_id'] for row in cursor.execute("SELECT bericht_id FROM berichte")}
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Laden der Bericht-IDs: {e}", exc_info=True)
+            return set()
+
+    def lade_bericht_hashes(self) -> Dict[str, str]:
+        """
+        Berechnet für alle gespeicherten Berichte den Speicher-Hash
+        (siehe `BerichtsheftLogik.berechne_speicher_hash`) in einem Durchlauf über beide Tabellen.
+        """
+        from core.logic import BerichtsheftLogik
+        query = """
+            SELECT b.bericht_id, b.fortlaufende_nr, b.name_azubi, t.typ, t.stunden, t.taetigkeiten
+            FROM berichte b LEFT JOIN tagebucheintraege t ON t.bericht_id = b.bericht_id
+            ORDER BY b.bericht_id, t.eintrag_id
+        """
+        hashes: Dict[str, str] = {}
+        aktuell: Optional[Dict[str, Any]] = None
+        try:
+            with self.db.transaction(read_only=True) as cursor:
+                for row in cursor.execute(query):
+                    if aktuell is None or aktuell["bericht_id"] != row["bericht_id"]:
+                        if aktuell is not None:
+                            hashes[aktuell["bericht_id"]] = BerichtsheftLogik.berechne_speicher_hash(aktuell)
+                        aktuell = {"bericht_id": row["bericht_id"], "fortlaufende_nr": row["fortlaufende_nr"],
+                                   "name_azubi": row["name_azubi"], "tage_daten": []}
+                    if row["typ"] is not None:
+                        aktuell["tage_daten"].append(
+                            {"typ": row["typ"], "stunden": row["stunden"], "taetigkeiten": row["taetigkeiten"]})
+            if aktuell is not None:
+                hashes[aktuell["bericht_id"]] = BerichtsheftLogik.berechne_speicher_hash(aktuell)
+            return hashes
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Berechnen der Bericht-Hashes: {e}", exc_info=True)
+            return {}
+
+    def lade_import_fingerabdruecke(self) -> Dict[str, Dict[str, Any]]:
+        """Lädt die Fingerabdrücke aller bereits importierten Dateien (Pfad -> Zeile)."""
+        try:
+            with self.db.transaction(read_only=True) as cursor:
+                return {row['pfad']: dict(row) for row in cursor.execute("SELECT * FROM import_fingerabdruecke")}
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Laden der Import-Fingerabdrücke: {e}", exc_info=True)
+            return {}
+
+    def speichere_import_fingerabdruecke(self, fingerabdruecke: List[Dict[str, Any]]) -> bool:
+        """Speichert Fingerabdrücke von Dateien, für die kein Bericht gespeichert wird (z.B. fehlerhafte)."""
+        try:
+            with self.db.transaction() as cursor:
+                self._speichere_fingerabdruecke_in_transaktion(cursor, fingerabdruecke)
+            return True
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Speichern der Import-Fingerabdrücke: {e}", exc_info=True)
+            return False
+
+    @staticmethod
+    def _speichere_fingerabdruecke_in_transaktion(cursor: Any, fingerabdruecke: List[Dict[str, Any]]) -> None:
+        jetzt = datetime.now().isoformat(timespec="seconds")
+        cursor.executemany(
+            """
+            INSERT OR REPLACE INTO import_fingerabdruecke
+                (pfad, groesse, mtime, inhalt_hash, parser_version, bericht_id, ergebnis, fehler, importiert_am)
+            VALUES (:pfad, :groesse, :mtime, :inhalt_hash, :parser_version, :bericht_id, :ergebnis, :fehler, :importiert_am)
+            """,
+            [dict(eintrag, importiert_am=jetzt) for eintrag in fingerabdruecke],
+        )
+
+    def erstelle_import_auftrag(self, quellen: List[str]) -> Optional[int]:
+        """
+        Legt einen neuen Import-Auftrag an; ein noch offener älterer Auftrag wird verworfen.
+
+        Returns:
+            Die ID des Auftrags oder None bei einem Fehler.
+        """
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute("DELETE FROM import_journal")
+                cursor.execute("DELETE FROM import_auftraege")
+                cursor.execute("INSERT INTO import_auftraege (quellen, erstellt_am) VALUES (?, ?)",
+                               (json.dumps(quellen, ensure_ascii=False), datetime.now().isoformat(timespec="seconds")))
+                return cursor.lastrowid
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Anlegen des Import-Auftrags: {e}", exc_info=True)
+            return None
+
+    def lade_import_auftrag(self) -> Optional[Dict[str, Any]]:
+        """Lädt den offenen Import-Auftrag samt Anzahl der bereits verarbeiteten Dateien (oder None)."""
+        query = """
+            SELECT a.auftrag_id, a.quellen, a.erstellt_am, COUNT(j.pfad) AS anzahl
+            FROM import_auftraege a LEFT JOIN import_journal j ON j.auftrag_id = a.auftrag_id
+            GROUP BY a.auftrag_id ORDER BY a.auftrag_id DESC LIMIT 1
+        """
+        try:
+            with self.db.transaction(read_only=True) as cursor:
+                row = cursor.execute(query).fetchone()
+            if row is None:
+                return None
+            auftrag = dict(row)
+            auftrag["quellen"] = json.loads(auftrag["quellen"])
+            return auftrag
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Laden des Import-Auftrags: {e}", exc_info=True)
+            return None
+
+    def lade_import_journal(self, auftrag_id: int) -> Dict[str, Dict[str, Any]]:
+        """Lädt die bereits verarbeiteten Dateien eines Import-Auftrags (Pfad -> Eintrag)."""
+        try:
+            with self.db.transaction(read_only=True) as cursor:
+                return {row['pfad']: dict(row) for row in cursor.execute(
+                    "SELECT pfad, ergebnis, fehler, fingerabdruck, unveraendert FROM import_journal WHERE auftrag_id = ?",
+                    (auftrag_id,))}
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Laden des Import-Journals: {e}", exc_info=True)
+            return {}
+
+    def schreibe_import_journal(self, auftrag_id: int, eintraege: List[Dict[str, Any]]) -> bool:
+        """Hält die Ergebnisse verarbeiteter Dateien in einer Transaktion im Journal fest."""
+        try:
+            with self.db.transaction() as cursor:
+                cursor.executemany(
+                    """
+                    INSERT OR REPLACE INTO import_journal (auftrag_id, pfad, ergebnis, fehler, fingerabdruck, unveraendert)
+                    VALUES (:auftrag_id, :pfad, :ergebnis, :fehler, :fingerabdruck, :unveraendert)
+                    """,
+                    [dict(eintrag, auftrag_id=auftrag_id) for eintrag in eintraege],
+                )
+            return True
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Schreiben des Import-Journals: {e}", exc_info=True)
+            return False
+
+    def loesche_import_auftrag(self, auftrag_id: int) -> bool:
+        """Entfernt einen abgeschlossenen oder verworfenen Import-Auftrag samt Journal."""
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute("DELETE FROM import_journal WHERE auftrag_id = ?", (auftrag_id,))
+                cursor.execute("DELETE FROM import_auftraege WHERE auftrag_id = ?", (auftrag_id,))
+            return True
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Löschen des Import-Auftrags: {e}", exc_info=True)
+            return False
+
+    def lade_ausgabe_manifest(self, format: Optional[str] = None) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Lädt die Manifest-Einträge der erzeugten Ausgabedateien.
+
+        Args:
+            format: Optional nur Einträge dieses Formats laden.
+
+        Returns:
+            Ein Dictionary mit (bericht_id, format) als Schlüssel.
+        """
+        query = "SELECT * FROM ausgabe_manifest"
+        params: Tuple[Any, ...] = ()
+        if format:
+            query += " WHERE format = ?"
+            params = (format,)
+        try:
+            with self.db.transaction(read_only=True) as cursor:
+                return {(row['bericht_id'], row['format']): dict(row) for row in cursor.execute(query, params)}
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Laden des Ausgabe-Manifests: {e}", exc_info=True)
+            return {}
+
+    def speichere_manifest_eintrag(self, bericht_id: str, format: str, inhalt_hash: str,
+                                   generator_version: str, dateiname: str,
+                                   groesse: Optional[int] = None, mtime: Optional[float] = None) -> bool:
+        """
+        Speichert oder ersetzt den Manifest-Eintrag einer erzeugten Ausgabedatei (UPSERT).
+        Größe und Änderungszeit der Datei bilden zusammen mit dem Dateinamen den Ausgabe-Index.
+        """
+        query = """
+            INSERT OR REPLACE INTO ausgabe_manifest
+                (bericht_id, format, inhalt_hash, generator_version, dateiname, groesse, mtime, erstellt_am)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        erstellt_am = datetime.now().isoformat(timespec="seconds")
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute(query, (bericht_id, format, inhalt_hash, generator_version, dateiname,
+                                       groesse, mtime, erstellt_am))
+            return True
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Speichern des Manifest-Eintrags für '{bericht_id}' ({format}): {e}", exc_info=True)
+            return False
+
+    def gleiche_manifest_ab(self, entfernen: List[Tuple[str, str]],
+                            dateiinfos: List[Tuple[int, float, str, str]]) -> bool:
+        """
+        Gleicht den Ausgabe-Index in einer Transaktion mit dem Ausgabeordner ab.
+
+        Args:
+            entfernen: (bericht_id, format) der Einträge, deren Datei nicht mehr existiert.
+            dateiinfos: (groesse, mtime, bericht_id, format) für Einträge ohne Dateiinformationen.
+
+        Returns:
+            True bei Erfolg, sonst False.
+        """
+        try:
+            with self.db.transaction() as cursor:
+                cursor.executemany("DELETE FROM ausgabe_manifest WHERE bericht_id = ? AND format = ?", entfernen)
+                cursor.executemany(
+                    "UPDATE ausgabe_manifest SET groesse = ?, mtime = ? WHERE bericht_id = ? AND format = ?",
+                    dateiinfos
+                )
+            return True
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Abgleich des Ausgabe-Index: {e}", exc_info=True)
+            return False
+
+    def lade_unterschrift_schluessel(self) -> Dict[str, str]:
+        """Lädt die Hashes der hinterlegten Unterschriftsbilder (Rolle -> SHA-256), ohne die Bilddaten."""
+        try:
+            with self.db.transaction(read_only=True) as cursor:
+                return {row['rolle']: row['sha256'] for row in cursor.execute("SELECT rolle, sha256 FROM unterschriften")}
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Laden der Unterschriften: {e}", exc_info=True)
+            return {}
+
+    def lade_unterschrift(self, rolle: str) -> Optional[bytes]:
+        """Lädt die Bilddaten der Unterschrift einer Rolle oder None, wenn keine hinterlegt ist."""
+        try:
+            with self.db.transaction(read_only=True) as cursor:
+                row = cursor.execute("SELECT bild FROM unterschriften WHERE rolle = ?", (rolle,)).fetchone()
+                return bytes(row['bild']) if row else None
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Laden der Unterschrift '{rolle}': {e}", exc_info=True)
+            return None
+
+    def speichere_unterschrift(self, rolle: str, bild: bytes, sha256: str) -> bool:
+        """Speichert oder ersetzt das Unterschriftsbild einer Rolle."""
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute("INSERT OR REPLACE INTO unterschriften (rolle, bild, sha256) VALUES (?, ?, ?)",
+                               (rolle, bild, sha256))
+            return True
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Speichern der Unterschrift '{rolle}': {e}", exc_info=True)
+            return False
+
+    def loesche_unterschrift(self, rolle: str) -> bool:
+        """Entfernt das Unterschriftsbild einer Rolle."""
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute("DELETE FROM unterschriften WHERE rolle = ?", (rolle,))
+            return True
+        except self.db._conn.Error as e:
+            logger.error(f"Fehler beim Löschen der Unterschrift '{rolle}': {e}", exc_info=True)
+            return False
+
     def close_db_connection(self):
         """Delegiert das Schließen der DB-Verbindung."""
         self.db.close()
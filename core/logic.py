@@ -7,12 +7,26 @@ Diese Datei enthält die Klasse `BerichtsheftLogik`, die Methoden zur
 Datenberechnung (z.B. Ausbildungsjahr) und zur Validierung kapselt.
 """
 
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
+from typing import Dict, Any
+import hashlib
+import json
 import re
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Felder des Kontexts, die tatsächlich in das erzeugte Dokument einfließen.
+# Nur diese gehen in den Inhalts-Hash ein, damit GUI- und DB-Kontexte vergleichbar sind.
+RENDER_KONTEXT_FELDER = (
+    "fortlaufende_nr", "name_azubi", "zeitraum_von", "zeitraum_bis",
+    "ausbildungsjahr", "erstellungsdatum_bericht",
+)
+RENDER_TAG_FELDER = ("typ", "stunden", "taetigkeiten")
+# Standardwerte der Tagesfelder beim Speichern (siehe DataManager._aktualisiere_bericht_in_transaktion)
+SPEICHER_TAG_STANDARDWERTE = {"typ": "-", "stunden": "0:00", "taetigkeiten": "-"}
+
+
 class BerichtsheftLogik:
     """
     Kapselt die Geschäftslogik für Berechnungen und Validierungen.
@@ -102,3 +116,79 @@ class BerichtsheftLogik:
             return True
         except ValueError:
             return False
+
+    @staticmethod
+    def vervollstaendige_kontext(context: Dict[str, Any], startdatum_ausbildung: date) -> Dict[str, Any]:
+        """
+        Ergänzt einen Kontext mit Jahr und KW um die abgeleiteten Felder
+        (Zeitraum, Ausbildungsjahr, Erstellungsdatum).
+
+        Args:
+            context: Kontext mit mindestens 'jahr' und 'kalenderwoche'. Wird direkt verändert.
+            startdatum_ausbildung: Das Startdatum der Ausbildung.
+
+        Returns:
+            Den ergänzten Kontext.
+        """
+        start_datum_kw = date.fromisocalendar(int(context["jahr"]), int(context["kalenderwoche"]), 1)
+        freitag_datum_kw = start_datum_kw + timedelta(days=4)
+        context["startdatum_ausbildung_dt"] = startdatum_ausbildung
+        context["zeitraum_von"] = start_datum_kw.strftime("%d.%m.%Y")
+        context["zeitraum_bis"] = freitag_datum_kw.strftime("%d.%m.%Y")
+        context["ausbildungsjahr"] = BerichtsheftLogik.berechne_ausbildungsjahr(startdatum_ausbildung, start_datum_kw)
+        context["erstellungsdatum_bericht"] = freitag_datum_kw.strftime("%d.%m.%Y")
+        return context
+
+    @staticmethod
+    def berechne_inhalts_hash(context: Dict[str, Any]) -> str:
+        """
+        Berechnet einen stabilen SHA-256-Hash über alle Felder, die in das Dokument einfließen.
+
+        Args:
+            context: Der Render-Kontext eines Berichts.
+
+        Returns:
+            Den Hash als Hex-String.
+        """
+        relevante_daten = {feld: context.get(feld) for feld in RENDER_KONTEXT_FELDER}
+        relevante_daten["tage_daten"] = [
+            {feld: tag.get(feld) for feld in RENDER_TAG_FELDER}
+            for tag in context.get("tage_daten", [])
+        ]
+        # Nur aufnehmen, wenn Unterschriftsbilder hinterlegt sind; Hashes ohne Bilder bleiben so unverändert.
+        if context.get("unterschriften"):
+            relevante_daten["unterschriften"] = context["unterschriften"]
+        if context.get("docx_vorlage"):
+            relevante_daten["docx_vorlage"] = context["docx_vorlage"]["sha256"]
+        serialisiert = json.dumps(relevante_daten, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(serialisiert.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def berechne_speicher_hash(context: Dict[str, Any]) -> str:
+        """
+        Berechnet einen SHA-256-Hash über genau die Felder, die für einen Bericht in der
+        Datenbank gespeichert werden. So lassen sich importierte und gespeicherte Berichte
+        vergleichen, ohne ihre Zeilen einzeln gegenüberzustellen.
+
+        Args:
+            context: Ein Bericht, wie er gespeichert würde oder aus der Datenbank geladen wurde.
+
+        Returns:
+            Den Hash als Hex-String.
+        """
+        from core.config import DAYS_IN_WEEK
+        fortlaufende_nr = context.get("fortlaufende_nr")
+        try:
+            fortlaufende_nr = int(fortlaufende_nr)
+        except (TypeError, ValueError):
+            pass  # SQLite speichert nicht umwandelbare Werte unverändert
+        relevante_daten = {
+            "fortlaufende_nr": fortlaufende_nr,
+            "name_azubi": context.get("name_azubi"),
+            "tage_daten": [
+                {feld: tag.get(feld, standard) for feld, standard in SPEICHER_TAG_STANDARDWERTE.items()}
+                for tag in context.get("tage_daten", [])[:len(DAYS_IN_WEEK)]
+            ],
+        }
+        serialisiert = json.dumps(relevante_daten, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(serialisiert.encode("utf-8")).hexdigest()
@@ -6,8 +6,10 @@ Verwaltet die SQLite-Datenbankverbindung, Transaktionen und Migrationen.
 import sqlite3
 import logging
 import os
+import pathlib
+import threading
 from contextlib import contextmanager
-from typing import List, Any, Generator, Optional
+from typing import Callable, List, Any, Generator, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +27,8 @@ class Database:
         self.db_path = db_path
         self.migrations_path = migrations_path
         self._conn: Optional[sqlite3.Connection] = None
+        # Serialisiert Transaktionen, da die Verbindung auch von Hintergrund-Threads genutzt wird.
+        self._lock = threading.RLock()
 
     def connect(self) -> None:
         """Stellt die Datenbankverbindung her und konfiguriert sie."""
@@ -49,38 +53,88 @@ class Database:
 
     def close(self) -> None:
         """Schließt die Datenbankverbindung."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
-            logger.info("Datenbankverbindung geschlossen.")
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+                logger.info("Datenbankverbindung geschlossen.")
+
+    def sichere_nach(self, ziel_pfad: str, seiten_pro_schritt: int = 256,
+                     fortschritt: Optional[Callable[[int, int], None]] = None) -> None:
+        """
+        Erstellt mit der Backup-API von SQLite einen konsistenten Schnappschuss der Datenbank.
+
+        Gelesen wird über eine eigene, schreibgeschützte Verbindung in Schritten von
+        `seiten_pro_schritt` Seiten. So sieht der Schnappschuss nur abgeschlossene
+        Transaktionen, und die Anwendung kann zwischen den Schritten weiter schreiben
+        (SQLite beginnt die Sicherung dann beim nächsten Schritt neu). WAL- und
+        SHM-Dateien werden dabei nicht benötigt.
+
+        Args:
+            ziel_pfad: Die zu erstellende Datenbankdatei (wird überschrieben).
+            seiten_pro_schritt: Anzahl der Seiten, die pro Schritt kopiert werden.
+            fortschritt: Optionaler Callback (verbleibende Seiten, Seiten gesamt) nach jedem Schritt.
+
+        Raises:
+            sqlite3.Error: Wenn die Sicherung fehlschlägt.
+        """
+        def melde(status: int, verbleibend: int, gesamt: int) -> None:
+            if fortschritt:
+                fortschritt(verbleibend, gesamt)
+
+        if os.path.exists(ziel_pfad):
+            os.remove(ziel_pfad)
+        ziel = sqlite3.connect(ziel_pfad)
+        try:
+            if self.db_path == ":memory:":
+                # Eine In-Memory-Datenbank ist nur über die eigene Verbindung erreichbar.
+                with self._lock:
+                    if not self._conn:
+                        raise sqlite3.OperationalError("Datenbankverbindung ist nicht geöffnet.")
+                    self._conn.backup(ziel, pages=seiten_pro_schritt, progress=melde)
+            else:
+                uri = pathlib.Path(os.path.abspath(self.db_path)).as_uri() + "?mode=ro"
+                quelle = sqlite3.connect(uri, uri=True)
+                try:
+                    quelle.backup(ziel, pages=seiten_pro_schritt, progress=melde)
+                finally:
+                    quelle.close()
+            # Die Sicherung soll ohne WAL-Datei vollständig sein.
+            ziel.execute("PRAGMA journal_mode = DELETE;")
+        finally:
+            ziel.close()
+        logger.info(f"Datenbank-Schnappschuss nach '{ziel_pfad}' erstellt.")
 
     @contextmanager
     def transaction(self, read_only: bool = False) -> Generator[sqlite3.Cursor, None, None]:
         """
         Stellt einen kontext-basierten Transaktionsmanager bereit.
         Führt bei Erfolg ein COMMIT durch, bei einer Exception ein ROLLBACK.
+        Die Transaktion hält eine Sperre, damit Threads sich nicht gegenseitig
+        in eine offene Transaktion schreiben.
         """
-        if not self._conn:
-            raise sqlite3.OperationalError("Datenbankverbindung ist nicht geöffnet.")
-        
-        # KORREKTUR: Prüfen, ob bereits eine Transaktion aktiv ist
-        in_transaction = self._conn.in_transaction
-        
-        cursor = self._conn.cursor()
-        try:
-            if not in_transaction:
-                if read_only:
-                    cursor.execute("BEGIN DEFERRED;")
-                else:
-                    cursor.execute("BEGIN IMMEDIATE;")
-            yield cursor
-            if not in_transaction:
-                self._conn.commit()
-        except Exception as e:
-            if not in_transaction:
-                logger.error(f"Transaktion fehlgeschlagen. Führe Rollback durch. Fehler: {e}", exc_info=True)
-                self._conn.rollback()
-            raise
+        with self._lock:
+            if not self._conn:
+                raise sqlite3.OperationalError("Datenbankverbindung ist nicht geöffnet.")
+
+            # KORREKTUR: Prüfen, ob bereits eine Transaktion aktiv ist
+            in_transaction = self._conn.in_transaction
+
+            cursor = self._conn.cursor()
+            try:
+                if not in_transaction:
+                    if read_only:
+                        cursor.execute("BEGIN DEFERRED;")
+                    else:
+                        cursor.execute("BEGIN IMMEDIATE;")
+                yield cursor
+                if not in_transaction:
+                    self._conn.commit()
+            except Exception as e:
+                if not in_transaction:
+                    logger.error(f"Transaktion fehlgeschlagen. Führe Rollback durch. Fehler: {e}", exc_info=True)
+                    self._conn.rollback()
+                raise
 
     def run_migrations(self) -> None:
         """
@@ -4,22 +4,48 @@
 Definiert die abstrakte Basisklasse für alle Dokumentengeneratoren.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional, BinaryIO, TYPE_CHECKING
+import io
 import os
 import logging
+import threading
 from core import config
 
+if TYPE_CHECKING:
+    from generators.layout import BerichtsLayout
+
 logger = logging.getLogger(__name__)
 
+# Callback für den Fortschritt: (Bezeichnung des Schritts, Anteil zwischen 0.0 und 1.0)
+ProgressCallback = Callable[[str, float], None]
+
+
+class GenerierungAbgebrochen(Exception):
+    """Wird ausgelöst, wenn die Erstellung eines Dokuments abgebrochen wurde."""
+    pass
+
+
 class BaseGenerator(ABC):
     """
     Abstrakte Basisklasse, die die Struktur für die Erstellung eines Dokuments definiert.
     Die `generate`-Methode ist hier als konkrete Methode implementiert, da der Ablauf
     für alle Generatoren identisch ist.
     """
+    # Bei Änderungen am Layout erhöhen, damit bereits erzeugte Dateien als veraltet gelten.
+    GENERATOR_VERSION: str = "1"
+
     def __init__(self, context: Dict[str, Any]):
         """Initialisiert den Generator mit den notwendigen Daten."""
         self.context = context
+        self._layout: Optional["BerichtsLayout"] = None
+
+    @property
+    def layout(self) -> "BerichtsLayout":
+        """Das formatneutrale Layout des Berichts; wird über den Inhalts-Hash zwischengespeichert."""
+        if self._layout is None:
+            from generators.layout import erstelle_layout
+            self._layout = erstelle_layout(self.context)
+        return self._layout
 
     @abstractmethod
     def _setup_document(self) -> None:
@@ -42,28 +68,85 @@ class BaseGenerator(ABC):
         pass
 
     @abstractmethod
-    def _save_document(self, dateiname: str) -> None:
-        """Speichert das fertiggestellte Dokument."""
+    def _write_document(self, stream: BinaryIO) -> None:
+        """Schreibt das fertiggestellte Dokument in einen beschreibbaren Binär-Stream."""
         pass
 
-    def generate(self, dateiname: str) -> None:
+    def render_to_stream(self, stream: BinaryIO, progress_callback: Optional[ProgressCallback] = None,
+                         cancel_event: Optional[threading.Event] = None) -> None:
+        """
+        Erstellt das Dokument und schreibt es in einen beliebigen beschreibbaren Stream
+        (z.B. BytesIO oder einen Eintrag in einem ZIP-Archiv), ohne das Dateisystem zu berühren.
+
+        Args:
+            stream: Der Ziel-Stream im Binärmodus.
+            progress_callback: Optionaler Callback, der vor jedem Schritt aufgerufen wird.
+            cancel_event: Optionales Event; ist es gesetzt, wird vor dem nächsten Schritt abgebrochen.
+
+        Raises:
+            GenerierungAbgebrochen: Wenn `cancel_event` gesetzt wurde, bevor geschrieben wurde.
+        """
+        self._run_steps("<stream>", lambda: self._write_document(stream), progress_callback, cancel_event)
+
+    def render_to_bytes(self, progress_callback: Optional[ProgressCallback] = None,
+                        cancel_event: Optional[threading.Event] = None) -> bytes:
+        """Erstellt das Dokument im Speicher und gibt es als Bytes zurück."""
+        buffer = io.BytesIO()
+        self.render_to_stream(buffer, progress_callback, cancel_event)
+        return buffer.getvalue()
+
+    def generate(self, dateiname: str, progress_callback: Optional[ProgressCallback] = None,
+                 cancel_event: Optional[threading.Event] = None) -> None:
+        """
+        Erstellt das Dokument als Datei im Ausgabeordner.
+        Dünner Wrapper um die Stream-Ausgabe: Die Datei wird erst im Schritt "Speichern" geöffnet.
+
+        Args:
+            dateiname: Der Dateiname innerhalb des Ausgabeordners.
+            progress_callback: Optionaler Callback, der vor jedem Schritt aufgerufen wird.
+            cancel_event: Optionales Event; ist es gesetzt, wird vor dem nächsten Schritt abgebrochen.
+
+        Raises:
+            GenerierungAbgebrochen: Wenn `cancel_event` gesetzt wurde, bevor die Datei geschrieben wurde.
+        """
+        voller_pfad = os.path.join(config.OUTPUT_FOLDER, dateiname)
+
+        def speichern() -> None:
+            # --- KORREKTUR: Sicherstellen, dass der Ausgabeordner existiert ---
+            os.makedirs(os.path.dirname(voller_pfad), exist_ok=True)
+            with open(voller_pfad, "wb") as datei:
+                self._write_document(datei)
+            logger.info(f"Dokument erfolgreich gespeichert: {voller_pfad}")
+
+        self._run_steps(dateiname, speichern, progress_callback, cancel_event)
+
+    def _run_steps(self, bezeichnung_ziel: str, speichern: Callable[[], None],
+                   progress_callback: Optional[ProgressCallback],
+                   cancel_event: Optional[threading.Event]) -> None:
         """
         Orchestriert den gesamten Erstellungsprozess des Dokuments.
         Diese Methode ist NICHT abstrakt.
         """
+        schritte = [
+            ("Kopfzeile", self._create_header),
+            ("Hauptteil", self._create_body),
+            ("Fußzeile", self._create_footer),
+            ("Speichern", speichern),
+        ]
         try:
             self._setup_document()
-            self._create_header()
-            self._create_body()
-            self._create_footer()
-            
-            voller_pfad = os.path.join(config.OUTPUT_FOLDER, dateiname)
-            
-            # --- KORREKTUR: Sicherstellen, dass der Ausgabeordner existiert ---
-            os.makedirs(os.path.dirname(voller_pfad), exist_ok=True)
-            
-            self._save_document(voller_pfad)
+            for index, (bezeichnung, schritt) in enumerate(schritte):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise GenerierungAbgebrochen(f"Erstellung von '{bezeichnung_ziel}' abgebrochen.")
+                if progress_callback:
+                    progress_callback(bezeichnung, index / len(schritte))
+                schritt()
+            if progress_callback:
+                progress_callback("Fertig", 1.0)
+        except GenerierungAbgebrochen:
+            logger.info(f"Erstellung des Dokuments '{bezeichnung_ziel}' wurde abgebrochen.")
+            raise
         except Exception as e:
-            logger.error(f"Fehler beim Generieren des Dokuments '{dateiname}'.", exc_info=True)
+            logger.error(f"Fehler beim Generieren des Dokuments '{bezeichnung_ziel}'.", exc_info=True)
             # Die Exception wird weitergereicht, damit der Controller sie fangen und behandeln kann.
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,104 @@
+# generators/bild_cache.py
+# -*- coding: utf-8 -*-
+"""
+Prozessweiter Cache für Bilder in den Dokumenten (z.B. Unterschriften).
+
+Jedes Bild wird nur einmal dekodiert, auf Druckgröße skaliert und als kleines PNG
+mit Farbpalette kodiert. Bei Stapel-Exporten mit hunderten Wochen betten die
+Generatoren nur noch dieses fertige PNG ein, statt das Original pro Dokument zu verarbeiten.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional
+import hashlib
+import io
+import logging
+import threading
+
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Höhe einer Unterschrift im Dokument
+UNTERSCHRIFT_HOEHE_MM = 15
+# Entspricht etwa 300 dpi bei 15 mm Höhe; größere Bilder werden verkleinert.
+_MAX_HOEHE_PX = 180
+_PALETTEN_FARBEN = 32
+
+
+@dataclass(frozen=True)
+class VorbereitetesBild:
+    """Ein dekodiertes, skaliertes und als PNG kodiertes Bild."""
+    schluessel: str
+    png: bytes
+    breite_px: int
+    hoehe_px: int
+
+    def breite_bei_hoehe(self, hoehe: float) -> float:
+        """Gibt die Breite zurück, die das Bild bei der angegebenen Höhe (gleiche Einheit) einnimmt."""
+        return hoehe * self.breite_px / self.hoehe_px
+
+
+_bilder: Dict[str, VorbereitetesBild] = {}
+_lock = threading.Lock()
+
+
+def berechne_schluessel(daten: bytes) -> str:
+    """Berechnet den Cache-Schlüssel (SHA-256) der Originaldaten eines Bildes."""
+    return hashlib.sha256(daten).hexdigest()
+
+
+def registriere_bild(daten: bytes) -> str:
+    """
+    Dekodiert und skaliert ein Bild einmalig und legt es im Cache ab.
+
+    Args:
+        daten: Die Originaldaten des Bildes (PNG, JPEG, ...).
+
+    Returns:
+        Den Schlüssel, unter dem das Bild abgelegt ist.
+
+    Raises:
+        ValueError: Wenn die Daten kein lesbares Bild sind.
+    """
+    schluessel = berechne_schluessel(daten)
+    with _lock:
+        if schluessel in _bilder:
+            return schluessel
+
+    try:
+        with Image.open(io.BytesIO(daten)) as original:
+            bild = ImageOps.exif_transpose(original)
+            bild = bild.convert("RGBA" if bild.mode in ("RGBA", "LA", "PA") or "transparency" in bild.info else "RGB")
+    except (OSError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Die Datei ist kein lesbares Bild: {e}") from e
+
+    if bild.height > _MAX_HOEHE_PX:
+        bild.thumbnail((bild.width, _MAX_HOEHE_PX), Image.Resampling.LANCZOS)
+    # Unterschriften bestehen aus wenigen Tintenfarben: eine Palette verkleinert PNG und PDF deutlich.
+    bild = bild.quantize(colors=_PALETTEN_FARBEN, method=Image.Quantize.FASTOCTREE)
+    puffer = io.BytesIO()
+    bild.save(puffer, format="PNG", optimize=True, icc_profile=None)
+
+    vorbereitet = VorbereitetesBild(schluessel, puffer.getvalue(), bild.width, bild.height)
+    with _lock:
+        _bilder.setdefault(schluessel, vorbereitet)
+    logger.debug(f"Bild {schluessel[:12]} vorbereitet ({bild.width}x{bild.height} px).")
+    return schluessel
+
+
+def ist_geladen(schluessel: str) -> bool:
+    """Prüft, ob ein Bild bereits im Cache liegt."""
+    with _lock:
+        return schluessel in _bilder
+
+
+def lade_bild(schluessel: str) -> Optional[VorbereitetesBild]:
+    """Gibt ein vorbereitetes Bild zurück oder None, wenn es nicht registriert wurde."""
+    with _lock:
+        return _bilder.get(schluessel)
+
+
+def leere_cache() -> None:
+    """Verwirft alle vorbereiteten Bilder."""
+    with _lock:
+        _bilder.clear()
@@ -0,0 +1,333 @@
+# generators/docx_template.py
+# -*- coding: utf-8 -*-
+"""
+Benutzerdefinierte DOCX-Vorlagen mit Platzhaltern.
+
+Eine Vorlage ist ein normales Word-Dokument mit Platzhaltern wie `{{name_azubi}}`.
+Wiederholte Bereiche werden mit `{{#tage}}` ... `{{/tage}}` (pro Wochentag) und darin
+`{{#punkte}}` ... `{{/punkte}}` (pro Tätigkeit, Platzhalter `{{punkt}}`) markiert:
+- Steht ein Marker allein in einem Absatz, begrenzt dieser Absatz den Block.
+- Steht ein Marker in einer Tabellenzeile, wird die ganze Zeile wiederholt.
+
+Jede Vorlage wird einmal in einen Füllplan übersetzt (feste XML-Abschnitte, Felder und
+Blöcke) und über den SHA-256 der Datei zwischengespeichert. Pro Bericht werden dann nur
+noch Werte eingesetzt, ohne die Vorlage erneut zu parsen.
+"""
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape
+import hashlib
+import io
+import logging
+import os
+import re
+import threading
+import zipfile
+
+from lxml import etree
+
+from core import config
+from generators.docx_generator import DocxGenerator
+
+logger = logging.getLogger(__name__)
+
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+# Teile des Dokuments, in denen Platzhalter ersetzt werden
+_TEIL_MUSTER = re.compile(r"word/(document|header\d*|footer\d*)\.xml")
+_PLATZHALTER = re.compile(r"\{\{\s*([#/]?)\s*([A-Za-z_]\w*)\s*\}\}")
+_KOMMENTAR_PREFIX = "vorlage:"
+_TOKEN = re.compile(r"<!--" + _KOMMENTAR_PREFIX + r"([#/])(\w+)-->|\{\{\s*([A-Za-z_]\w*)\s*\}\}")
+
+# Felder, die eine Vorlage verwenden kann (Block -> erlaubte Platzhalter)
+FELDER: Dict[Optional[str], Tuple[str, ...]] = {
+    None: ("fortlaufende_nr", "name_azubi", "jahr", "kalenderwoche", "zeitraum_von", "zeitraum_bis",
+           "ausbildungsjahr", "erstellungsdatum_bericht"),
+    "tage": ("tag_name", "typ", "stunden", "taetigkeiten"),
+    "punkte": ("punkt",),
+}
+
+# Ein Element des Füllplans: fester XML-Text, ein Feld oder ein Block mit eigenem Plan
+_Planelement = Union[str, "Feld", "Block"]
+
+
+@dataclass(frozen=True)
+class Feld:
+    """Ein Platzhalter, der beim Füllen durch einen (XML-maskierten) Wert ersetzt wird."""
+    name: str
+
+
+@dataclass(frozen=True)
+class Block:
+    """Ein Bereich, der für jeden Eintrag einer Liste (z.B. pro Wochentag) wiederholt wird."""
+    name: str
+    inhalt: Tuple[_Planelement, ...]
+
+
+@dataclass(frozen=True)
+class VorlagenPlan:
+    """Der kompilierte Füllplan einer Vorlage."""
+    schluessel: str
+    teile: Tuple[Tuple[zipfile.ZipInfo, Union[bytes, Tuple[_Planelement, ...]]], ...]
+    zeilenumbruch: str  # XML, das einen Zeilenumbruch innerhalb von <w:t> einfügt
+    unbekannte_felder: Tuple[str, ...]
+
+    def fuelle(self, werte: Dict[str, Any], stream: BinaryIO) -> None:
+        """
+        Setzt die Werte in die Vorlage ein und schreibt das fertige DOCX in den Stream.
+
+        Args:
+            werte: Felder der obersten Ebene; Blöcke als Listen von Dictionaries.
+            stream: Der Ziel-Stream im Binärmodus.
+        """
+        with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as ziel:
+            for info, inhalt in self.teile:
+                if isinstance(inhalt, bytes):
+                    daten = inhalt
+                else:
+                    teile: List[str] = []
+                    self._rendere(inhalt, [werte], teile)
+                    daten = "".join(teile).encode("utf-8")
+                ziel.writestr(info, daten, compress_type=zipfile.ZIP_DEFLATED)
+
+    def _rendere(self, plan: Tuple[_Planelement, ...], bereiche: List[Dict[str, Any]], ausgabe: List[str]) -> None:
+        for element in plan:
+            if isinstance(element, str):
+                ausgabe.append(element)
+            elif isinstance(element, Feld):
+                wert = next((b[element.name] for b in reversed(bereiche) if element.name in b), "")
+                ausgabe.append(escape(str(wert)).replace("\n", self.zeilenumbruch))
+            else:
+                for eintrag in next((b[element.name] for b in reversed(bereiche) if element.name in b), []):
+                    bereiche.append(eintrag)
+                    self._rendere(element.inhalt, bereiche, ausgabe)
+                    bereiche.pop()
+
+
+# SHA-256 -> Plan sowie (Pfad, Änderungszeit, Größe) -> SHA-256
+_plaene: Dict[str, VorlagenPlan] = {}
+_datei_hashes: Dict[Tuple[str, int, int], str] = {}
+_lock = threading.Lock()
+
+
+def vorlagen_schluessel(pfad: str) -> str:
+    """
+    Gibt den SHA-256 einer Vorlagendatei zurück; unveränderte Dateien werden nicht erneut gelesen.
+
+    Raises:
+        OSError: Wenn die Datei nicht gelesen werden kann.
+    """
+    stat = os.stat(pfad)
+    datei_schluessel = (os.path.abspath(pfad), stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        sha = _datei_hashes.get(datei_schluessel)
+    if sha is None:
+        with open(pfad, "rb") as f:
+            sha = hashlib.sha256(f.read()).hexdigest()
+        with _lock:
+            _datei_hashes[datei_schluessel] = sha
+    return sha
+
+
+def lade_plan(pfad: str) -> VorlagenPlan:
+    """
+    Gibt den Füllplan einer Vorlage zurück und kompiliert ihn nur, wenn sich die Datei geändert hat.
+
+    Raises:
+        OSError: Wenn die Datei nicht gelesen werden kann.
+        ValueError: Wenn die Datei keine gültige Vorlage ist.
+    """
+    sha = vorlagen_schluessel(pfad)
+    with _lock:
+        plan = _plaene.get(sha)
+    if plan is None:
+        with open(pfad, "rb") as f:
+            daten = f.read()
+        plan = kompiliere_vorlage(daten)
+        with _lock:
+            plan = _plaene.setdefault(plan.schluessel, plan)
+        logger.info(f"DOCX-Vorlage '{os.path.basename(pfad)}' kompiliert.")
+    return plan
+
+
+def kompiliere_vorlage(daten: bytes) -> VorlagenPlan:
+    """
+    Übersetzt eine DOCX-Vorlage in einen Füllplan.
+
+    Args:
+        daten: Der Inhalt der .docx-Datei.
+
+    Returns:
+        Den kompilierten Plan.
+
+    Raises:
+        ValueError: Wenn die Datei kein DOCX ist oder die Blöcke fehlerhaft sind.
+    """
+    try:
+        archiv = zipfile.ZipFile(io.BytesIO(daten))
+        eintraege = [(info, archiv.read(info)) for info in archiv.infolist()]
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Die Vorlage ist keine gültige DOCX-Datei: {e}") from e
+
+    teile = []
+    unbekannt: List[str] = []
+    zeilenumbruch = '</w:t><w:br/><w:t xml:space="preserve">'
+    for info, inhalt in eintraege:
+        if not _TEIL_MUSTER.fullmatch(info.filename) or b"{{" not in inhalt:
+            teile.append((info, inhalt))
+            continue
+        try:
+            wurzel = etree.fromstring(inhalt)
+        except etree.XMLSyntaxError as e:
+            raise ValueError(f"'{info.filename}' ist kein gültiges XML: {e}") from e
+        praefix = next((p for p, ns in wurzel.nsmap.items() if ns == _W and p), "w")
+        zeilenumbruch = f'</{praefix}:t><{praefix}:br/><{praefix}:t xml:space="preserve">'
+        for absatz in wurzel.iter(f"{{{_W}}}p"):
+            _normalisiere_absatz(absatz)
+        _ersetze_blockmarker(wurzel, info.filename)
+        xml = etree.tostring(wurzel, xml_declaration=True, encoding="UTF-8", standalone=True).decode("utf-8")
+        teile.append((info, _baue_plan(xml, info.filename, unbekannt)))
+
+    if unbekannt:
+        logger.warning(f"Unbekannte Platzhalter in der Vorlage: {', '.join(sorted(set(unbekannt)))}")
+    return VorlagenPlan(hashlib.sha256(daten).hexdigest(), tuple(teile), zeilenumbruch, tuple(sorted(set(unbekannt))))
+
+
+def _normalisiere_absatz(absatz: etree._Element) -> None:
+    """
+    Word verteilt Text oft auf mehrere Runs. Damit jeder Platzhalter in genau einem <w:t>
+    steht, wird der Text eines über mehrere Knoten verteilten Platzhalters in den ersten
+    Knoten verschoben. Der Gesamttext des Absatzes bleibt dabei unverändert.
+    """
+    knoten = list(absatz.iter(f"{{{_W}}}t"))
+    gesamt = "".join(t.text or "" for t in knoten)
+    if "{{" not in gesamt:
+        return
+    for treffer in _PLATZHALTER.finditer(gesamt):
+        start = 0
+        erster = None
+        for t in knoten:
+            text = t.text or ""
+            ende = start + len(text)
+            if erster is None and start <= treffer.start() < ende:
+                erster = t
+                erster.set(_XML_SPACE, "preserve")
+            elif erster is not None and start < treffer.end():
+                nimm = min(len(text), treffer.end() - start)
+                erster.text = (erster.text or "") + text[:nimm]
+                t.text = text[nimm:]
+                ende = start + nimm + len(t.text)
+            start = ende
+            if start >= treffer.end():
+                break
+
+
+def _ersetze_blockmarker(wurzel: etree._Element, teilname: str) -> None:
+    """Ersetzt Block-Marker durch Kommentare an Absatz- bzw. Tabellenzeilengrenzen."""
+    for t in list(wurzel.iter(f"{{{_W}}}t")):
+        for treffer in list(_PLATZHALTER.finditer(t.text or "")):
+            art, name = treffer.group(1), treffer.group(2)
+            if not art:
+                continue
+            absatz = next(t.iterancestors(f"{{{_W}}}p"))
+            zeile = next(t.iterancestors(f"{{{_W}}}tr"), None)
+            kommentar = etree.Comment(f"{_KOMMENTAR_PREFIX}{art}{name}")
+            if zeile is not None:
+                # In Tabellen wird die ganze Zeile wiederholt; der Marker selbst verschwindet.
+                t.text = t.text.replace(treffer.group(0), "", 1)
+                if art == "#":
+                    zeile.addprevious(kommentar)
+                else:
+                    zeile.addnext(kommentar)
+            elif "".join(x.text or "" for x in absatz.iter(f"{{{_W}}}t")).strip() == treffer.group(0):
+                kommentar.tail = absatz.tail
+                absatz.getparent().replace(absatz, kommentar)
+                break
+            else:
+                raise ValueError(f"Der Marker '{treffer.group(0)}' in '{teilname}' muss allein in einem Absatz "
+                                 f"oder in einer Tabellenzeile stehen.")
+
+
+def _baue_plan(xml: str, teilname: str, unbekannt: List[str]) -> Tuple[_Planelement, ...]:
+    """Zerlegt das vorbereitete XML in feste Abschnitte, Felder und (verschachtelte) Blöcke."""
+    stapel: List[Tuple[Optional[str], List[_Planelement]]] = [(None, [])]
+    position = 0
+    for treffer in _TOKEN.finditer(xml):
+        stapel[-1][1].append(xml[position:treffer.start()])
+        position = treffer.end()
+        art, blockname, feldname = treffer.groups()
+        if feldname:
+            erlaubt = {feld for name, _ in stapel for feld in FELDER.get(name, ())}
+            if feldname not in erlaubt:
+                unbekannt.append(feldname)
+            stapel[-1][1].append(Feld(feldname))
+        elif art == "#":
+            if blockname not in FELDER:
+                raise ValueError(f"Unbekannter Block '{{{{#{blockname}}}}}' in '{teilname}'.")
+            stapel.append((blockname, []))
+        else:
+            name, inhalt = stapel.pop() if len(stapel) > 1 else (None, [])
+            if name != blockname:
+                raise ValueError(f"'{{{{/{blockname}}}}}' in '{teilname}' schließt keinen offenen Block.")
+            stapel[-1][1].append(Block(name, tuple(inhalt)))
+    if len(stapel) > 1:
+        raise ValueError(f"Der Block '{{{{#{stapel[-1][0]}}}}}' in '{teilname}' wird nicht geschlossen.")
+    stapel[0][1].append(xml[position:])
+    return tuple(element for element in stapel[0][1] if element != "")
+
+
+def leere_cache() -> None:
+    """Verwirft alle kompilierten Vorlagen."""
+    with _lock:
+        _plaene.clear()
+        _datei_hashes.clear()
+
+
+class DocxVorlagenGenerator(DocxGenerator):
+    """
+    Erstellt DOCX-Berichte auf Basis einer benutzerdefinierten Vorlage.
+    Der Kontext enthält unter 'docx_vorlage' den Pfad und den Hash der Vorlage.
+    """
+
+    def __init__(self, context: Dict[str, Any]):
+        super().__init__(context)
+        self.plan: Optional[VorlagenPlan] = None
+
+    def _setup_document(self) -> None:
+        """Lädt den (zwischengespeicherten) Füllplan der Vorlage."""
+        self.plan = lade_plan(self.context["docx_vorlage"]["pfad"])
+
+    def _create_header(self) -> None:
+        """Kopf, Hauptteil und Fußzeile stammen aus der Vorlage."""
+        pass
+
+    def _create_body(self) -> None:
+        pass
+
+    def _create_footer(self) -> None:
+        pass
+
+    def _werte(self) -> Dict[str, Any]:
+        """Stellt die Werte für die Platzhalter aus Kontext und Layout-Modell zusammen."""
+        werte = {feld: self.context.get(feld, "") for feld in FELDER[None]}
+        tage_daten = self.context.get("tage_daten", [])
+        werte["tage"] = []
+        for i, (tag_name, tag) in enumerate(zip(config.DAYS_IN_WEEK, self.layout.tage, strict=True)):
+            tag_daten = tage_daten[i] if i < len(tage_daten) else {}
+            punkte = [punkt.text for punkt in tag.punkte]
+            werte["tage"].append({
+                "tag_name": tag_name,
+                "typ": tag_daten.get("typ", ""),
+                "stunden": tag_daten.get("stunden", ""),
+                "taetigkeiten": "\n".join(punkte),
+                "punkte": [{"punkt": punkt} for punkt in punkte],
+            })
+        return werte
+
+    def _write_document(self, stream: BinaryIO) -> None:
+        """Füllt die Vorlage und schreibt das Ergebnis in den Stream."""
+        try:
+            self.plan.fuelle(self._werte(), stream)
+        except Exception as e:
+            logger.error("Fehler beim Füllen der DOCX-Vorlage.", exc_info=True)
+            raise IOError(f"Konnte DOCX aus Vorlage nicht speichern: {e}") from e
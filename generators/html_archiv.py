@@ -0,0 +1,145 @@
+# generators/html_archiv.py
+# -*- coding: utf-8 -*-
+"""
+Schreibt alle Berichte als durchsuchbares, offline lesbares HTML-Archiv.
+
+Aufbau des Zielordners:
+    index.html              Übersicht der Ausbildungsjahre (Kalenderjahre)
+    <jahr>/index.html       Übersicht der Wochen eines Jahres
+    <jahr>/KW<nn>.html      Eine Seite pro Bericht
+
+Im Zielordner liegt ein kleines Manifest mit den Inhalts-Hashes aller Seiten. Bei
+einem erneuten Export werden nur Seiten geschrieben, deren Bericht sich geändert hat;
+Übersichtsseiten nur, wenn sich ihr Inhalt tatsächlich unterscheidet.
+"""
+import hashlib
+import html
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Tuple
+
+from core.logic import BerichtsheftLogik
+from generators.html_generator import SEITENENDE, HtmlGenerator, seitenanfang
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_DATEI = ".berichtsheft-archiv.json"
+
+
+def schreibe_archiv(kontexte: Iterable[Tuple[str, Dict[str, Any]]], zielordner: str) -> Dict[str, int]:
+    """
+    Aktualisiert das HTML-Archiv im Zielordner.
+
+    Args:
+        kontexte: Tupel aus Bericht-ID und Render-Kontext, z.B. aus dem Controller.
+        zielordner: Der Ordner des Archivs (wird bei Bedarf angelegt).
+
+    Returns:
+        Ein Dictionary mit den Zählern 'erstellt', 'unveraendert' und 'entfernt'.
+
+    Raises:
+        OSError: Wenn der Zielordner nicht beschrieben werden kann.
+    """
+    manifest = _lade_manifest(zielordner)
+    alte_seiten: Dict[str, Dict[str, str]] = manifest.get("seiten", {})
+    alte_uebersichten: Dict[str, str] = manifest.get("uebersichten", {})
+    neue_seiten: Dict[str, Dict[str, str]] = {}
+    jahre: Dict[str, List[Tuple[str, Dict[str, Any], str]]] = {}
+    statistik = {"erstellt": 0, "unveraendert": 0, "entfernt": 0}
+
+    for bericht_id, context in kontexte:
+        jahr = str(context["jahr"])
+        datei = f"{jahr}/KW{int(context['kalenderwoche']):02d}.html"
+        # Die Generator-Version fließt ein, damit Layout-Änderungen alle Seiten neu erzeugen.
+        seiten_hash = f"{HtmlGenerator.GENERATOR_VERSION}:{BerichtsheftLogik.berechne_inhalts_hash(context)}"
+        alt = alte_seiten.get(bericht_id)
+        if alt == {"datei": datei, "hash": seiten_hash} and os.path.isfile(os.path.join(zielordner, datei)):
+            statistik["unveraendert"] += 1
+        else:
+            # Kopie: Der Kontext des Aufrufers bleibt unverändert.
+            seite = HtmlGenerator(dict(context, html_zurueck="index.html")).render_to_bytes()
+            _schreibe_atomar(zielordner, datei, seite)
+            statistik["erstellt"] += 1
+        neue_seiten[bericht_id] = {"datei": datei, "hash": seiten_hash}
+        jahre.setdefault(jahr, []).append((bericht_id, context, datei))
+
+    for bericht_id, alt in alte_seiten.items():
+        if neue_seiten.get(bericht_id, {}).get("datei") != alt["datei"]:
+            _entferne(zielordner, alt["datei"])
+            statistik["entfernt"] += 1
+
+    uebersichten = {f"{jahr}/index.html": _jahresuebersicht(jahr, eintraege) for jahr, eintraege in jahre.items()}
+    uebersichten["index.html"] = _gesamtuebersicht(jahre)
+    neue_uebersichten = {}
+    for datei, inhalt in uebersichten.items():
+        daten = inhalt.encode("utf-8")
+        neue_uebersichten[datei] = hashlib.sha256(daten).hexdigest()
+        if alte_uebersichten.get(datei) != neue_uebersichten[datei] or not os.path.isfile(os.path.join(zielordner, datei)):
+            _schreibe_atomar(zielordner, datei, daten)
+    for datei in set(alte_uebersichten) - set(neue_uebersichten):
+        _entferne(zielordner, datei)
+
+    _schreibe_atomar(zielordner, MANIFEST_DATEI, json.dumps(
+        {"seiten": neue_seiten, "uebersichten": neue_uebersichten}, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    logger.info(f"HTML-Archiv in '{zielordner}' aktualisiert: {statistik['erstellt']} Seiten erstellt, "
+                f"{statistik['unveraendert']} unverändert, {statistik['entfernt']} entfernt.")
+    return statistik
+
+
+def _jahresuebersicht(jahr: str, eintraege: List[Tuple[str, Dict[str, Any], str]]) -> str:
+    """Tabelle aller Wochen eines Jahres mit Links auf die Berichtsseiten."""
+    zeilen = []
+    for _, context, datei in sorted(eintraege, key=lambda eintrag: int(eintrag[1]["kalenderwoche"])):
+        zeilen.append(
+            f'<tr><td>Nr. {html.escape(str(context.get("fortlaufende_nr", "")))}</td>'
+            f'<td><a href="{os.path.basename(datei)}">KW {int(context["kalenderwoche"]):02d}</a></td>'
+            f'<td>{html.escape(str(context.get("zeitraum_von", "")))} bis {html.escape(str(context.get("zeitraum_bis", "")))}</td>'
+            f'<td>Ausbildungsjahr {html.escape(str(context.get("ausbildungsjahr", "")))}</td></tr>\n'
+        )
+    return (seitenanfang(f"Berichtshefte {jahr}") + '<nav><a href="../index.html">&larr; Alle Jahre</a></nav>\n'
+            + f"<h1>Berichtshefte {html.escape(jahr)}</h1>\n<table>\n" + "".join(zeilen) + "</table>\n" + SEITENENDE)
+
+
+def _gesamtuebersicht(jahre: Dict[str, List[Tuple[str, Dict[str, Any], str]]]) -> str:
+    """Liste aller Jahre mit der Anzahl der Berichte."""
+    zeilen = [f'<li><a href="{jahr}/index.html">{html.escape(jahr)}</a> ({len(eintraege)} Berichte)</li>\n'
+              for jahr, eintraege in sorted(jahre.items())]
+    return seitenanfang("Berichtshefte") + "<h1>Berichtshefte</h1>\n<ul>\n" + "".join(zeilen) + "</ul>\n" + SEITENENDE
+
+
+def _lade_manifest(zielordner: str) -> Dict[str, Any]:
+    """Liest das Manifest des letzten Exports; fehlt es oder ist es beschädigt, wird alles neu erstellt."""
+    try:
+        with open(os.path.join(zielordner, MANIFEST_DATEI), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
+        logger.warning(f"Manifest des HTML-Archivs in '{zielordner}' ist unlesbar, erstelle alles neu.", exc_info=True)
+        return {}
+
+
+def _schreibe_atomar(zielordner: str, datei: str, daten: bytes) -> None:
+    """Schreibt eine Datei über eine temporäre Datei, damit abgebrochene Exporte keine halben Seiten hinterlassen."""
+    pfad = os.path.join(zielordner, datei)
+    os.makedirs(os.path.dirname(pfad), exist_ok=True)
+    temp_pfad = pfad + ".tmp"
+    with open(temp_pfad, "wb") as f:
+        f.write(daten)
+    os.replace(temp_pfad, pfad)
+
+
+def _entferne(zielordner: str, datei: str) -> None:
+    """Entfernt eine nicht mehr benötigte Seite samt leer gewordenem Jahresordner."""
+    pfad = os.path.join(zielordner, datei)
+    try:
+        os.remove(pfad)
+        ordner = os.path.dirname(pfad)
+        if os.path.normpath(ordner) != os.path.normpath(zielordner) and not os.listdir(ordner):
+            os.rmdir(ordner)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        logger.warning(f"'{pfad}' konnte nicht entfernt werden.", exc_info=True)
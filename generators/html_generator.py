@@ -0,0 +1,88 @@
+# generators/html_generator.py
+# -*- coding: utf-8 -*-
+"""
+Erstellt Berichtshefte als eigenständige HTML-Seiten (ohne externe Abhängigkeiten).
+"""
+import base64
+import html
+import logging
+from typing import Dict, Any, BinaryIO, List
+
+from generators import bild_cache
+from generators.base_generator import BaseGenerator
+from generators.layout import STIL_TITEL, STIL_UEBERSCHRIFT, Textlauf
+
+logger = logging.getLogger(__name__)
+
+# Gemeinsames Stylesheet aller Seiten; wird eingebettet, damit jede Seite für sich lesbar ist.
+STYLESHEET = (
+    "body{font-family:Verdana,sans-serif;font-size:11pt;max-width:190mm;margin:10mm auto;padding:0 4mm;color:#222}"
+    "h1{font-size:20pt;margin:0 0 4mm}h2{font-size:12pt;margin:5mm 0 1mm}"
+    "ul{margin:0 0 0 6mm;padding:0}nav{margin-bottom:4mm;font-size:10pt}"
+    "img.unterschrift{height:" + str(bild_cache.UNTERSCHRIFT_HOEHE_MM) + "mm;display:block}"
+    "table{border-collapse:collapse}td{padding:1mm 4mm 1mm 0}"
+)
+
+
+def seitenanfang(titel: str) -> str:
+    """Gibt den Kopf einer HTML-Seite mit eingebettetem Stylesheet zurück."""
+    return (f'<!DOCTYPE html>\n<html lang="de">\n<head>\n<meta charset="utf-8">\n'
+            f'<title>{html.escape(titel)}</title>\n<style>{STYLESHEET}</style>\n</head>\n<body>\n')
+
+
+SEITENENDE = "</body>\n</html>\n"
+
+
+class HtmlGenerator(BaseGenerator):
+    """
+    Spezialisierte Klasse zur Generierung von HTML-Berichtsheften.
+    Optional kann der Kontext unter 'html_zurueck' einen Link zur Übersichtsseite enthalten.
+    """
+    GENERATOR_VERSION = "1"
+
+    def __init__(self, context: Dict[str, Any]):
+        super().__init__(context)
+        self.teile: List[str] = []
+
+    def _setup_document(self) -> None:
+        """Beginnt eine neue HTML-Seite."""
+        self.teile = [seitenanfang(self.layout.titel.text)]
+        zurueck = self.context.get("html_zurueck")
+        if zurueck:
+            self.teile.append(f'<nav><a href="{html.escape(zurueck)}">&larr; Übersicht</a></nav>\n')
+
+    def _textlauf(self, lauf: Textlauf) -> str:
+        """Bildet einen Textlauf des Layouts auf ein passendes HTML-Element ab."""
+        tag = {STIL_TITEL: "h1", STIL_UEBERSCHRIFT: "h2"}.get(lauf.stil, "p")
+        return f"<{tag}>{html.escape(lauf.text)}</{tag}>\n"
+
+    def _create_header(self) -> None:
+        """Erstellt Titel und Inhaltszeile."""
+        self.teile.append(self._textlauf(self.layout.titel))
+        self.teile.append(self._textlauf(self.layout.info))
+
+    def _create_body(self) -> None:
+        """Erstellt die Tagesblöcke mit den Tätigkeiten als Aufzählung."""
+        for tag in self.layout.tage:
+            self.teile.append(self._textlauf(tag.ueberschrift))
+            self.teile.append("<ul>\n")
+            self.teile.extend(f"<li>{html.escape(punkt.text)}</li>\n" for punkt in tag.punkte)
+            self.teile.append("</ul>\n")
+
+    def _create_footer(self) -> None:
+        """Erstellt die Unterschriftsfelder; Bilder werden als Data-URI eingebettet."""
+        for feld in self.layout.unterschriften:
+            self.teile.append(self._textlauf(feld.rolle))
+            self.teile.append(self._textlauf(feld.zeile))
+            bild = bild_cache.lade_bild(feld.bild) if feld.bild else None
+            if bild is not None:
+                daten = base64.b64encode(bild.png).decode("ascii")
+                self.teile.append(f'<img class="unterschrift" alt="Unterschrift" src="data:image/png;base64,{daten}">\n')
+
+    def _write_document(self, stream: BinaryIO) -> None:
+        """Schreibt die HTML-Seite UTF-8-kodiert in den Stream."""
+        try:
+            stream.write("".join(self.teile + [SEITENENDE]).encode("utf-8"))
+        except Exception as e:
+            logger.error("Fehler beim Schreiben der HTML-Seite.", exc_info=True)
+            raise IOError(f"Konnte HTML nicht speichern: {e}") from e
@@ -0,0 +1,136 @@
+# generators/layout.py
+# -*- coding: utf-8 -*-
+"""
+Formatneutrales Layout-Modell eines Berichts.
+
+Das Modell wird einmal pro Bericht aus dem Render-Kontext aufgebaut und über den
+Inhalts-Hash zwischengespeichert. Die Generatoren (DOCX, PDF, ...) serialisieren
+nur noch dieses Modell, statt den Kontext jeweils selbst auszuwerten.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+import logging
+import threading
+
+from core import config
+from core.logic import BerichtsheftLogik
+
+logger = logging.getLogger(__name__)
+
+# Stile der Textläufe; die Backends bilden sie auf ihre Schriftarten und -größen ab.
+STIL_TITEL = "titel"
+STIL_UEBERSCHRIFT = "ueberschrift"
+STIL_TEXT = "text"
+
+_MAX_CACHE_EINTRAEGE = 256
+
+
+@dataclass(frozen=True)
+class Textlauf:
+    """Ein zusammenhängender Text in einheitlichem Stil."""
+    text: str
+    stil: str = STIL_TEXT
+
+
+@dataclass(frozen=True)
+class Aufzaehlungspunkt:
+    """Eine Tätigkeit als Aufzählungspunkt (ohne Aufzählungszeichen)."""
+    text: str
+
+
+@dataclass(frozen=True)
+class Tagesblock:
+    """Ein Wochentag mit Info-Zeile und den zugehörigen Tätigkeiten."""
+    ueberschrift: Textlauf
+    punkte: Tuple[Aufzaehlungspunkt, ...]
+
+
+@dataclass(frozen=True)
+class Unterschriftsfeld:
+    """Ein Unterschriftsbereich mit Rolle (z.B. "Auszubildender"), Datumszeile und optionalem Bild."""
+    rolle: Textlauf
+    zeile: Textlauf
+    bild: Optional[str] = None  # Schlüssel im Bild-Cache (generators.bild_cache)
+
+
+@dataclass(frozen=True)
+class BerichtsLayout:
+    """Das vollständige, unveränderliche Layout eines Berichts."""
+    titel: Textlauf
+    info: Textlauf
+    tage: Tuple[Tagesblock, ...]
+    unterschriften: Tuple[Unterschriftsfeld, ...]
+
+
+# Inhalts-Hash -> fertiges Layout (prozessweit, von Worker-Threads mitgenutzt)
+_layouts: Dict[str, BerichtsLayout] = {}
+_lock = threading.Lock()
+
+
+def erstelle_layout(context: Dict[str, Any]) -> BerichtsLayout:
+    """
+    Gibt das Layout für einen Render-Kontext zurück und baut es nur beim ersten Zugriff auf.
+
+    Args:
+        context: Der Render-Kontext eines Berichts.
+
+    Returns:
+        Das (ggf. zwischengespeicherte) Layout.
+    """
+    inhalt_hash = BerichtsheftLogik.berechne_inhalts_hash(context)
+    with _lock:
+        layout = _layouts.get(inhalt_hash)
+    if layout is not None:
+        return layout
+
+    layout = _baue_layout(context)
+    logger.debug(f"Layout für Bericht Nr. {context.get('fortlaufende_nr', '')} aufgebaut.")
+    with _lock:
+        if len(_layouts) >= _MAX_CACHE_EINTRAEGE:
+            # Ältesten Eintrag verwerfen (Dictionaries behalten die Einfügereihenfolge)
+            del _layouts[next(iter(_layouts))]
+        _layouts[inhalt_hash] = layout
+    return layout
+
+
+def _baue_layout(context: Dict[str, Any]) -> BerichtsLayout:
+    """Wertet den Kontext aus und erzeugt daraus das Layout-Modell."""
+    titel = Textlauf(f'Ausbildungsnachweis Nr. {context.get("fortlaufende_nr", "")}', STIL_TITEL)
+
+    azubi = context.get("name_azubi", "")
+    zeitraum_von = context.get("zeitraum_von", "")
+    zeitraum_bis = context.get("zeitraum_bis", "")
+    aj = context.get("ausbildungsjahr", "")
+    info = Textlauf(f'Azubi: {azubi}; Zeitraum: {zeitraum_von} bis {zeitraum_bis}; Jahr {aj}')
+
+    tage_daten = context.get("tage_daten", [])
+    tage = []
+    for i, tag_name in enumerate(config.DAYS_IN_WEEK):
+        # Fehlende Tage werden mit leeren Angaben und einem "-" als Tätigkeit dargestellt
+        tag_daten = tage_daten[i] if i < len(tage_daten) else {}
+        ueberschrift = Textlauf(
+            f'{tag_name}; Typ: {tag_daten.get("typ", "")}; Gesamtstunden: {tag_daten.get("stunden", "")}',
+            STIL_UEBERSCHRIFT,
+        )
+        punkte = tuple(
+            Aufzaehlungspunkt(item.strip())
+            for item in tag_daten.get("taetigkeiten", "-").split('\n')
+            if item.strip()
+        )
+        tage.append(Tagesblock(ueberschrift, punkte))
+
+    datum_azubi = context.get("erstellungsdatum_bericht", "")
+    bilder = context.get("unterschriften") or {}
+    unterschriften = (
+        Unterschriftsfeld(Textlauf(config.SIGNATURE_ROLES["azubi"], STIL_UEBERSCHRIFT),
+                          Textlauf(f"Datum: {datum_azubi}; Unterschrift:"), bilder.get("azubi")),
+        Unterschriftsfeld(Textlauf(config.SIGNATURE_ROLES["ausbilder"], STIL_UEBERSCHRIFT),
+                          Textlauf("Datum: .................; Unterschrift:"), bilder.get("ausbilder")),
+    )
+    return BerichtsLayout(titel, info, tuple(tage), unterschriften)
+
+
+def leere_cache() -> None:
+    """Verwirft alle zwischengespeicherten Layouts."""
+    with _lock:
+        _layouts.clear()
@@ -3,12 +3,17 @@
 """
 Erstellt Berichtshefte im PDF-Format, basierend auf einer Textvorlage.
 """
+import io
 import logging
 import os
 from fpdf import FPDF
-from typing import Dict, Any
+from fpdf.enums import XPos, YPos
+from typing import Dict, Any, BinaryIO
 
+from generators import bild_cache
 from generators.base_generator import BaseGenerator
+from generators.layout import STIL_TITEL, STIL_UEBERSCHRIFT, Textlauf
+from generators.pdf_layout import zeilen_umbrechen
 from core import config
 
 logger = logging.getLogger(__name__)
@@ -18,6 +23,8 @@ class PdfGenerator(BaseGenerator):
     Spezialisierte Klasse zur Generierung von PDF-Berichtsheften.
     Das Layout orientiert sich an einem einfachen Textformat.
     """
+    GENERATOR_VERSION = "2"
+
     def __init__(self, context: Dict[str, Any]):
         super().__init__(context)
         self.pdf: FPDF = None
@@ -47,62 +54,72 @@ class PdfGenerator(BaseGenerator):
             # raise RuntimeError("Benötigte Schriftartdateien fehlen.")
 
 
+    def _setze_schrift(self, lauf: Textlauf) -> None:
+        """Setzt die zum Stil des Textlaufs passende Schrift."""
+        if lauf.stil == STIL_TITEL:
+            self.pdf.set_font('Verdana', 'B', 20)
+        elif lauf.stil == STIL_UEBERSCHRIFT:
+            self.pdf.set_font('Verdana', 'B', 12)
+        else:
+            self.pdf.set_font('Verdana', '', 11)
+
+    def _zeile(self, lauf: Textlauf, hoehe: float) -> None:
+        """Gibt einen Textlauf als einzeilige Zelle über die volle Breite aus."""
+        self._setze_schrift(lauf)
+        self.pdf.cell(0, hoehe, lauf.text, 0, 1, 'L')
+
     def _create_header(self) -> None:
         """Erstellt die Kopfzeile des Dokuments."""
-        self.pdf.set_font('Verdana', 'B', 20) # Korrigiert: Nutzt die geladene Schriftart
-        self.pdf.cell(0, 8, f'Ausbildungsnachweis Nr. {self.context.get("fortlaufende_nr", "")}', 0, 1, 'L')
-        
-        self.pdf.set_font('Verdana', '', 11)
-        azubi = self.context.get("name_azubi", "")
-        zeitraum_von = self.context.get("zeitraum_von", "")
-        zeitraum_bis = self.context.get("zeitraum_bis", "")
-        aj = self.context.get("ausbildungsjahr", "")
-        
-        header_text = f'Azubi: {azubi}; Zeitraum: {zeitraum_von} bis {zeitraum_bis}; Jahr {aj}'
-        self.pdf.cell(0, 8, header_text, 0, 1, 'L')
+        self._zeile(self.layout.titel, 8)
+        self._zeile(self.layout.info, 8)
         # self.pdf.ln(8)
 
     def _create_body(self) -> None:
         """Füllt das Dokument mit den täglichen Berichtsdaten als Textblöcke."""
-        tage_daten = self.context.get("tage_daten", [])
-        for i, tag_name in enumerate(config.DAYS_IN_WEEK):
-            tag_daten = tage_daten[i] if i < len(tage_daten) else {}
-            
+        # Layout-Phase: Alle Aufzählungspunkte werden vorab umbrochen, danach nur noch ausgegeben.
+        self.pdf.set_font('Verdana', '', 11)
+        breite = self.pdf.w - self.pdf.r_margin - self.pdf.l_margin
+        tages_zeilen = [
+            [zeilen_umbrechen(self.pdf, f"• {punkt.text}", breite) for punkt in tag.punkte]
+            for tag in self.layout.tage
+        ]
+
+        for tag, zeilen_der_punkte in zip(self.layout.tage, tages_zeilen, strict=True):
             # Info-Zeile für den Tag
-            self.pdf.set_font('Verdana', 'B', 12) # Korrigiert
-            self.pdf.cell(0, 7, f'{tag_name}; Typ: {tag_daten.get("typ", "")}; Gesamtstunden: {tag_daten.get("stunden", "")}', 0, 1, 'L')
+            self._zeile(tag.ueberschrift, 7)
 
-            # Tätigkeiten mit Bullet Points
+            # Tätigkeiten mit Bullet Points: jede vorberechnete Zeile als einfache Zelle
             self.pdf.set_font('Verdana', '', 11)
-            taetigkeiten = tag_daten.get("taetigkeiten", "-").split('\n')
-            for item in taetigkeiten:
-                if item.strip():
-                     # Fügt einen Bullet Point hinzu und rückt den Text etwas ein
-                    self.pdf.multi_cell(0, 6, f"• {item.strip()}", 0, 'L')
+            for zeilen in zeilen_der_punkte:
+                for zeile in zeilen:
+                    self.pdf.cell(breite, 6, zeile, 0, align='L', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
             # self.pdf.ln(4) # Abstand nach jedem Eintrag
 
     def _create_footer(self) -> None:
         """Erstellt die Fußzeile mit Datum und Unterschriftsfeldern."""
         # self.pdf.ln(10)
-        datum_azubi = self.context.get("erstellungsdatum_bericht", "")
-        
-        self.pdf.set_font('Verdana', 'B', 12) # Fett für die Überschrift
-        self.pdf.cell(0, 7, "Auszubildender", 0, 1, 'L')
-        self.pdf.set_font('Verdana', '', 11)
-        self.pdf.cell(0, 7, f"Datum: {datum_azubi}; Unterschrift:", 0, 1, 'L')
-
-        # self.pdf.ln(5)
+        for feld in self.layout.unterschriften:
+            self._zeile(feld.rolle, 7)
+            self._zeile(feld.zeile, 7)
+            if feld.bild:
+                self._bild(feld.bild)
 
-        self.pdf.set_font('Verdana', 'B', 12) # Fett für die Überschrift
-        self.pdf.cell(0, 7, "Ausbildender bzw. Ausbilder", 0, 1, 'L')
-        self.pdf.set_font('Verdana', '', 11)
-        self.pdf.cell(0, 7, "Datum: .................; Unterschrift:", 0, 1, 'L')
+    def _bild(self, schluessel: str) -> None:
+        """
+        Fügt ein Bild aus dem Bild-Cache am linken Rand ein. Das PNG ist bereits skaliert und
+        kodiert; fpdf bettet gleiche Bilddaten pro Dokument nur einmal ein.
+        """
+        bild = bild_cache.lade_bild(schluessel)
+        if bild is None:
+            logger.warning(f"Bild {schluessel[:12]} ist nicht im Bild-Cache und wird ausgelassen.")
+            return
+        hoehe = bild_cache.UNTERSCHRIFT_HOEHE_MM
+        self.pdf.image(io.BytesIO(bild.png), x=self.pdf.l_margin, w=bild.breite_bei_hoehe(hoehe), h=hoehe)
 
-    def _save_document(self, dateiname: str) -> None:
-        """Speichert die PDF-Datei."""
+    def _write_document(self, stream: BinaryIO) -> None:
+        """Schreibt die PDF-Datei in den Stream."""
         try:
-            self.pdf.output(dateiname)
-            logger.info(f"PDF-Dokument erfolgreich gespeichert: {dateiname}")
+            stream.write(self.pdf.output())
         except Exception as e:
-            logger.error(f"Fehler beim Speichern des PDF-Dokuments '{dateiname}'.", exc_info=True)
-            raise IOError(f"Konnte PDF nicht speichern: {e}")
\ No newline at end of file
+            logger.error("Fehler beim Schreiben des PDF-Dokuments.", exc_info=True)
+            raise IOError(f"Konnte PDF nicht speichern: {e}")
@@ -0,0 +1,161 @@
+# generators/pdf_layout.py
+# -*- coding: utf-8 -*-
+"""
+Vorberechnetes Textlayout für den PDF-Generator.
+
+`FPDF.multi_cell` misst jeden String Zeichen für Zeichen über mehrere Objektschichten
+neu aus. Da sich die Tätigkeiten in Berichtsheften Woche für Woche wiederholen, werden
+hier die Zeichenbreiten pro Schriftart einmal als Tabelle abgelegt und die Zeilenumbrüche
+pro Text zwischengespeichert. Der Umbruch folgt exakt der Wortumbruch-Logik von fpdf2
+(WrapMode.WORD), sodass die Ausgabe mit `multi_cell` identisch bleibt.
+
+Die Caches sind prozessweit und werden von Worker-Threads (Stapel-Export, Vorschau)
+mitgenutzt; Änderungen an ihnen erfolgen nur unter `_lock`.
+"""
+import threading
+from typing import Dict, Tuple
+
+from fpdf import FPDF
+from fpdf.enums import MethodReturnValue
+
+# Zeichen, die fpdf beim Umbruch gesondert behandelt (weiche Trennstriche, geschützte und
+# sonstige Leerzeichen, Tabulatoren, Umbrüche). Texte damit bricht fpdf selbst um.
+_SONDERZEICHEN = frozenset(
+    "\n\r\u000c\u00a0\u00ad\t\u200b\u2000\u2001\u2002\u2003\u2004\u2005\u2006"
+    "\u2008\u2009\u200a\u205f\u3000"
+)
+_MAX_CACHE_EINTRAEGE = 4096
+
+# Schlüssel einer Zeichenbreiten-Tabelle: (Font-Schlüssel, Schriftgröße in pt, Skalierungsfaktor k)
+_TabellenSchluessel = Tuple[str, float, float]
+
+# Zeichen -> Breite in Dokumenteinheiten, pro Schriftart und -größe (prozessweit)
+_glyph_breiten: Dict[_TabellenSchluessel, Dict[str, float]] = {}
+# Memo der Umbruchergebnisse: (Tabelle, verfügbare Breite, Text) -> Zeilen
+_umbruch_ergebnisse: Dict[Tuple[_TabellenSchluessel, float, str], Tuple[str, ...]] = {}
+_lock = threading.Lock()
+
+
+def _tabellen_schluessel(pdf: FPDF) -> _TabellenSchluessel:
+    return (pdf.current_font.fontkey, pdf.font_size_pt, pdf.k)
+
+
+def _schnellpfad_moeglich(pdf: FPDF) -> bool:
+    """Der eigene Umbruch gilt nur für TTF-Schriften ohne Zeichenabstand, Streckung oder Text-Shaping."""
+    return (
+        pdf.is_ttf_font
+        and not pdf.text_shaping
+        and pdf.char_spacing == 0
+        and pdf.font_stretching == 100
+    )
+
+
+def _zeichenbreite(pdf: FPDF, tabelle: Dict[str, float], neue: Dict[str, float], zeichen: str) -> float:
+    """
+    Liefert die Breite eines Zeichens aus der geteilten Tabelle. Fehlt es dort, wird die
+    Breite berechnet und in `neue` vermerkt; übernommen wird sie später unter der Sperre.
+    """
+    breite = tabelle.get(zeichen)
+    if breite is None:
+        breite = neue.get(zeichen)
+        if breite is None:
+            # Gleiche Rechenreihenfolge wie fpdf (TTFFont.get_text_width / Fragment.get_width),
+            # damit die Gleitkommawerte bitgenau übereinstimmen.
+            breite = pdf.current_font.cw[ord(zeichen)] * pdf.font_size_pt * 0.001 / pdf.k
+            neue[zeichen] = breite
+    return breite
+
+
+def zeilen_umbrechen(pdf: FPDF, text: str, breite: float = 0) -> Tuple[str, ...]:
+    """
+    Bricht einen einzeiligen Text für die aktuelle Schrift des PDFs in Zeilen um.
+
+    Args:
+        pdf: Das FPDF-Objekt mit der gewünschten, bereits gesetzten Schrift.
+        text: Der umzubrechende Text (ohne Zeilenumbrüche).
+        breite: Die Zellenbreite wie bei `multi_cell`; 0 bedeutet bis zum rechten Rand.
+
+    Returns:
+        Die Zeilen in der Reihenfolge, in der `multi_cell` sie ausgeben würde.
+    """
+    if breite == 0:
+        breite = pdf.w - pdf.r_margin - pdf.x
+    if not _schnellpfad_moeglich(pdf) or not _SONDERZEICHEN.isdisjoint(text):
+        return _umbrechen_mit_fpdf(pdf, text, breite)
+
+    schluessel = _tabellen_schluessel(pdf)
+    # Abzug der Zellränder in derselben Reihenfolge wie in fpdf
+    max_breite = breite - pdf.c_margin - pdf.c_margin
+    memo_schluessel = (schluessel, max_breite, text)
+    with _lock:
+        zeilen = _umbruch_ergebnisse.get(memo_schluessel)
+        tabelle = _glyph_breiten.setdefault(schluessel, {})
+    if zeilen is not None:
+        return zeilen
+
+    # Umbrechen ohne Sperre; die Tabelle wird dabei nur gelesen.
+    neue: Dict[str, float] = {}
+    zeilen = _umbrechen(pdf, tabelle, neue, max_breite, text)
+    with _lock:
+        tabelle.update(neue)
+        if len(_umbruch_ergebnisse) >= _MAX_CACHE_EINTRAEGE:
+            # Ältesten Eintrag verwerfen (Dictionaries behalten die Einfügereihenfolge)
+            del _umbruch_ergebnisse[next(iter(_umbruch_ergebnisse))]
+        _umbruch_ergebnisse[memo_schluessel] = zeilen
+    return zeilen
+
+
+def _umbrechen(pdf: FPDF, tabelle: Dict[str, float], neue: Dict[str, float],
+               max_breite: float, text: str) -> Tuple[str, ...]:
+    """
+    Wortumbruch nach dem Vorbild von fpdf2 `MultiLineBreak.get_line`:
+    - Passt ein Leerzeichen nicht mehr in die Zeile, endet sie davor und es entfällt.
+    - Sonst wird am letzten Leerzeichen der Zeile umbrochen (das Leerzeichen entfällt).
+    - Enthält die Zeile kein Leerzeichen, wird vor dem aktuellen Zeichen umbrochen.
+    """
+    zeilen = []
+    start = 0
+    laenge = len(text)
+    while start < laenge:
+        zeilen_breite = 0.0
+        letztes_leerzeichen = -1
+        index = start
+        while index < laenge:
+            zeichen = text[index]
+            zeichen_breite = _zeichenbreite(pdf, tabelle, neue, zeichen)
+            if zeilen_breite + zeichen_breite > max_breite:
+                break
+            if zeichen == " ":
+                letztes_leerzeichen = index
+            zeilen_breite += zeichen_breite
+            index += 1
+        else:
+            zeilen.append(text[start:])
+            break
+
+        if text[index] == " ":
+            zeilen.append(text[start:index])
+            start = index + 1
+        elif letztes_leerzeichen >= 0:
+            zeilen.append(text[start:letztes_leerzeichen])
+            start = letztes_leerzeichen + 1
+        elif index > start:
+            zeilen.append(text[start:index])
+            start = index
+        else:
+            # Nicht einmal ein einzelnes Zeichen passt: fpdf entscheidet (und wirft ggf. den Fehler).
+            return _umbrechen_mit_fpdf(pdf, text, max_breite + pdf.c_margin + pdf.c_margin)
+    return tuple(zeilen)
+
+
+def _umbrechen_mit_fpdf(pdf: FPDF, text: str, breite: float) -> Tuple[str, ...]:
+    """Fallback: Lässt fpdf selbst umbrechen (Probelauf ohne Ausgabe)."""
+    zeilen = pdf.multi_cell(breite, text=text, align="L", dry_run=True, output=MethodReturnValue.LINES)
+    return tuple(zeilen)
+
+
+def leere_caches() -> None:
+    """Leert alle Zeichenbreiten-Tabellen und Umbruchergebnisse (z.B. für Tests und Benchmarks)."""
+    with _lock:
+        _glyph_breiten.clear()
+        _umbruch_ergebnisse.clear()
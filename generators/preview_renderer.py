@@ -0,0 +1,176 @@
+# generators/preview_renderer.py
+# -*- coding: utf-8 -*-
+"""
+Rendert das Layout-Modell eines Berichts mit Pillow als Vorschaubild.
+
+Maße, Schriftgrößen und Zeilenumbrüche entsprechen dem PDF-Generator, sodass die
+Vorschau zeigt, wie die PDF-Datei aussehen wird. Kopf, jeder Wochentag und die
+Fußzeile werden als eigene Abschnitte gerendert und zwischengespeichert; ändert sich
+nur ein Tag, wird auch nur dieser Abschnitt neu gezeichnet.
+"""
+import io
+import logging
+import os
+import threading
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from core import config
+from generators import bild_cache
+from generators.layout import STIL_TITEL, STIL_UEBERSCHRIFT, BerichtsLayout, Tagesblock, Textlauf
+from generators.pdf_layout import zeilen_umbrechen
+
+logger = logging.getLogger(__name__)
+
+# Seitengeometrie wie im PdfGenerator (A4, Standardränder von fpdf2), alles in mm
+SEITE_BREITE_MM = 210.0
+SEITE_HOEHE_MM = 297.0
+RAND_MM = 10.0
+ZELLENRAND_MM = RAND_MM / 10
+PT_IN_MM = 25.4 / 72
+
+# Stil -> (Schriftdatei, Schriftgröße in pt)
+_SCHRIFTEN = {
+    STIL_TITEL: ("verdanab.ttf", 20),
+    STIL_UEBERSCHRIFT: ("verdanab.ttf", 12),
+    None: ("verdana.ttf", 11),
+}
+_MAX_ABSCHNITTE = 64
+# Stil einer Bildzeile; der Text ist dann der Schlüssel im Bild-Cache
+_BILD = "bild"
+
+# Eine Zeile eines Abschnitts: (Stil, Text, Zeilenhöhe in mm)
+_Zeile = Tuple[Optional[str], str, float]
+
+
+class VorschauRenderer:
+    """Zeichnet Berichts-Layouts als Bild; ein Renderer wird über mehrere Aufrufe wiederverwendet."""
+
+    def __init__(self, px_pro_mm: float = 2.0):
+        """
+        Args:
+            px_pro_mm: Auflösung der Vorschau in Pixel pro Millimeter.
+        """
+        self.px_pro_mm = px_pro_mm
+        self._schriften: Dict[Optional[str], ImageFont.FreeTypeFont] = {}
+        self._messung = None  # FPDF-Objekt, nur zum Ausmessen der Zeilenumbrüche
+        self._abschnitte: Dict[Hashable, Image.Image] = {}
+        self._lock = threading.Lock()
+
+    def rendere(self, layout: BerichtsLayout) -> Image.Image:
+        """
+        Rendert ein Layout als durchgehende Seite (ohne Seitenumbrüche).
+
+        Args:
+            layout: Das Layout-Modell des Berichts.
+
+        Returns:
+            Das Vorschaubild im RGB-Modus.
+        """
+        with self._lock:
+            bilder = [self._abschnitt(("kopf", layout.titel, layout.info),
+                                      lambda: [self._einzeilig(layout.titel, 8), self._einzeilig(layout.info, 8)])]
+            for tag in layout.tage:
+                bilder.append(self._abschnitt(tag, lambda tag=tag: self._tageszeilen(tag)))
+            bilder.append(self._abschnitt(("fuss", layout.unterschriften), lambda: [
+                zeile for feld in layout.unterschriften
+                for zeile in (self._einzeilig(feld.rolle, 7), self._einzeilig(feld.zeile, 7))
+                + (((_BILD, feld.bild, bild_cache.UNTERSCHRIFT_HOEHE_MM),) if feld.bild else ())
+            ]))
+
+            rand = self._px(RAND_MM)
+            inhalt_hoehe = sum(bild.height for bild in bilder)
+            seite = Image.new("RGB", (self._px(SEITE_BREITE_MM), max(self._px(SEITE_HOEHE_MM), inhalt_hoehe + 2 * rand)), "white")
+            y = rand
+            for bild in bilder:
+                seite.paste(bild, (0, y))
+                y += bild.height
+            return seite
+
+    def leere_cache(self) -> None:
+        """Verwirft alle zwischengespeicherten Abschnitte."""
+        with self._lock:
+            self._abschnitte.clear()
+
+    def _abschnitt(self, schluessel: Hashable, zeilen_liefern) -> Image.Image:
+        """Gibt das Bild eines Abschnitts zurück und zeichnet es nur, wenn es noch nicht im Cache liegt."""
+        bild = self._abschnitte.pop(schluessel, None)
+        if bild is None:
+            bild = self._zeichne(zeilen_liefern())
+            if len(self._abschnitte) >= _MAX_ABSCHNITTE:
+                # Am längsten nicht verwendeten Abschnitt verwerfen
+                del self._abschnitte[next(iter(self._abschnitte))]
+        # Erneut einfügen, damit häufig genutzte Abschnitte hinten in der Reihenfolge bleiben
+        self._abschnitte[schluessel] = bild
+        return bild
+
+    @staticmethod
+    def _einzeilig(lauf: Textlauf, hoehe: float) -> _Zeile:
+        stil = lauf.stil if lauf.stil in _SCHRIFTEN else None
+        return stil, lauf.text, hoehe
+
+    def _tageszeilen(self, tag: Tagesblock) -> List[_Zeile]:
+        """Info-Zeile und umbrochene Aufzählungspunkte eines Tages, umbrochen wie im PDF."""
+        zeilen = [self._einzeilig(tag.ueberschrift, 7)]
+        pdf = self._messobjekt()
+        breite = pdf.w - pdf.r_margin - pdf.l_margin
+        for punkt in tag.punkte:
+            zeilen.extend((None, zeile, 6) for zeile in zeilen_umbrechen(pdf, f"• {punkt.text}", breite))
+        return zeilen
+
+    def _zeichne(self, zeilen: List[_Zeile]) -> Image.Image:
+        """Zeichnet Zeilen untereinander in ein Bild über die volle Seitenbreite."""
+        hoehe = sum(self._px(zeilen_hoehe) for _, _, zeilen_hoehe in zeilen)
+        bild = Image.new("RGB", (self._px(SEITE_BREITE_MM), max(hoehe, 1)), "white")
+        zeichnen = ImageDraw.Draw(bild)
+        x = (RAND_MM + ZELLENRAND_MM) * self.px_pro_mm
+        y = 0
+        for stil, text, zeilen_hoehe in zeilen:
+            if stil == _BILD:
+                self._zeichne_bild(bild, text, self._px(RAND_MM), y, self._px(zeilen_hoehe))
+                y += self._px(zeilen_hoehe)
+                continue
+            schriftgroesse_mm = _SCHRIFTEN[stil][1] * PT_IN_MM
+            # Grundlinie wie bei FPDF.cell: Zellmitte plus 0.3 * Schriftgröße
+            grundlinie = y + (0.5 * zeilen_hoehe + 0.3 * schriftgroesse_mm) * self.px_pro_mm
+            zeichnen.text((x, grundlinie), text, font=self._schrift(stil), fill="black", anchor="ls")
+            y += self._px(zeilen_hoehe)
+        return bild
+
+    @staticmethod
+    def _zeichne_bild(ziel: Image.Image, schluessel: str, x: int, y: int, hoehe: int) -> None:
+        """Fügt ein Bild aus dem Bild-Cache in der angegebenen Höhe ein (Transparenz bleibt erhalten)."""
+        vorbereitet = bild_cache.lade_bild(schluessel)
+        if vorbereitet is None:
+            return
+        with Image.open(io.BytesIO(vorbereitet.png)) as quelle:
+            skaliert = quelle.convert("RGBA").resize((max(round(vorbereitet.breite_bei_hoehe(hoehe)), 1), hoehe))
+        ziel.paste(skaliert, (x, y), skaliert)
+
+    def _schrift(self, stil: Optional[str]) -> ImageFont.FreeTypeFont:
+        """Lädt die Schrift eines Stils einmalig in der Pixelgröße der Vorschau."""
+        schrift = self._schriften.get(stil)
+        if schrift is None:
+            datei, groesse_pt = _SCHRIFTEN[stil]
+            groesse_px = groesse_pt * PT_IN_MM * self.px_pro_mm
+            try:
+                schrift = ImageFont.truetype(os.path.join(config.FONTS_FOLDER, datei), groesse_px)
+            except OSError:
+                logger.warning(f"Schriftart '{datei}' für die Vorschau nicht gefunden, verwende Standardschrift.")
+                schrift = ImageFont.load_default(groesse_px)
+            self._schriften[stil] = schrift
+        return schrift
+
+    def _messobjekt(self):
+        """Ein FPDF-Objekt mit den Schriften des PDF-Generators, nur für die Zeilenumbrüche."""
+        if self._messung is None:
+            from generators.pdf_generator import PdfGenerator
+            generator = PdfGenerator({})
+            generator._setup_document()
+            self._messung = generator.pdf
+        self._messung.set_font('Verdana', '', 11)
+        return self._messung
+
+    def _px(self, mm: float) -> int:
+        return round(mm * self.px_pro_mm)
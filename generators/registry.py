@@ -0,0 +1,70 @@
+# generators/registry.py
+# -*- coding: utf-8 -*-
+"""
+Registry der verfügbaren Ausgabeformate.
+
+Die Generator-Klassen werden erst beim ersten Zugriff importiert, damit schwere
+Abhängigkeiten wie python-docx, lxml oder fpdf nicht schon beim Programmstart geladen werden.
+"""
+import importlib
+import logging
+import threading
+from typing import Dict, List, Type, Union
+
+from generators.base_generator import BaseGenerator
+
+logger = logging.getLogger(__name__)
+
+# Format -> "modul:Klasse" (lazy) oder bereits geladene Klasse
+_FORMATE: Dict[str, Union[str, Type[BaseGenerator]]] = {
+    "docx": "generators.docx_generator:DocxGenerator",
+    "pdf": "generators.pdf_generator:PdfGenerator",
+    "html": "generators.html_generator:HtmlGenerator",
+}
+_lock = threading.Lock()
+
+
+def registriere_format(format: str, generator: Union[str, Type[BaseGenerator]]) -> None:
+    """
+    Registriert ein (zusätzliches) Ausgabeformat.
+
+    Args:
+        format: Der Formatschlüssel, gleichzeitig die Dateiendung (z.B. "odt").
+        generator: Die Generator-Klasse oder ein Importpfad im Format "modul:Klasse".
+    """
+    with _lock:
+        if format in _FORMATE:
+            logger.warning(f"Ausgabeformat '{format}' wird überschrieben.")
+        _FORMATE[format] = generator
+    logger.debug(f"Ausgabeformat '{format}' registriert.")
+
+
+def verfuegbare_formate() -> List[str]:
+    """Gibt alle registrierten Formate in Registrierungsreihenfolge zurück, ohne sie zu importieren."""
+    with _lock:
+        return list(_FORMATE)
+
+
+def lade_generator_klasse(format: str) -> Type[BaseGenerator]:
+    """
+    Gibt die Generator-Klasse für ein Format zurück und importiert sie beim ersten Zugriff.
+
+    Args:
+        format: Der Formatschlüssel (z.B. "docx").
+
+    Returns:
+        Die Generator-Klasse.
+
+    Raises:
+        ValueError: Wenn das Format nicht registriert ist.
+    """
+    with _lock:
+        eintrag = _FORMATE.get(format)
+        if eintrag is None:
+            raise ValueError(f"Unbekanntes Ausgabeformat: '{format}'")
+        if isinstance(eintrag, str):
+            modul_name, klassen_name = eintrag.split(":", 1)
+            logger.debug(f"Lade Generator-Modul '{modul_name}' für Format '{format}'.")
+            eintrag = getattr(importlib.import_module(modul_name), klassen_name)
+            _FORMATE[format] = eintrag
+        return eintrag
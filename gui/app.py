@@ -7,8 +7,8 @@ Dient als Controller, der die Ansichten verwaltet und die Hauptlogik bereitstell
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox
-from datetime import datetime, date, timedelta
-from typing import Dict, Any, Optional
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
 import logging
 import os
 import sys
@@ -76,6 +76,8 @@ class BerichtsheftApp(ctk.CTk):
         self.data_manager = DataManager(self.db)
         self.controller = AppController(self.data_manager)
         self.logic = BerichtsheftLogik()
+        # Ein einziger Durchlauf über den Ausgabeordner hält den Ausgabe-Index aktuell
+        self.controller.gleiche_ausgabe_index_ab()
         
         self.speaker = self._initialize_speaker()
         self.screen_reader_active = self.speaker is not None
@@ -90,6 +92,15 @@ class BerichtsheftApp(ctk.CTk):
         
         self.animation_manager = AnimationManager(self)
 
+        # Hintergrund-Erstellung von Berichten
+        self._generation_thread: Optional[threading.Thread] = None
+        self._generation_cancel_event: Optional[threading.Event] = None
+        # Übernahme alter JSON-Daten im Hintergrund
+        self._migration_thread: Optional[threading.Thread] = None
+        self._migration_cancel_event: Optional[threading.Event] = None
+        # Automatischer Import aus einem überwachten Ordner (optional)
+        self._ordner_ueberwachung: Optional[Any] = None
+
         self._setup_window()
         self._create_main_layout()
         self._create_and_register_views()
@@ -99,12 +110,24 @@ class BerichtsheftApp(ctk.CTk):
         
         self.after(500, self._welcome_message)
         self.after(1500, self._start_update_check)
+        if self.controller.json_migration_offen():
+            self.after(1000, self._start_json_migration)
+        self._starte_ordner_ueberwachung()
         
         logger.info("GUI erfolgreich initialisiert.")
 
     def on_close(self) -> None:
         """Sicherstellen, dass die DB-Verbindung beim Beenden geschlossen wird."""
         logger.info("Anwendung wird beendet.")
+        if self._is_generation_running():
+            self._generation_cancel_event.set()
+            self._generation_thread.join(timeout=5)
+        if self._ordner_ueberwachung is not None:
+            self._ordner_ueberwachung.stop()
+        if self._migration_thread is not None and self._migration_thread.is_alive():
+            # Der zuletzt gespeicherte Batch bleibt erhalten; beim nächsten Start geht es dort weiter.
+            self._migration_cancel_event.set()
+            self._migration_thread.join(timeout=5)
         self.db.close()
         self.destroy()
 
@@ -184,7 +207,13 @@ class BerichtsheftApp(ctk.CTk):
         self.status_bar_frame.grid(row=1, column=0, columnspan=2, sticky="sew")
         self.status_bar = ctk.CTkLabel(self.status_bar_frame, text="", anchor="w", font=config.FONT_NORMAL)
         self.status_bar.pack(side="left", padx=10, pady=2)
-        self.progress_bar = ctk.CTkProgressBar(self.status_bar_frame, indeterminate_speed=1.2)
+        self.progress_bar = ctk.CTkProgressBar(self.status_bar_frame, mode="determinate")
+        self.cancel_generation_button = AccessibleCTkButton(
+            self.status_bar_frame, text="Abbrechen (Esc)", command=self.abbrechen_berichtserstellung,
+            width=120, height=24, font=config.FONT_NORMAL,
+            fg_color=config.ERROR_COLOR, hover_color=config.ERROR_HOVER_COLOR,
+            accessible_text="Bricht die laufende Berichtserstellung ab.",
+            status_callback=self.update_status, speak_callback=self.speak)
         
         self.sidebar_frame = ctk.CTkFrame(self, width=250, corner_radius=0, fg_color=config.SIDEBAR_BG_COLOR)
         self.sidebar_frame.grid(row=0, column=0, sticky="nsw")
@@ -341,23 +370,46 @@ class BerichtsheftApp(ctk.CTk):
         if "statistics" in self.views and self.views["statistics"].winfo_viewable():
             self.views["statistics"].on_show()
 
+    @staticmethod
+    def _oeffne_mit_system(pfad: str) -> None:
+        """Öffnet eine Datei oder einen Ordner mit der Standardanwendung des Betriebssystems."""
+        if sys.platform == "win32":
+            os.startfile(os.path.realpath(pfad))
+        elif sys.platform == "darwin":
+            subprocess.run(["open", pfad], check=True)
+        else:
+            subprocess.run(["xdg-open", pfad], check=True)
+
     def _open_output_folder(self) -> None:
         folder_path = config.OUTPUT_FOLDER
         try:
             os.makedirs(folder_path, exist_ok=True)
-            
-            if sys.platform == "win32":
-                os.startfile(os.path.realpath(folder_path))
-            elif sys.platform == "darwin":
-                subprocess.run(["open", folder_path], check=True)
-            else:
-                subprocess.run(["xdg-open", folder_path], check=True)
-
+            self._oeffne_mit_system(folder_path)
             self.update_status(f"Ordner '{folder_path}' geöffnet.")
         except (OSError, subprocess.SubprocessError, FileNotFoundError) as e:
             messagebox.showerror("Fehler", f"Der Ordner '{folder_path}' konnte nicht geöffnet werden:\n{e}")
             logger.error(f"Fehler beim Öffnen des Ausgabeordners: {e}", exc_info=True)
 
+    def oeffne_berichtsdatei(self, bericht_id: str, format: Optional[str] = None) -> bool:
+        """
+        Öffnet die zuletzt erzeugte Ausgabedatei eines Berichts über den Ausgabe-Index.
+
+        Returns:
+            True, wenn eine Datei gefunden und geöffnet wurde.
+        """
+        pfad = self.controller.finde_ausgabedatei(bericht_id, format)
+        if pfad is None:
+            self.update_status(f"Für Bericht '{bericht_id}' wurde keine Ausgabedatei gefunden.")
+            return False
+        try:
+            self._oeffne_mit_system(pfad)
+            self.update_status(f"Datei '{os.path.basename(pfad)}' geöffnet.")
+            return True
+        except (OSError, subprocess.SubprocessError) as e:
+            messagebox.showerror("Fehler", f"Die Datei '{pfad}' konnte nicht geöffnet werden:\n{e}")
+            logger.error(f"Fehler beim Öffnen der Ausgabedatei: {e}", exc_info=True)
+            return False
+
     def speichere_persoenliche_daten(self, name: str, startdatum: str):
         konfig = self.data_manager.lade_konfiguration()
         konfig["name_azubi"] = name
@@ -377,6 +429,8 @@ class BerichtsheftApp(ctk.CTk):
             messagebox.showinfo("Gespeichert", "Die Einstellungen wurden erfolgreich gespeichert.")
             if "berichtsheft" in self.views:
                  self.views["berichtsheft"].on_show()
+            if "ueberwachter_ordner" in neue_einstellungen:
+                self._starte_ordner_ueberwachung()
         else:
             self.update_status("Fehler beim Speichern der Einstellungen.")
             messagebox.showerror("Fehler", "Die Einstellungen konnten nicht gespeichert werden.")
@@ -402,25 +456,10 @@ class BerichtsheftApp(ctk.CTk):
                 messagebox.showerror("Eingabefehler", "Bitte eine gültige Zahl für 'Bericht Nr.', 'Jahr' und 'KW' eingeben.")
                 return None
             
-            context["startdatum_ausbildung_dt"] = datetime.strptime(startdatum_str, "%d.%m.%Y").date()
-            start_datum_kw = date.fromisocalendar(context["jahr"], context["kalenderwoche"], 1)
-            freitag_datum_kw = start_datum_kw + timedelta(days=4)
-            context["zeitraum_von"] = start_datum_kw.strftime("%d.%m.%Y")
-            context["zeitraum_bis"] = freitag_datum_kw.strftime("%d.%m.%Y")
-            
-            context["ausbildungsjahr"] = self.logic.berechne_ausbildungsjahr(
-                context["startdatum_ausbildung_dt"], start_datum_kw
-            )
-
-            tage_daten = []
-            for widgets in berichtsheft_view.tages_widgets:
-                typ = widgets["typ"].get()
-                taetigkeiten = widgets["taetigkeiten"].get("1.0", "end-1c").strip()
-                if typ in ["Urlaub", "Krank", "Feiertag"] and not taetigkeiten:
-                    taetigkeiten = "-"
-                tage_daten.append({"typ": typ, "stunden": widgets["stunden"].get(), "taetigkeiten": taetigkeiten})
-            context["tage_daten"] = tage_daten
-            context["erstellungsdatum_bericht"] = freitag_datum_kw.strftime("%d.%m.%Y")
+            startdatum_dt = datetime.strptime(startdatum_str, "%d.%m.%Y").date()
+            self.logic.vervollstaendige_kontext(context, startdatum_dt)
+
+            context["tage_daten"] = berichtsheft_view.sammle_tage_daten()
             return context
         except (ValueError, TypeError) as e:
             messagebox.showerror("Eingabefehler", str(e))
@@ -428,42 +467,83 @@ class BerichtsheftApp(ctk.CTk):
             return None
 
     def erstelle_bericht(self, event: Any = None) -> str:
-        if self.progress_bar.winfo_ismapped():
+        if self._is_generation_running():
             self.update_status("Berichtserstellung läuft bereits.")
             return "break"
 
+        context = self.sammle_daten_fuer_bericht()
+        if not context:
+            return "break"
+
         berichtsheft_view = self.get_berichtsheft_view_reference()
+        gewaehltes_format = berichtsheft_view.format_var.get()
         berichtsheft_view.create_report_button.configure(state="disabled")
+        self.progress_bar.set(0)
+        self.cancel_generation_button.pack(side="right", padx=10, pady=2)
         self.progress_bar.pack(side="right", padx=10, pady=2, fill="x", expand=True)
-        self.progress_bar.start()
-        
-        context = self.sammle_daten_fuer_bericht()
-        if context:
-            gewaehltes_format = berichtsheft_view.format_var.get()
-            self.update_status(f"Erstelle {gewaehltes_format.upper()}-Datei...")
-            self.after(100, lambda: self._run_generation(context, gewaehltes_format))
-        else:
-            self._generation_complete()
+        self.update_status(f"Erstelle {gewaehltes_format.upper()}-Datei...")
+        self.speak(f"Erstelle {gewaehltes_format.upper()}-Datei.")
+
+        # Die Dokumentenerstellung läuft in einem Worker-Thread, damit die GUI
+        # und die Sprachausgabe währenddessen reaktionsfähig bleiben.
+        self._generation_cancel_event = threading.Event()
+        self._generation_thread = threading.Thread(
+            target=self._run_generation,
+            args=(context, gewaehltes_format, self._generation_cancel_event),
+            daemon=True
+        )
+        self._generation_thread.start()
         return "break"
 
-    def _run_generation(self, context: Dict[str, Any], gewaehltes_format: str) -> None:
-        erfolg, nachricht = self.controller.create_report(context, gewaehltes_format)
+    def _is_generation_running(self) -> bool:
+        """Gibt zurück, ob gerade ein Bericht im Hintergrund erstellt wird."""
+        return self._generation_thread is not None and self._generation_thread.is_alive()
+
+    def abbrechen_berichtserstellung(self, event: Any = None) -> Optional[str]:
+        """Fordert den Abbruch der laufenden Berichtserstellung an."""
+        if not self._is_generation_running():
+            return None
+        self._generation_cancel_event.set()
+        self.cancel_generation_button.configure(state="disabled")
+        self.update_status("Berichtserstellung wird abgebrochen...")
+        self.speak("Berichtserstellung wird abgebrochen.")
+        return "break"
+
+    def _run_generation(self, context: Dict[str, Any], gewaehltes_format: str, cancel_event: threading.Event) -> None:
+        """Läuft im Worker-Thread. Alle GUI-Aktualisierungen werden per `after` an den Tk-Thread übergeben."""
+        def on_progress(schritt: str, anteil: float) -> None:
+            self.after(0, self._update_generation_progress, schritt, anteil)
+
+        erfolg, nachricht = self.controller.create_report(context, gewaehltes_format, on_progress, cancel_event)
+        self.after(0, self._on_generation_finished, erfolg, nachricht, cancel_event.is_set())
+
+    def _update_generation_progress(self, schritt: str, anteil: float) -> None:
+        self.progress_bar.set(anteil)
+        self.update_status(f"Erstelle Bericht: {schritt} ({int(anteil * 100)} %)")
+
+    def _on_generation_finished(self, erfolg: bool, nachricht: str, abgebrochen: bool) -> None:
+        self._generation_complete()
         if erfolg:
             self.update_status(nachricht)
+            self.speak(nachricht)
             self.get_berichtsheft_view_reference().on_show()
             self.clear_and_prepare_next_report()
+        elif abgebrochen:
+            self.update_status(nachricht)
+            self.speak(nachricht)
         else:
             messagebox.showerror("Fehler", nachricht)
-        self._generation_complete()
-        
+
     def _generation_complete(self) -> None:
-        self.progress_bar.stop()
+        self._generation_thread = None
+        self._generation_cancel_event = None
         self.progress_bar.pack_forget()
+        self.cancel_generation_button.pack_forget()
+        self.cancel_generation_button.configure(state="normal")
         berichtsheft_view = self.get_berichtsheft_view_reference()
         if berichtsheft_view:
             berichtsheft_view.create_report_button.configure(state="normal")
-            self.update_status("Bereit.")
-    
+
     def speichere_aktuellen_bericht(self, event: Any = None) -> str:
         context = self.sammle_daten_fuer_bericht()
         if context:
@@ -501,6 +581,7 @@ class BerichtsheftApp(ctk.CTk):
     def _setup_shortcuts(self) -> None:
         """Definiert globale Tastenkürzel."""
         self.bind("<Control-g>", self.erstelle_bericht)
+        self.bind("<Escape>", self.abbrechen_berichtserstellung)
         self.bind("<Control-s>", self.speichere_aktuellen_bericht)
         self.bind("<Control-n>", self.clear_and_prepare_next_report)
         self.bind("<Control-l>", lambda event: self.show_view("load_report"))
@@ -560,6 +641,96 @@ class BerichtsheftApp(ctk.CTk):
             self.speak(f"Tab {view.tabview.get()} ausgewählt")
         return "break"
 
+    def _start_json_migration(self) -> None:
+        """Übernimmt vorhandene alte JSON-Daten in einem Worker-Thread."""
+        self.update_status("Übernehme Daten aus einer älteren Version...")
+        self._migration_cancel_event = threading.Event()
+        self._migration_thread = threading.Thread(
+            target=self._run_json_migration, args=(self._migration_cancel_event,), daemon=True)
+        self._migration_thread.start()
+
+    def _run_json_migration(self, cancel_event: threading.Event) -> None:
+        """Läuft im Worker-Thread."""
+        def on_progress(datei: str, anteil: float, anzahl: int) -> None:
+            self.after(0, self.update_status, f"Übernehme '{datei}': {int(anteil * 100)} % ({anzahl} Einträge)")
+
+        erfolg, nachricht = self.controller.migriere_json_daten(on_progress, cancel_event)
+        if not cancel_event.is_set():
+            self.after(0, self._on_json_migration_finished, erfolg, nachricht)
+
+    def _on_json_migration_finished(self, erfolg: bool, nachricht: str) -> None:
+        """Meldet das Ergebnis der Datenübernahme und lädt die Ansichten neu."""
+        self._migration_thread = None
+        self.update_status(nachricht)
+        if not erfolg:
+            messagebox.showwarning("Datenübernahme", nachricht)
+            return
+        # Die Berichtsheft-Ansicht nicht neu laden, um Eingaben seit dem Start nicht zu verwerfen
+        if self.current_view is not self.views.get("berichtsheft") and hasattr(self.current_view, "on_show"):
+            self.current_view.on_show()
+
+    def _starte_ordner_ueberwachung(self) -> None:
+        """Startet (bzw. beendet) die Überwachung des in den Einstellungen hinterlegten Ordners."""
+        if self._ordner_ueberwachung is not None:
+            self._ordner_ueberwachung.stop()
+            self._ordner_ueberwachung = None
+        ordner = self.data_manager.lade_konfiguration().get("einstellungen", {}).get("ueberwachter_ordner")
+        if not ordner:
+            return
+        if not os.path.isdir(ordner):
+            logger.warning(f"Überwachter Ordner '{ordner}' existiert nicht.")
+            self.update_status(f"Überwachter Ordner '{ordner}' wurde nicht gefunden.")
+            return
+        from services.ordner_ueberwachung import OrdnerUeberwachung
+        self._ordner_ueberwachung = OrdnerUeberwachung(ordner, self._importiere_ueberwachte_dateien)
+        self._ordner_ueberwachung.start()
+
+    def _importiere_ueberwachte_dateien(self, pfade: List[str]) -> None:
+        """Läuft im Überwachungs-Thread und importiert neue oder geänderte Dateien."""
+        anzahl, erfolg = self.controller.importiere_automatisch(pfade)
+        self.after(0, self._on_auto_import_finished, anzahl, erfolg)
+
+    def _on_auto_import_finished(self, anzahl: int, erfolg: bool) -> None:
+        """Meldet das Ergebnis des automatischen Imports in der Statusleiste."""
+        if not erfolg:
+            self.update_status("Automatischer Import aus dem überwachten Ordner fehlgeschlagen. Details im Log.")
+            return
+        if anzahl == 0:
+            return
+        nachricht = f"Überwachter Ordner: {anzahl} Bericht(e) automatisch importiert."
+        self.update_status(nachricht)
+        self.speak(nachricht, interrupt=False)
+        # Die Berichtsheft-Ansicht nicht neu laden, um laufende Eingaben nicht zu verwerfen
+        if self.current_view is not self.views.get("berichtsheft") and hasattr(self.current_view, "on_show"):
+            self.current_view.on_show()
+
+    def bereite_wiederherstellung_vor(self) -> Optional[str]:
+        """
+        Bereitet eine Wiederherstellung vor, die Datenbank und Datenordner austauscht, und
+        beendet dazu die Ordnerüberwachung. Greift noch ein anderer Hintergrund-Thread auf die
+        Daten zu, wird nichts geändert und eine Meldung für den Benutzer zurückgegeben.
+        """
+        threads = {
+            "Berichtserstellung": self._generation_thread,
+            "Datenübernahme aus einer älteren Version": self._migration_thread,
+            "Datenexport": getattr(self.views.get("backup"), "_export_thread", None),
+            "DOCX-Import": getattr(self.views.get("import"), "_import_thread", None),
+            "Vorschau": getattr(self.views.get("berichtsheft"), "_vorschau_thread", None),
+        }
+        laufend = [name for name, thread in threads.items() if thread is not None and thread.is_alive()]
+        if not laufend and self._ordner_ueberwachung is not None and not self._ordner_ueberwachung.stop():
+            laufend.append("Automatischer Import")
+            self._starte_ordner_ueberwachung()
+        if laufend:
+            logger.info(f"Wiederherstellung abgelehnt, es läuft noch: {', '.join(laufend)}.")
+            return (f"Die Wiederherstellung ist erst möglich, wenn folgende Vorgänge beendet sind: "
+                    f"{', '.join(laufend)}. Bitte versuchen Sie es gleich noch einmal.")
+        return None
+
+    def beende_wiederherstellung(self) -> None:
+        """Startet die nach `bereite_wiederherstellung_vor` beendete Ordnerüberwachung wieder."""
+        self._starte_ordner_ueberwachung()
+
     def _start_update_check(self) -> None:
         update_thread = threading.Thread(target=self._run_update_check, daemon=True)
         update_thread.start()
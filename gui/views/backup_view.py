@@ -6,6 +6,10 @@ Definiert die Ansicht für Backup- und Wiederherstellungsoperationen.
 import customtkinter as ctk
 from tkinter import filedialog
 import logging
+import os
+import threading
+from datetime import datetime
+from typing import Optional, Tuple
 
 from ..widgets.custom_dialogs import CustomMessagebox
 from ..widgets.accessible_widgets import AccessibleCTkButton
@@ -21,6 +25,7 @@ class BackupView(ctk.CTkFrame):
         super().__init__(master)
         self.app = app_logic
         self.controller = app_logic.controller
+        self._export_thread: Optional[threading.Thread] = None
         
         self._create_widgets()
 
@@ -47,6 +52,24 @@ class BackupView(ctk.CTkFrame):
             speak_callback=self.app.speak
         ).pack(pady=15)
 
+        AccessibleCTkButton(
+            export_frame,
+            text="Alle Berichte als ZIP-Paket exportieren...",
+            command=self._export_reports_bundle,
+            accessible_text="Erstellt alle gespeicherten Berichte im Standardformat und speichert sie gemeinsam in einer ZIP-Datei.",
+            status_callback=self.app.update_status,
+            speak_callback=self.app.speak
+        ).pack(pady=(0, 15))
+
+        AccessibleCTkButton(
+            export_frame,
+            text="HTML-Archiv exportieren...",
+            command=self._export_html_archive,
+            accessible_text="Erstellt ein offline lesbares HTML-Archiv aller Berichte mit einer Übersicht pro Jahr. Bereits exportierte, unveränderte Berichte werden übersprungen.",
+            status_callback=self.app.update_status,
+            speak_callback=self.app.speak
+        ).pack(pady=(0, 15))
+
         # --- Import-Bereich ---
         import_frame = ctk.CTkFrame(self)
         import_frame.grid(row=1, column=0, padx=15, pady=(0, 15), sticky="nsew")
@@ -66,24 +89,96 @@ class BackupView(ctk.CTkFrame):
             speak_callback=self.app.speak
         ).pack(pady=15)
 
+        AccessibleCTkButton(
+            import_frame,
+            text="Teilweise wiederherstellen...",
+            command=self._partial_restore,
+            accessible_text="Zeigt den Inhalt einer Backup-Datei und stellt nur die Datenbank, nur die Dokumente oder die Berichte eines Jahres wieder her.",
+            status_callback=self.app.update_status,
+            speak_callback=self.app.speak
+        ).pack(pady=(0, 15))
+
     def _export_data(self) -> None:
-        """Öffnet einen Dialog zum Speichern der ZIP-Datei und startet den Export."""
+        """Öffnet einen Dialog zum Speichern der ZIP-Datei und startet den Export im Hintergrund."""
+        if self._export_thread is not None and self._export_thread.is_alive():
+            self.app.update_status("Der Datenexport läuft bereits.")
+            return
+        vollstaendig = True
+        letztes_backup = self.controller.letztes_backup_pfad()
+        if letztes_backup:
+            choice = CustomMessagebox(
+                title="Backup-Art",
+                message=f"Das letzte Backup ist '{os.path.basename(letztes_backup)}'.\n"
+                        f"Sollen nur die Änderungen seitdem gesichert werden? Zum Wiederherstellen "
+                        f"werden dann beide Archive benötigt.",
+                buttons=["Nur Änderungen", "Vollständig", "Abbrechen"]
+            ).get_choice()
+            if choice not in ("Nur Änderungen", "Vollständig"):
+                return
+            vollstaendig = choice == "Vollständig"
+
         zip_path = filedialog.asksaveasfilename(
             title="Backup-Datei speichern",
             defaultextension=".zip",
             filetypes=[("ZIP-Archive", "*.zip")],
-            initialfile="berichtsheft_backup.zip"
+            initialfile=f"berichtsheft_backup_{datetime.now():%Y-%m-%d}.zip"
         )
         if not zip_path:
             return
 
-        success, message = self.controller.export_all_data(zip_path)
+        self.app.update_status("Exportiere alle Daten...")
+        self._export_thread = threading.Thread(target=self._run_export, args=(zip_path, vollstaendig), daemon=True)
+        self._export_thread.start()
+
+    def _run_export(self, zip_path: str, vollstaendig: bool) -> None:
+        """Läuft im Hintergrund-Thread; Meldungen werden über after() an die GUI übergeben."""
+        success, message = self.controller.export_all_data(
+            zip_path, lambda nachricht: self.after(0, self.app.update_status, nachricht), vollstaendig)
+        self.after(0, self._on_export_finished, success, message)
 
+    def _on_export_finished(self, success: bool, message: str) -> None:
+        """Zeigt das Ergebnis des Exports an."""
+        self.app.update_status(message)
         # Verwende den benutzerdefinierten Dialog für die Erfolgs-/Fehlermeldung
         dialog_title = "Export erfolgreich" if success else "Exportfehler"
         CustomMessagebox(title=dialog_title, message=message).get_choice()
 
-    
+
+    def _export_reports_bundle(self) -> None:
+        """Exportiert alle Berichte im Standardformat direkt in ein ZIP-Archiv."""
+        einstellungen = self.app.data_manager.lade_konfiguration().get("einstellungen", {})
+        format = einstellungen.get("default_format", "docx")
+        zip_path = filedialog.asksaveasfilename(
+            title="Berichte als ZIP-Paket speichern",
+            defaultextension=".zip",
+            filetypes=[("ZIP-Archive", "*.zip")],
+            initialfile=f"berichtshefte_{format}.zip"
+        )
+        if not zip_path:
+            return
+
+        self.app.update_status("Exportiere alle Berichte...")
+        success, message = self.controller.exportiere_berichte_als_zip(zip_path, format)
+        self.app.update_status(message)
+        dialog_title = "Export erfolgreich" if success else "Exportfehler"
+        CustomMessagebox(title=dialog_title, message=message).get_choice()
+
+    def _export_html_archive(self) -> None:
+        """Exportiert alle Berichte als HTML-Archiv; vorgeschlagen wird der Ordner des letzten Exports."""
+        einstellungen = self.app.data_manager.lade_konfiguration().get("einstellungen", {})
+        zielordner = filedialog.askdirectory(
+            title="Ordner für das HTML-Archiv wählen",
+            initialdir=einstellungen.get("html_archiv_ordner") or None
+        )
+        if not zielordner:
+            return
+
+        self.app.update_status("Exportiere HTML-Archiv...")
+        success, message = self.controller.exportiere_html_archiv(zielordner)
+        self.app.update_status(message)
+        dialog_title = "Export erfolgreich" if success else "Exportfehler"
+        CustomMessagebox(title=dialog_title, message=message).get_choice()
+
     def _show_import_warning(self):
         """Zeigt eine Warnung vor dem Import an."""
         dialog = CustomMessagebox(
@@ -95,6 +190,58 @@ class BackupView(ctk.CTkFrame):
         if choice == "Ja, importieren":
             self._import_data()
 
+    def _partial_restore(self) -> None:
+        """Zeigt den Inhalt eines Backups und stellt den gewählten Teil wieder her."""
+        from services.backup_service import UMFANG_DATENBANK, UMFANG_DOKUMENTE
+
+        zip_path = filedialog.askopenfilename(
+            title="Backup-Datei öffnen",
+            filetypes=[("ZIP-Archive", "*.zip")]
+        )
+        if not zip_path:
+            return
+
+        inhalt, fehler = self.controller.lies_backup_inhalt(zip_path)
+        if fehler:
+            CustomMessagebox(title="Importfehler", message=fehler).get_choice()
+            return
+
+        jahre = inhalt["jahre"]
+        zeilen = [f"Backup vom {inhalt['erstellt_am'].replace('T', ' ')}" if inhalt["erstellt_am"] else "Älteres Backup ohne Inhaltsverzeichnis"]
+        if inhalt["basis"]:
+            zeilen.append(f"Baut auf '{inhalt['basis']}' auf.")
+        zeilen.append("Berichte: " + (", ".join(f"{jahr}: {anzahl}" for jahr, anzahl in jahre.items()) or "keine"))
+        zeilen.append(f"Dokumente: {inhalt['dokumente']}")
+        zeilen.append("\n'Nur Datenbank' und 'Nur Dokumente' ersetzen die aktuellen Daten.\n"
+                      "'Berichte eines Jahres' überschreibt nur Berichte derselben Kalenderwochen.")
+        optionen = (["Nur Datenbank"] if inhalt["datenbank"] else []) \
+            + (["Nur Dokumente"] if inhalt["dokumente"] else []) \
+            + (["Berichte eines Jahres"] if jahre else []) + ["Abbrechen"]
+        choice = CustomMessagebox(title="Teilweise wiederherstellen", message="\n".join(zeilen),
+                                  buttons=optionen).get_choice()
+
+        if choice == "Nur Datenbank":
+            success, message = self._stelle_wieder_her(zip_path, UMFANG_DATENBANK)
+        elif choice == "Nur Dokumente":
+            success, message = self._stelle_wieder_her(zip_path, UMFANG_DOKUMENTE)
+        elif choice == "Berichte eines Jahres":
+            jahr_choice = CustomMessagebox(
+                title="Jahr wählen",
+                message="Aus welchem Jahr sollen die Berichte übernommen werden?",
+                buttons=[str(jahr) for jahr in jahre] + ["Abbrechen"]
+            ).get_choice()
+            if not jahr_choice or not jahr_choice.isdigit():
+                return
+            success, message = self.controller.importiere_jahre_aus_backup(zip_path, [int(jahr_choice)])
+        else:
+            return
+
+        self.app.update_status(message)
+        dialog_title = "Import erfolgreich" if success else "Importfehler"
+        CustomMessagebox(title=dialog_title, message=message).get_choice()
+        if success and choice != "Nur Dokumente":
+            self.app.reload_all_data()
+
     def _import_data(self) -> None:
         """Öffnet einen Dialog zum Auswählen der ZIP-Datei und startet den Import."""
         zip_path = filedialog.askopenfilename(
@@ -104,8 +251,8 @@ class BackupView(ctk.CTkFrame):
         if not zip_path:
             return
 
-        success, message = self.controller.import_all_data(zip_path)
-        
+        success, message = self._stelle_wieder_her(zip_path)
+
         dialog_title = "Import erfolgreich" if success else "Importfehler"
         final_message = f"{message}\n\nDie Daten wurden aktualisiert." if success else message
         CustomMessagebox(title=dialog_title, message=final_message).get_choice()
@@ -113,3 +260,15 @@ class BackupView(ctk.CTkFrame):
         if success:
             self.app.reload_all_data()
 
+    def _stelle_wieder_her(self, zip_path: str, umfang: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Stellt ein Backup wieder her. Dabei wird die Datenbankverbindung geschlossen; daher läuft
+        die Wiederherstellung nur, wenn kein anderer Hintergrund-Thread auf die Daten zugreift.
+        """
+        hinweis = self.app.bereite_wiederherstellung_vor()
+        if hinweis:
+            return False, hinweis
+        try:
+            return self.controller.import_all_data(zip_path, umfang)
+        finally:
+            self.app.beende_wiederherstellung()
@@ -5,17 +5,31 @@ Definiert die Hauptansicht zum Erstellen und Bearbeiten von Berichten.
 """
 import customtkinter as ctk
 import tkinter as tk
-from typing import Dict, Any, List, Optional
-from datetime import date, timedelta
+import logging
+import threading
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
+from datetime import date, datetime, timedelta
 from core import config
+from generators import registry
 from gui.widgets.accessible_widgets import (
     AccessibleCTkEntry, 
     AccessibleCTkButton, 
     AccessibleCTkComboBox, 
     AccessibleCTkRadioButton,
+    AccessibleCTkSwitch,
     AccessibleCTkTextbox
 )
 
+# Pillow und fpdf werden erst geladen, wenn die Vorschau eingeschaltet wird.
+if TYPE_CHECKING:
+    from PIL import Image
+    from generators.preview_renderer import VorschauRenderer
+
+logger = logging.getLogger(__name__)
+
+# Wartezeit nach der letzten Eingabe, bevor die Vorschau neu gerendert wird
+VORSCHAU_VERZOEGERUNG_MS = 300
+
 try:
     from tkcalendar import DateEntry
 except ImportError:
@@ -40,8 +54,18 @@ class BerichtsheftView(ctk.CTkFrame):
         self.jahr_var = tk.StringVar()
         self.kw_var = tk.StringVar()
         self.format_var = tk.StringVar()
+        self.vorschau_var = tk.BooleanVar(value=False)
         
         self.default_border_color: Optional[str] = None
+
+        # Live-Vorschau: Rendern im Hintergrund, immer nur ein Auftrag gleichzeitig
+        self.vorschau_frame: Optional[ctk.CTkScrollableFrame] = None
+        self.vorschau_label: Optional[ctk.CTkLabel] = None
+        self._vorschau_bild: Optional[ctk.CTkImage] = None
+        self._vorschau_renderer: Optional["VorschauRenderer"] = None
+        self._vorschau_after_id: Optional[str] = None
+        self._vorschau_thread: Optional[threading.Thread] = None
+        self._vorschau_ausstehend: Optional[Dict[str, Any]] = None
         
         self._create_widgets()
         self.on_show() # Initiales Laden und Anzeigen der Daten
@@ -59,8 +83,13 @@ class BerichtsheftView(ctk.CTkFrame):
         self._create_wochendaten_widgets(header_data_frame)
         
         self._create_daily_entry_tabs()
+        self._create_preview_pane()
         self._create_action_buttons()
 
+        # Jede Änderung an Kopf- oder Wochendaten aktualisiert die Vorschau (verzögert)
+        for var in (self.name_var, self.nummer_var, self.jahr_var, self.kw_var, self.startdatum_var):
+            var.trace_add("write", self._plane_vorschau)
+
     def _create_kopfdaten_widgets(self, parent):
         self.kopf_frame = ctk.CTkFrame(parent, corner_radius=8)
         
@@ -177,8 +206,17 @@ class BerichtsheftView(ctk.CTkFrame):
                 speak_callback=self.app.speak
             )
             taetigkeiten_text.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
+            taetigkeiten_text.bind("<<Modified>>", lambda event, t=taetigkeiten_text: self._on_taetigkeiten_modified(t), add=True)
+            typ_var.trace_add("write", self._plane_vorschau)
+            stunden_var.trace_add("write", self._plane_vorschau)
             self.tages_widgets.append({"typ": typ_var, "stunden": stunden_var, "taetigkeiten": taetigkeiten_text})
 
+    def _create_preview_pane(self):
+        """Erstellt den (zunächst ausgeblendeten) Bereich für die Live-Vorschau."""
+        self.vorschau_frame = ctk.CTkScrollableFrame(self, width=440, corner_radius=8, label_text="Vorschau (PDF)")
+        self.vorschau_label = ctk.CTkLabel(self.vorschau_frame, text="Vorschau wird erstellt...", font=config.FONT_NORMAL)
+        self.vorschau_label.pack(padx=5, pady=5)
+
     def _create_action_buttons(self):
         action_frame = ctk.CTkFrame(self)
         action_frame.grid(row=2, column=0, columnspan=2, sticky="sew", padx=10, pady=10)
@@ -190,18 +228,19 @@ class BerichtsheftView(ctk.CTkFrame):
         format_frame = ctk.CTkFrame(action_frame, fg_color="transparent")
         format_frame.pack(side="left", padx=10, pady=5)
         ctk.CTkLabel(format_frame, text="Format:", font=config.FONT_NORMAL).pack(side="left")
-        AccessibleCTkRadioButton(format_frame, text="DOCX", variable=self.format_var, value="docx", font=config.FONT_NORMAL, 
-                                 fg_color=config.ACCENT_COLOR,
-                                 focus_color=config.FOCUS_COLOR,
-                                 accessible_text="Wählt DOCX als Ausgabeformat für den Bericht.",
-                                 status_callback=self.app.update_status,
-                                 speak_callback=self.app.speak).pack(side="left", padx=10)
-        AccessibleCTkRadioButton(format_frame, text="PDF", variable=self.format_var, value="pdf", font=config.FONT_NORMAL, 
-                                 fg_color=config.ACCENT_COLOR,
-                                 focus_color=config.FOCUS_COLOR,
-                                 accessible_text="Wählt PDF als Ausgabeformat für den Bericht.",
-                                 status_callback=self.app.update_status,
-                                 speak_callback=self.app.speak).pack(side="left", padx=10)
+        for format in registry.verfuegbare_formate():
+            AccessibleCTkRadioButton(format_frame, text=format.upper(), variable=self.format_var, value=format, font=config.FONT_NORMAL, 
+                                     fg_color=config.ACCENT_COLOR,
+                                     focus_color=config.FOCUS_COLOR,
+                                     accessible_text=f"Wählt {format.upper()} als Ausgabeformat für den Bericht.",
+                                     status_callback=self.app.update_status,
+                                     speak_callback=self.app.speak).pack(side="left", padx=10)
+
+        AccessibleCTkSwitch(format_frame, text="Vorschau", variable=self.vorschau_var, command=self._toggle_vorschau,
+                            font=config.FONT_NORMAL,
+                            accessible_text="Blendet eine Live-Vorschau des Berichts als Bild ein oder aus.",
+                            status_callback=self.app.update_status,
+                            speak_callback=self.app.speak).pack(side="left", padx=(20, 0))
         
         # NEUER BUTTON: "Neuer Bericht"
         new_report_button = AccessibleCTkButton(button_container, text="Neuer Bericht (Strg+N)", command=self.app.clear_and_prepare_next_report,
@@ -385,4 +424,89 @@ class BerichtsheftView(ctk.CTkFrame):
             prev_tab_name = config.DAYS_IN_WEEK[prev_index]
             self.tabview.set(prev_tab_name)
         except Exception:
-            self.tabview.set(config.DAYS_IN_WEEK[0])
\ No newline at end of file
+            self.tabview.set(config.DAYS_IN_WEEK[0])
+
+    def sammle_tage_daten(self) -> List[Dict[str, Any]]:
+        """Liest Typ, Stunden und Tätigkeiten aller Wochentage aus den Eingabefeldern."""
+        tage_daten = []
+        for widgets in self.tages_widgets:
+            typ = widgets["typ"].get()
+            taetigkeiten = widgets["taetigkeiten"].get("1.0", "end-1c").strip()
+            if typ in ["Urlaub", "Krank", "Feiertag"] and not taetigkeiten:
+                taetigkeiten = "-"
+            tage_daten.append({"typ": typ, "stunden": widgets["stunden"].get(), "taetigkeiten": taetigkeiten})
+        return tage_daten
+
+    def _toggle_vorschau(self):
+        """Blendet die Vorschau neben den Tages-Tabs ein oder aus."""
+        if self.vorschau_var.get():
+            self.tabview.grid_configure(columnspan=1)
+            self.vorschau_frame.grid(row=1, column=1, padx=(0, 10), pady=10, sticky="nsew")
+            self._plane_vorschau()
+        else:
+            self.vorschau_frame.grid_forget()
+            self.tabview.grid_configure(columnspan=2)
+
+    def _on_taetigkeiten_modified(self, textbox: AccessibleCTkTextbox):
+        """Setzt das Änderungs-Flag der Textbox zurück, damit jede weitere Eingabe erneut gemeldet wird."""
+        if not textbox.edit_modified():
+            return  # Das Zurücksetzen selbst löst ebenfalls <<Modified>> aus
+        textbox.edit_modified(False)
+        self._plane_vorschau()
+
+    def _plane_vorschau(self, *args: Any):
+        """Plant das Neurendern der Vorschau; schnelle Folgeeingaben verschieben es nur (Debounce)."""
+        if not self.vorschau_var.get():
+            return
+        if self._vorschau_after_id is not None:
+            self.after_cancel(self._vorschau_after_id)
+        self._vorschau_after_id = self.after(VORSCHAU_VERZOEGERUNG_MS, self._starte_vorschau)
+
+    def _sammle_vorschau_kontext(self) -> Dict[str, Any]:
+        """Baut den Render-Kontext aus den Eingabefeldern, ohne Validierungsdialoge anzuzeigen."""
+        kontext: Dict[str, Any] = {"name_azubi": self.name_var.get(), "fortlaufende_nr": self.nummer_var.get()}
+        try:
+            kontext["jahr"] = int(self.jahr_var.get())
+            kontext["kalenderwoche"] = int(self.kw_var.get())
+            startdatum = datetime.strptime(self.startdatum_var.get(), "%d.%m.%Y").date()
+            self.app.logic.vervollstaendige_kontext(kontext, startdatum)
+        except (ValueError, TypeError):
+            pass  # Unvollständige Kopfdaten: Zeitraum und Ausbildungsjahr bleiben in der Vorschau leer.
+        kontext["tage_daten"] = self.sammle_tage_daten()
+        return kontext
+
+    def _starte_vorschau(self):
+        """Übergibt den aktuellen Stand an den Hintergrund-Thread oder merkt ihn vor, falls dieser noch läuft."""
+        self._vorschau_after_id = None
+        kontext = self._sammle_vorschau_kontext()
+        if self._vorschau_thread is not None and self._vorschau_thread.is_alive():
+            self._vorschau_ausstehend = kontext
+            return
+        self._vorschau_thread = threading.Thread(target=self._rendere_vorschau, args=(kontext,), daemon=True)
+        self._vorschau_thread.start()
+
+    def _rendere_vorschau(self, kontext: Dict[str, Any]):
+        """Läuft im Hintergrund-Thread: rendert nur die geänderten Abschnitte neu."""
+        try:
+            from generators.layout import erstelle_layout
+            if self._vorschau_renderer is None:
+                from generators.preview_renderer import VorschauRenderer
+                self._vorschau_renderer = VorschauRenderer()
+            self.app.controller.ergaenze_unterschriften(kontext)
+            bild = self._vorschau_renderer.rendere(erstelle_layout(kontext))
+        except Exception:
+            logger.error("Fehler beim Rendern der Vorschau.", exc_info=True)
+            bild = None
+        self.after(0, self._zeige_vorschau, bild)
+
+    def _zeige_vorschau(self, bild: Optional["Image.Image"]):
+        """Läuft im GUI-Thread: zeigt das fertige Bild an und startet ggf. den vorgemerkten Auftrag."""
+        if bild is not None:
+            self._vorschau_bild = ctk.CTkImage(light_image=bild, dark_image=bild, size=bild.size)
+            self.vorschau_label.configure(image=self._vorschau_bild, text="")
+        else:
+            self.vorschau_label.configure(image=None, text="Vorschau konnte nicht erstellt werden.")
+        if self._vorschau_ausstehend is not None:
+            kontext, self._vorschau_ausstehend = self._vorschau_ausstehend, None
+            self._vorschau_thread = threading.Thread(target=self._rendere_vorschau, args=(kontext,), daemon=True)
+            self._vorschau_thread.start()
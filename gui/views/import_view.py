@@ -3,14 +3,19 @@
 """
 Definiert die Ansicht für den Import von bestehenden DOCX-Berichten.
 """
-from typing import Optional
+from typing import List, Optional, TYPE_CHECKING
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 import logging
 import os
+import threading
 from ..widgets.accessible_widgets import AccessibleCTkButton
+from ..widgets.custom_dialogs import CustomMessagebox
 from core import config
 
+if TYPE_CHECKING:
+    from services.importer_service import ImportPlan
+
 logger = logging.getLogger(__name__)
 
 class ImportView(ctk.CTkFrame):
@@ -24,6 +29,11 @@ class ImportView(ctk.CTkFrame):
         self.controller = app_logic.controller
         
         self.title_font = ctk.CTkFont(family=config.UI_FONT_FAMILY, size=16, weight="bold")
+        self._import_thread: Optional[threading.Thread] = None
+        self._import_cancel_event: Optional[threading.Event] = None
+        # Anzahl der zu importierenden Dateien; None, solange Ordner und Archive noch aufgezählt werden
+        self._anzahl_dateien: Optional[int] = 0
+        self._verarbeitet = 0
         
         self._create_widgets()
 
@@ -39,20 +49,65 @@ class ImportView(ctk.CTkFrame):
         ctk.CTkLabel(info_frame, text="Berichte aus Word-Dateien importieren", font=self.title_font).pack(pady=(10, 5))
         info_text = (
             "Diese Funktion versucht, die Daten aus bestehenden .docx-Berichtsheften zu extrahieren.\n"
-            "Wählen Sie eine oder mehrere Dateien aus. Die importierten Daten werden zur Statistik\n"
-            "und zur 'Bericht laden'-Ansicht hinzugefügt.\n\n"
+            "Wählen Sie einzelne Dateien, einen Ordner (inkl. Unterordnern) oder ein ZIP-Archiv aus.\n"
+            "Die importierten Daten werden zur Statistik und zur 'Bericht laden'-Ansicht hinzugefügt.\n\n"
             "Hinweis: Funktioniert am besten mit Berichten, die mit diesem Programm erstellt wurden."
         )
         ctk.CTkLabel(info_frame, text=info_text, justify="center").pack(pady=5, padx=10)
         
-        AccessibleCTkButton(
-            info_frame, 
+        button_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
+        button_frame.pack(pady=15)
+        self.select_button = AccessibleCTkButton(
+            button_frame, 
             text="Word-Berichte zum Import auswählen...", 
             command=self._select_and_import_files,
             accessible_text="Öffnet einen Dateidialog zur Auswahl von DOCX-Dateien für den Import.",
             status_callback=self.app.update_status,
             speak_callback=self.app.speak
-        ).pack(pady=15)
+        )
+        self.select_button.pack(side="left", padx=5)
+        self.folder_button = AccessibleCTkButton(
+            button_frame,
+            text="Ordner importieren...",
+            command=self._select_and_import_folder,
+            accessible_text="Importiert alle DOCX-Dateien eines Ordners einschließlich Unterordnern und ZIP-Archiven.",
+            status_callback=self.app.update_status,
+            speak_callback=self.app.speak
+        )
+        self.folder_button.pack(side="left", padx=5)
+        self.zip_button = AccessibleCTkButton(
+            button_frame,
+            text="ZIP-Archiv importieren...",
+            command=self._select_and_import_zip,
+            accessible_text="Importiert alle DOCX-Dateien aus einem ZIP-Archiv, ohne es zu entpacken.",
+            status_callback=self.app.update_status,
+            speak_callback=self.app.speak
+        )
+        self.zip_button.pack(side="left", padx=5)
+        self.cancel_button = AccessibleCTkButton(
+            button_frame,
+            text="Import abbrechen",
+            command=self._cancel_import,
+            fg_color="gray50",
+            hover_color="gray60",
+            state="disabled",
+            accessible_text="Bricht den laufenden Import ab. Es werden keine Berichte gespeichert; "
+                            "der Import kann später fortgesetzt werden.",
+            status_callback=self.app.update_status,
+            speak_callback=self.app.speak
+        )
+        self.cancel_button.pack(side="left", padx=5)
+        # Wird nur angezeigt, wenn ein unterbrochener Import im Journal steht
+        self.resume_button = AccessibleCTkButton(
+            button_frame,
+            text="Import fortsetzen",
+            command=self._resume_import,
+            accessible_text="Setzt den zuletzt unterbrochenen Import fort, ohne bereits analysierte Dateien erneut zu lesen.",
+            status_callback=self.app.update_status,
+            speak_callback=self.app.speak
+        )
+        self.progress_bar = ctk.CTkProgressBar(info_frame)
+        self.progress_bar.set(0)
 
         self.output_frame = ctk.CTkFrame(self)
         self.output_frame.grid(row=1, column=0, padx=15, pady=(0, 15), sticky="nsew")
@@ -62,6 +117,19 @@ class ImportView(ctk.CTkFrame):
         self.output_textbox = ctk.CTkTextbox(self.output_frame, state="disabled", wrap="word")
         self.output_textbox.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
 
+    def on_show(self) -> None:
+        """Bietet beim Anzeigen der Ansicht an, einen unterbrochenen Import fortzusetzen."""
+        self._aktualisiere_fortsetzen()
+
+    def _aktualisiere_fortsetzen(self) -> None:
+        """Zeigt den Fortsetzen-Knopf nur, wenn ein unterbrochener Import vorliegt."""
+        auftrag = None if self._import_laeuft(melden=False) else self.controller.offener_import_auftrag()
+        if auftrag is None:
+            self.resume_button.pack_forget()
+            return
+        self.resume_button.configure(text=f"Import fortsetzen ({auftrag['anzahl']} Dateien bereits verarbeitet)")
+        self.resume_button.pack(side="left", padx=5)
+
     def _log_to_view(self, message: str, color: Optional[str] = None):
         """Schreibt eine Nachricht in das Textfeld der Ansicht."""
         self.output_textbox.configure(state="normal")
@@ -74,43 +142,216 @@ class ImportView(ctk.CTkFrame):
         self.output_textbox.configure(state="disabled")
         self.update_idletasks()
 
+    def _import_laeuft(self, melden: bool = True) -> bool:
+        """Prüft, ob bereits ein Import läuft, und meldet das ggf. in der Statusleiste."""
+        if self._import_thread is not None and self._import_thread.is_alive():
+            if melden:
+                self.app.update_status("Es läuft bereits ein Import.")
+            return True
+        return False
+
+    def _resume_import(self) -> None:
+        """Setzt den unterbrochenen Import fort."""
+        if self._import_laeuft():
+            return
+        self._start_import(None, "Setze den unterbrochenen Import fort.", None)
+
     def _select_and_import_files(self) -> None:
-        """Öffnet einen Dateidialog und startet den Importprozess."""
+        """Öffnet einen Dateidialog und startet den Import der ausgewählten Dateien."""
+        if self._import_laeuft():
+            return
         file_paths = filedialog.askopenfilenames(
             title="Wählen Sie DOCX-Berichtshefte aus",
             filetypes=[("Word-Dokumente", "*.docx")]
         )
         if not file_paths:
             return
+        self._start_import(list(file_paths), f"{len(file_paths)} Datei(en) ausgewählt.", len(file_paths))
+
+    def _select_and_import_folder(self) -> None:
+        """Startet den Import aller DOCX-Dateien eines Ordnerbaums."""
+        if self._import_laeuft():
+            return
+        ordner = filedialog.askdirectory(title="Ordner mit DOCX-Berichtsheften auswählen", mustexist=True)
+        if not ordner:
+            return
+        self._start_import([ordner], f"Ordner '{ordner}' ausgewählt.", None)
 
+    def _select_and_import_zip(self) -> None:
+        """Startet den Import aller DOCX-Dateien aus einem ZIP-Archiv."""
+        if self._import_laeuft():
+            return
+        archiv = filedialog.askopenfilename(
+            title="ZIP-Archiv mit DOCX-Berichtsheften auswählen",
+            filetypes=[("ZIP-Archive", "*.zip")]
+        )
+        if not archiv:
+            return
+        self._start_import([archiv], f"Archiv '{os.path.basename(archiv)}' ausgewählt.", None)
+
+    def _start_import(self, quellen: Optional[List[str]], beschreibung: str, anzahl: Optional[int]) -> None:
+        """
+        Startet den Importprozess in einem Hintergrund-Thread.
+        Ordner und Archive werden erst dort aufgezählt; bis dahin ist die Anzahl unbekannt (None).
+        Ohne Quellen (None) wird der unterbrochene Import fortgesetzt.
+        """
         self.output_textbox.configure(state="normal")
         self.output_textbox.delete("1.0", "end")
         self.output_textbox.configure(state="disabled")
 
-        self._log_to_view(f"{len(file_paths)} Datei(en) ausgewählt. Starte Import...")
-        
-        erfolgreich, fehlerhaft, save_success, error_details = self.controller.import_docx_berichte(file_paths)
-        
+        self._anzahl_dateien = anzahl
+        self._verarbeitet = 0
+        self._log_to_view(f"{beschreibung} Starte Import...")
         self._log_to_view("\n--- Import-Details ---")
-        for file, error in error_details.items():
-            self._log_to_view(f"Datei: {os.path.basename(file)} - Fehler: {error}", color="orange")
+        for button in (self.select_button, self.folder_button, self.zip_button):
+            button.configure(state="disabled")
+        self.resume_button.pack_forget()
+        self.cancel_button.configure(state="normal")
+        if anzahl is None:
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.start()
+        else:
+            self.progress_bar.configure(mode="determinate")
+            self.progress_bar.set(0)
+        self.progress_bar.pack(fill="x", padx=15, pady=(0, 10))
+
+        # Die Analyse läuft im Hintergrund; Ergebnisse werden per `after` an den Tk-Thread übergeben.
+        self._import_cancel_event = threading.Event()
+        self._import_thread = threading.Thread(
+            target=self._run_import, args=(quellen, self._import_cancel_event), daemon=True)
+        self._import_thread.start()
+
+    def _cancel_import(self) -> None:
+        """Fordert den Abbruch des laufenden Imports an."""
+        if self._import_cancel_event is not None:
+            self._import_cancel_event.set()
+            self.cancel_button.configure(state="disabled")
+            self.app.update_status("Import wird abgebrochen...")
+
+    def _run_import(self, file_paths: Optional[List[str]], cancel_event: threading.Event) -> None:
+        """Läuft im Worker-Thread: liest alle Dateien ein, ohne zu speichern (Probelauf)."""
+        def on_file(path: str, error: Optional[str], unveraendert: bool) -> None:
+            self.after(0, self._on_file_processed, path, error, unveraendert)
+
+        if file_paths is None:
+            plan = self.controller.setze_docx_import_fort(on_file, cancel_event)
+        else:
+            plan = self.controller.plane_docx_import(file_paths, on_file, cancel_event)
+        self.after(0, self._on_import_finished, plan, cancel_event.is_set())
+
+    def _on_file_processed(self, path: str, error: Optional[str], unveraendert: bool) -> None:
+        """Schreibt das Ergebnis einer einzelnen Datei in das Protokoll."""
+        self._verarbeitet += 1
+        if error:
+            self._log_to_view(f"Datei: {os.path.basename(path)} - Fehler: {error}", color="orange")
+        elif unveraendert:
+            self._log_to_view(f"Datei: {os.path.basename(path)} - unverändert, übersprungen")
+        else:
+            self._log_to_view(f"Datei: {os.path.basename(path)} - eingelesen")
+        if self._anzahl_dateien is None:
+            self.app.update_status(f"Import: {self._verarbeitet} Dateien analysiert.")
+        else:
+            self.progress_bar.set(self._verarbeitet / max(self._anzahl_dateien, 1))
+            self.app.update_status(f"Import: {self._verarbeitet} von {self._anzahl_dateien} Dateien analysiert.")
+
+    def _on_import_finished(self, plan: Optional["ImportPlan"], abgebrochen: bool) -> None:
+        """Zeigt den Abgleich mit der Datenbank an und startet nach Freigabe durch den Benutzer das Speichern."""
+        from services.importer_service import IMPORT_GEAENDERT, IMPORT_IDENTISCH, IMPORT_KONFLIKT, IMPORT_NEU
+        self._import_thread = None
+        self._import_cancel_event = None
+        for button in (self.select_button, self.folder_button, self.zip_button):
+            button.configure(state="normal")
+        self.cancel_button.configure(state="disabled")
+        self.progress_bar.stop()
+        self.progress_bar.pack_forget()
 
         self._log_to_view("\n--- Zusammenfassung ---")
-        self._log_to_view(f"Erfolgreich eingelesen: {erfolgreich}", color="lightgreen")
-        self._log_to_view(f"Fehlgeschlagen/Übersprungen: {fehlerhaft}", color="orange")
+        if plan is None:
+            self._log_to_view("Es gibt keinen unterbrochenen Import.", color="orange")
+            return
+        if abgebrochen:
+            self._log_to_view("Import abgebrochen. Es wurden keine Berichte gespeichert; "
+                              "bereits analysierte Dateien bleiben für die Fortsetzung erhalten.", color="orange")
+            self.app.update_status("Import abgebrochen.")
+            self._aktualisiere_fortsetzen()
+            return
+        self._log_to_view(f"Erfolgreich eingelesen: {plan.erfolgreich}", color="lightgreen")
+        self._log_to_view(f"Unverändert seit dem letzten Import: {plan.uebersprungen}")
+        self._log_to_view(f"Fehlgeschlagen/Übersprungen: {plan.fehlerhaft}", color="orange")
+
+        neu, geaendert, konflikte = (plan.nach_status(status) for status in (IMPORT_NEU, IMPORT_GEAENDERT, IMPORT_KONFLIKT))
+        self._log_to_view("\n--- Abgleich mit den gespeicherten Berichten ---")
+        self._log_to_view(f"Neu: {len(neu)}", color="lightgreen")
+        self._log_to_view(f"Identisch (werden nicht erneut gespeichert): {len(plan.nach_status(IMPORT_IDENTISCH))}")
+        if geaendert:
+            self._log_to_view(f"Geändert (überschreiben gespeicherte Berichte): {', '.join(geaendert)}", color="orange")
+        if konflikte:
+            self._log_to_view(f"Widersprüchlich (mehrere Fassungen im Import, die zuletzt gelesene gilt): "
+                              f"{', '.join(konflikte)}", color="orange")
 
-        if erfolgreich > 0 and save_success:
-            self._log_to_view("Datenbank erfolgreich aktualisiert.", color="lightgreen")
-            messagebox.showinfo("Import abgeschlossen", 
-                                f"{erfolgreich} Bericht(e) wurden erfolgreich importiert und gespeichert.\n"
+        zu_speichern = neu + geaendert + konflikte
+        freigegeben = self._frage_freigabe(neu, geaendert, konflikte) if zu_speichern else []
+        if freigegeben:
+            self.app.update_status(f"Speichere {len(freigegeben)} Berichte...")
+        # Das Speichern läuft ebenfalls im Hintergrund; die Quell-Buttons bleiben bis zum Ende gesperrt.
+        for button in (self.select_button, self.folder_button, self.zip_button):
+            button.configure(state="disabled")
+        self._import_thread = threading.Thread(
+            target=self._run_uebernahme, args=(plan, freigegeben, bool(zu_speichern)), daemon=True)
+        self._import_thread.start()
+
+    def _run_uebernahme(self, plan: "ImportPlan", freigegeben: List[str], hatte_berichte: bool) -> None:
+        """Läuft im Worker-Thread: speichert die freigegebenen Berichte des Plans."""
+        # Auch ohne Freigabe werden Fingerabdrücke fehlerhafter und identischer Dateien gespeichert.
+        save_success = self.controller.uebernehme_import_plan(plan, freigegeben)
+        self.after(0, self._on_uebernahme_finished, plan, freigegeben, hatte_berichte, save_success)
+
+    def _on_uebernahme_finished(self, plan: "ImportPlan", freigegeben: List[str],
+                                hatte_berichte: bool, save_success: bool) -> None:
+        """Meldet das Ergebnis des Speicherns und gibt die Ansicht wieder frei."""
+        self._import_thread = None
+        for button in (self.select_button, self.folder_button, self.zip_button):
+            button.configure(state="normal")
+        self._aktualisiere_fortsetzen()
+        self.app.update_status(f"Import abgeschlossen: {len(freigegeben)} gespeichert, {plan.uebersprungen} unverändert, "
+                               f"{plan.fehlerhaft} fehlgeschlagen.")
+
+        if freigegeben and save_success:
+            self._log_to_view(f"Datenbank erfolgreich aktualisiert ({len(freigegeben)} Berichte).", color="lightgreen")
+            messagebox.showinfo("Import abgeschlossen",
+                                f"{len(freigegeben)} Bericht(e) wurden erfolgreich importiert und gespeichert.\n"
                                 "Die Daten sind jetzt in der Statistik und unter 'Bericht laden' verfügbar.")
             self.app.reload_all_data()
-        elif erfolgreich > 0 and not save_success:
+        elif freigegeben and not save_success:
             self._log_to_view("FEHLER: Die eingelesenen Daten konnten nicht in der Datenbank gespeichert werden.", color="red")
             messagebox.showerror("Fehler beim Speichern",
                                  "Die Berichte wurden zwar eingelesen, konnten aber nicht in der Datenbank gespeichert werden. "
                                  "Bitte prüfen Sie die Log-Dateien.")
-        elif fehlerhaft > 0 and erfolgreich == 0:
+        elif hatte_berichte:
+            self._log_to_view("Import verworfen. Es wurden keine Berichte gespeichert.", color="orange")
+        elif plan.erfolgreich > 0 or (plan.uebersprungen > 0 and plan.fehlerhaft == 0):
+            messagebox.showinfo("Import abgeschlossen",
+                                "Alle ausgewählten Berichte entsprechen bereits den gespeicherten Daten.")
+        elif plan.fehlerhaft > 0:
             messagebox.showwarning("Import abgeschlossen",
                                    "Es konnten keine Berichte importiert werden. "
-                                   "Details finden Sie im Info-Fenster der Import-Ansicht.")
\ No newline at end of file
+                                   "Details finden Sie im Info-Fenster der Import-Ansicht.")
+        else:
+            messagebox.showinfo("Import abgeschlossen", "Es wurden keine DOCX-Dateien gefunden.")
+
+    def _frage_freigabe(self, neu: List[str], geaendert: List[str], konflikte: List[str]) -> List[str]:
+        """Fragt, welche eingelesenen Berichte gespeichert werden sollen, und gibt deren IDs zurück."""
+        alle, nur_neue = "Alle übernehmen", "Nur neue übernehmen"
+        buttons = [alle, nur_neue, "Verwerfen"] if neu and (geaendert or konflikte) else [alle, "Verwerfen"]
+        dialog = CustomMessagebox(
+            title="Import übernehmen?",
+            message=(f"{len(neu)} neue, {len(geaendert)} geänderte und {len(konflikte)} widersprüchliche Berichte "
+                     "wurden eingelesen.\n\nGeänderte Berichte überschreiben die gespeicherten Fassungen."),
+            buttons=buttons
+        )
+        choice = dialog.get_choice()
+        if choice == alle:
+            return neu + geaendert + konflikte
+        if choice == nur_neue:
+            return neu
+        return []
@@ -9,6 +9,7 @@ from tkinter import Menu
 from typing import Dict, Any, List
 from ..widgets.accessible_widgets import AccessibleCTkButton
 from core import config
+from core.controller import AUSGABE_FEHLT, AUSGABE_VERALTET
 from tkinter import messagebox
 
 logger = logging.getLogger(__name__)
@@ -22,6 +23,7 @@ class LoadReportView(ctk.CTkFrame):
         self.data_manager = app_logic.data_manager
 
         self.reports: Dict[str, Any] = {}
+        self.file_status: Dict[str, str] = {}
         self.report_frames: List[ctk.CTkFrame] = []
         self.current_focus_index = 0
 
@@ -30,10 +32,25 @@ class LoadReportView(ctk.CTkFrame):
     def on_show(self):
         """Called when the view becomes visible. Reloads the report list."""
         self.reports = self.data_manager.lade_berichte()
+        self.file_status = self._load_file_status()
         self._populate_report_list()
         if self.report_frames:
             self.after(100, lambda: self.report_frames[0].focus_set())
 
+    def _default_format(self) -> str:
+        """Returns the output format selected in the settings."""
+        settings = self.data_manager.lade_konfiguration().get("einstellungen", {})
+        return settings.get("default_format", "docx")
+
+    def _load_file_status(self) -> Dict[str, str]:
+        """Looks up the state of each report's output file in the default format via the output index."""
+        try:
+            return self.app.controller.ermittle_ausgabe_status(self._default_format())
+        except ValueError as e:
+            # No valid start date yet: the status cannot be determined, the list is still shown.
+            logger.info(f"Output file status not available: {e}")
+            return {}
+
     def _create_widgets(self):
         """Creates the UI elements of the view."""
         self.grid_columnconfigure(0, weight=1)
@@ -54,6 +71,15 @@ class LoadReportView(ctk.CTkFrame):
             speak_callback=self.app.speak
         ).pack(side="right", padx=10, pady=10)
 
+        AccessibleCTkButton(
+            action_frame,
+            text="Regenerate Outdated Files",
+            command=self._regenerate_outdated_files,
+            accessible_text="Recreates only the output files that are missing or outdated in the default format.",
+            status_callback=self.app.update_status,
+            speak_callback=self.app.speak
+        ).pack(side="right", padx=10, pady=10)
+
         self.scroll_frame = ctk.CTkScrollableFrame(self, label_text="Saved Reports")
         self.scroll_frame.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
         self.scroll_frame.grid_columnconfigure(0, weight=1)
@@ -88,6 +114,11 @@ class LoadReportView(ctk.CTkFrame):
                 name = report_data.get("name_azubi", "Unknown")
 
                 label_text = f"No. {nr} - CW {kw}/{jahr} ({name})"
+                status = self.file_status.get(key)
+                if status == AUSGABE_FEHLT:
+                    label_text += "  [file missing]"
+                elif status == AUSGABE_VERALTET:
+                    label_text += "  [file outdated]"
                 label = ctk.CTkLabel(frame, text=label_text, justify="left", font=ctk.CTkFont(size=14))
                 label.grid(row=0, column=0, padx=10, pady=10, sticky="w")
 
@@ -105,9 +136,14 @@ class LoadReportView(ctk.CTkFrame):
                 ctk.CTkLabel(frame, text=f"Corrupt entry: {key}", text_color="orange").grid(row=0, column=0, padx=10, pady=5, sticky="w")
 
     def _show_context_menu(self, event, report_id):
-        """Shows a context menu for loading or deleting a report."""
+        """Shows a context menu for loading, opening or deleting a report."""
         context_menu = Menu(self, tearoff=0)
         context_menu.add_command(label="Load", command=lambda: self._load_report(self.reports[report_id]))
+        context_menu.add_command(
+            label="Open File",
+            command=lambda: self.app.oeffne_berichtsdatei(report_id, self._default_format()),
+            state="disabled" if self.file_status.get(report_id, AUSGABE_FEHLT) == AUSGABE_FEHLT else "normal"
+        )
         context_menu.add_command(label="Delete", command=lambda: self._delete_report(report_id))
         context_menu.tk_popup(event.x_root, event.y_root)
 
@@ -163,4 +199,28 @@ class LoadReportView(ctk.CTkFrame):
                 messagebox.showinfo("Success", "All reports have been deleted.")
                 self.on_show()
             else:
-                messagebox.showerror("Error", "An error occurred while deleting the reports.")
\ No newline at end of file
+                messagebox.showerror("Error", "An error occurred while deleting the reports.")
+
+    def _regenerate_outdated_files(self):
+        """Recreates all output files whose content changed or which are missing."""
+        output_format = self._default_format()
+        self.app.update_status(f"Checking {output_format.upper()} files for changes...")
+        try:
+            result = self.app.controller.regeneriere_berichte(output_format)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        created, skipped, failed = result["erstellt"], result["uebersprungen"], result["fehler"]
+        message = f"{len(created)} file(s) recreated, {len(skipped)} already up to date."
+        if created:
+            message += "\n\nRecreated (stale): " + ", ".join(created)
+        if failed:
+            message += "\n\nFailed: " + ", ".join(failed)
+        self.app.update_status(message.split("\n")[0])
+        self.app.speak(message.split("\n")[0])
+        self.on_show()
+        if failed:
+            messagebox.showwarning("Regeneration finished with errors", message)
+        else:
+            messagebox.showinfo("Regeneration finished", message)
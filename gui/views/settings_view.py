@@ -3,11 +3,14 @@
 """
 Definiert die Ansicht für die Anwendungseinstellungen.
 """
+import os
 import customtkinter as ctk
 import tkinter as tk
+from tkinter import filedialog, messagebox
 from typing import Dict, Any
 
 from core import config
+from generators import registry
 from ..widgets.accessible_widgets import AccessibleCTkButton, AccessibleCTkEntry, AccessibleCTkRadioButton, AccessibleCTkComboBox
 
 class SettingsView(ctk.CTkFrame):
@@ -30,6 +33,11 @@ class SettingsView(ctk.CTkFrame):
         self.default_typen_vars: Dict[str, tk.StringVar] = {}
         self.default_format_var = tk.StringVar(value="docx")
         self.animation_type_var = tk.StringVar(value="slide") # NEU
+        self.unterschrift_status_vars: Dict[str, tk.StringVar] = {}
+        self.docx_vorlage_var = tk.StringVar()
+        self.docx_vorlage_anzeige_var = tk.StringVar()
+        self.ueberwachter_ordner_var = tk.StringVar()
+        self.ueberwachter_ordner_anzeige_var = tk.StringVar()
 
         self._create_widgets()
         self.on_show() # Lade die Daten beim Initialisieren
@@ -123,15 +131,72 @@ class SettingsView(ctk.CTkFrame):
         format_frame.grid_columnconfigure(0, weight=1)
         ctk.CTkLabel(format_frame, text="Standard-Exportformat", font=self.bold_font).grid(row=0, column=0, columnspan=2, padx=15, pady=(15, 5), sticky="w")
 
-        AccessibleCTkRadioButton(format_frame, text="DOCX", variable=self.default_format_var, value="docx", font=self.main_font,
-                                 fg_color=config.ACCENT_COLOR, focus_color=config.FOCUS_COLOR,
-                                 accessible_text="Setzt DOCX als Standard-Ausgabeformat.",
-                                 status_callback=self.app.update_status, speak_callback=self.app.speak).grid(row=1, column=0, padx=15, pady=8, sticky="w")
+        for i, format in enumerate(registry.verfuegbare_formate()):
+            AccessibleCTkRadioButton(format_frame, text=format.upper(), variable=self.default_format_var, value=format, font=self.main_font,
+                                     fg_color=config.ACCENT_COLOR, focus_color=config.FOCUS_COLOR,
+                                     accessible_text=f"Setzt {format.upper()} als Standard-Ausgabeformat.",
+                                     status_callback=self.app.update_status, speak_callback=self.app.speak).grid(row=i+1, column=0, padx=15, pady=8, sticky="w")
 
-        AccessibleCTkRadioButton(format_frame, text="PDF", variable=self.default_format_var, value="pdf", font=self.main_font,
-                                 fg_color=config.ACCENT_COLOR, focus_color=config.FOCUS_COLOR,
-                                 accessible_text="Setzt PDF als Standard-Ausgabeformat.",
-                                 status_callback=self.app.update_status, speak_callback=self.app.speak).grid(row=2, column=0, padx=15, pady=8, sticky="w")
+        # --- DOCX-Vorlage ---
+        vorlage_frame = ctk.CTkFrame(settings_container, corner_radius=8)
+        vorlage_frame.pack(fill="x", padx=0, pady=5)
+        vorlage_frame.grid_columnconfigure(0, weight=1)
+        ctk.CTkLabel(vorlage_frame, text="DOCX-Vorlage", font=self.bold_font).grid(row=0, column=0, columnspan=3, padx=15, pady=(15, 5), sticky="w")
+        ctk.CTkLabel(vorlage_frame, textvariable=self.docx_vorlage_anzeige_var, font=self.main_font, anchor="w").grid(row=1, column=0, padx=15, pady=8, sticky="ew")
+        AccessibleCTkButton(
+            vorlage_frame, text="Vorlage wählen...", command=self._waehle_docx_vorlage,
+            font=self.main_font, corner_radius=8, focus_color=config.FOCUS_COLOR,
+            accessible_text="Wählt eine eigene Word-Vorlage mit Platzhaltern für DOCX-Berichte aus.",
+            status_callback=self.app.update_status, speak_callback=self.app.speak
+        ).grid(row=1, column=1, padx=5, pady=8)
+        AccessibleCTkButton(
+            vorlage_frame, text="Standardlayout", command=lambda: self._setze_docx_vorlage(""),
+            font=self.main_font, corner_radius=8, fg_color="gray50", hover_color="gray60", focus_color=config.FOCUS_COLOR,
+            accessible_text="Verwendet wieder das eingebaute Layout für DOCX-Berichte.",
+            status_callback=self.app.update_status, speak_callback=self.app.speak
+        ).grid(row=1, column=2, padx=(5, 15), pady=8)
+
+        # --- Überwachter Ordner ---
+        ueberwachung_frame = ctk.CTkFrame(settings_container, corner_radius=8)
+        ueberwachung_frame.pack(fill="x", padx=0, pady=5)
+        ueberwachung_frame.grid_columnconfigure(0, weight=1)
+        ctk.CTkLabel(ueberwachung_frame, text="Automatischer Import", font=self.bold_font).grid(row=0, column=0, columnspan=3, padx=15, pady=(15, 5), sticky="w")
+        ctk.CTkLabel(ueberwachung_frame, textvariable=self.ueberwachter_ordner_anzeige_var, font=self.main_font, anchor="w").grid(row=1, column=0, padx=15, pady=8, sticky="ew")
+        AccessibleCTkButton(
+            ueberwachung_frame, text="Ordner wählen...", command=self._waehle_ueberwachten_ordner,
+            font=self.main_font, corner_radius=8, focus_color=config.FOCUS_COLOR,
+            accessible_text="Wählt einen Ordner, aus dem neue oder geänderte Word-Berichte automatisch importiert werden.",
+            status_callback=self.app.update_status, speak_callback=self.app.speak
+        ).grid(row=1, column=1, padx=5, pady=8)
+        AccessibleCTkButton(
+            ueberwachung_frame, text="Deaktivieren", command=lambda: self._setze_ueberwachten_ordner(""),
+            font=self.main_font, corner_radius=8, fg_color="gray50", hover_color="gray60", focus_color=config.FOCUS_COLOR,
+            accessible_text="Beendet den automatischen Import aus dem überwachten Ordner.",
+            status_callback=self.app.update_status, speak_callback=self.app.speak
+        ).grid(row=1, column=2, padx=(5, 15), pady=8)
+
+        # --- Unterschriftsbilder ---
+        unterschriften_frame = ctk.CTkFrame(settings_container, corner_radius=8)
+        unterschriften_frame.pack(fill="x", padx=0, pady=5)
+        unterschriften_frame.grid_columnconfigure(1, weight=1)
+        ctk.CTkLabel(unterschriften_frame, text="Unterschriften", font=self.bold_font).grid(row=0, column=0, columnspan=4, padx=15, pady=(15, 5), sticky="w")
+
+        for i, (rolle, bezeichnung) in enumerate(config.SIGNATURE_ROLES.items()):
+            self.unterschrift_status_vars[rolle] = tk.StringVar()
+            ctk.CTkLabel(unterschriften_frame, text=f"{bezeichnung}:", font=self.main_font).grid(row=i + 1, column=0, padx=(15, 5), pady=8, sticky="w")
+            ctk.CTkLabel(unterschriften_frame, textvariable=self.unterschrift_status_vars[rolle], font=self.main_font).grid(row=i + 1, column=1, padx=5, pady=8, sticky="w")
+            AccessibleCTkButton(
+                unterschriften_frame, text="Bild wählen...", command=lambda r=rolle: self._waehle_unterschrift(r),
+                font=self.main_font, corner_radius=8, focus_color=config.FOCUS_COLOR,
+                accessible_text=f"Wählt ein Bild der Unterschrift für '{bezeichnung}' aus.",
+                status_callback=self.app.update_status, speak_callback=self.app.speak
+            ).grid(row=i + 1, column=2, padx=5, pady=8)
+            AccessibleCTkButton(
+                unterschriften_frame, text="Entfernen", command=lambda r=rolle: self._entferne_unterschrift(r),
+                font=self.main_font, corner_radius=8, fg_color="gray50", hover_color="gray60", focus_color=config.FOCUS_COLOR,
+                accessible_text=f"Entfernt das Unterschriftsbild für '{bezeichnung}'.",
+                status_callback=self.app.update_status, speak_callback=self.app.speak
+            ).grid(row=i + 1, column=3, padx=(5, 15), pady=8)
 
         # --- Speicher-Button ---
         button_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -162,9 +227,74 @@ class SettingsView(ctk.CTkFrame):
         default_stunden = einstellungen.get("default_stunden", {})
         for tag, var in self.default_stunden_vars.items():
             var.set(default_stunden.get(tag, "08:00"))
+
+        self._setze_docx_vorlage(einstellungen.get("docx_vorlage", ""))
+        self._setze_ueberwachten_ordner(einstellungen.get("ueberwachter_ordner", ""))
+        self._aktualisiere_unterschrift_status()
         
         self.app.update_status("Einstellungen geladen.")
 
+    def _setze_docx_vorlage(self, pfad: str):
+        """Übernimmt den Pfad der DOCX-Vorlage (wird mit den Einstellungen gespeichert)."""
+        self.docx_vorlage_var.set(pfad)
+        self.docx_vorlage_anzeige_var.set(os.path.basename(pfad) if pfad else "Eingebautes Standardlayout")
+
+    def _waehle_docx_vorlage(self):
+        """Lässt eine DOCX-Vorlage auswählen und prüft sie sofort."""
+        pfad = filedialog.askopenfilename(
+            title="DOCX-Vorlage wählen",
+            filetypes=[("Word-Dokumente", "*.docx"), ("Alle Dateien", "*.*")]
+        )
+        if not pfad:
+            return
+        erfolg, nachricht = self.app.controller.pruefe_docx_vorlage(pfad)
+        self.app.update_status(nachricht)
+        self.app.speak(nachricht)
+        if not erfolg:
+            messagebox.showerror("Fehler", nachricht)
+            return
+        self._setze_docx_vorlage(pfad)
+
+    def _setze_ueberwachten_ordner(self, pfad: str):
+        """Übernimmt den überwachten Ordner (wird mit den Einstellungen gespeichert)."""
+        self.ueberwachter_ordner_var.set(pfad)
+        self.ueberwachter_ordner_anzeige_var.set(pfad if pfad else "Kein Ordner überwacht")
+
+    def _waehle_ueberwachten_ordner(self):
+        """Lässt den Ordner für den automatischen Import auswählen."""
+        pfad = filedialog.askdirectory(title="Ordner für den automatischen Import wählen", mustexist=True)
+        if pfad:
+            self._setze_ueberwachten_ordner(pfad)
+
+    def _aktualisiere_unterschrift_status(self):
+        """Zeigt für jede Rolle an, ob ein Unterschriftsbild hinterlegt ist."""
+        hinterlegt = self.data_manager.lade_unterschrift_schluessel()
+        for rolle, var in self.unterschrift_status_vars.items():
+            var.set("Bild hinterlegt" if rolle in hinterlegt else "Kein Bild")
+
+    def _waehle_unterschrift(self, rolle: str):
+        """Lässt ein Bild auswählen und speichert es als Unterschrift der Rolle."""
+        pfad = filedialog.askopenfilename(
+            title=f"Unterschrift für '{config.SIGNATURE_ROLES[rolle]}' wählen",
+            filetypes=[("Bilder", "*.png *.jpg *.jpeg *.bmp *.gif"), ("Alle Dateien", "*.*")]
+        )
+        if not pfad:
+            return
+        erfolg, nachricht = self.app.controller.speichere_unterschrift(rolle, pfad)
+        self.app.update_status(nachricht)
+        self.app.speak(nachricht)
+        if not erfolg:
+            messagebox.showerror("Fehler", nachricht)
+        self._aktualisiere_unterschrift_status()
+
+    def _entferne_unterschrift(self, rolle: str):
+        """Entfernt das Unterschriftsbild einer Rolle."""
+        if self.app.controller.entferne_unterschrift(rolle):
+            self.app.update_status(f"Unterschrift für '{config.SIGNATURE_ROLES[rolle]}' entfernt.")
+        else:
+            messagebox.showerror("Fehler", "Die Unterschrift konnte nicht entfernt werden.")
+        self._aktualisiere_unterschrift_status()
+
     def _save_settings(self):
         """Sammelt die Daten aus der UI und speichert sie in der Konfigurationsdatei."""
         self.app.speichere_persoenliche_daten(
@@ -176,6 +306,8 @@ class SettingsView(ctk.CTkFrame):
             "default_stunden": {tag: var.get() for tag, var in self.default_stunden_vars.items()},
             "default_typen": {tag: var.get() for tag, var in self.default_typen_vars.items()},
             "default_format": self.default_format_var.get(),
-            "animation_type": self.animation_type_var.get()
+            "animation_type": self.animation_type_var.get(),
+            "docx_vorlage": self.docx_vorlage_var.get(),
+            "ueberwachter_ordner": self.ueberwachter_ordner_var.get()
         }
         self.app.speichere_einstellungen(neue_einstellungen)
\ No newline at end of file
@@ -8,6 +8,7 @@ Diese Datei initialisiert das Logging und startet die grafische Benutzeroberflä
 import sys
 import os
 import logging
+import multiprocessing
 import tkinter as tk
 from tkinter import messagebox
 
@@ -48,4 +49,6 @@ def main() -> None:
     logging.info("Anwendung wurde normal beendet.")
 
 if __name__ == "__main__":
+    # Nötig für die Worker-Prozesse des Imports, wenn die Anwendung als EXE gebündelt ist.
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,15 @@
+-- migrations/002_ausgabe_manifest.sql
+-- Manifest der erzeugten Ausgabedateien für die inkrementelle Neuerstellung
+
+-- Pro Bericht und Format wird festgehalten, mit welchem Inhalt (Hash des
+-- Render-Kontexts) und welcher Generator-Version die Datei erzeugt wurde.
+-- Bewusst ohne Fremdschlüssel: "INSERT OR REPLACE" auf 'berichte' würde die
+-- Einträge sonst per ON DELETE CASCADE bei jedem Speichern entfernen.
+CREATE TABLE IF NOT EXISTS ausgabe_manifest (
+    bericht_id TEXT NOT NULL, -- z.B. "2024-39"
+    format TEXT NOT NULL, -- z.B. "docx", "pdf"
+    inhalt_hash TEXT NOT NULL, -- SHA-256 des Render-Kontexts
+    generator_version TEXT NOT NULL,
+    dateiname TEXT NOT NULL, -- relativ zum Ausgabeordner
+    PRIMARY KEY (bericht_id, format)
+);
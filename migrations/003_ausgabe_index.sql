@@ -0,0 +1,8 @@
+-- migrations/003_ausgabe_index.sql
+-- Erweitert das Ausgabe-Manifest zu einem Index der erzeugten Dateien
+
+-- Größe und Änderungszeit der Datei zum Zeitpunkt der Erstellung. Weichen die Werte
+-- im Ausgabeordner davon ab, wurde die Datei außerhalb der Anwendung verändert.
+ALTER TABLE ausgabe_manifest ADD COLUMN groesse INTEGER;
+ALTER TABLE ausgabe_manifest ADD COLUMN mtime REAL;
+ALTER TABLE ausgabe_manifest ADD COLUMN erstellt_am TEXT; -- ISO-Zeitstempel der Erstellung
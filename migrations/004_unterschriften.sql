@@ -0,0 +1,10 @@
+-- migrations/004_unterschriften.sql
+-- Unterschriftsbilder für die Fußzeile der Berichte
+
+-- Pro Rolle ("azubi", "ausbilder") ein Bild. Der Hash dient als Schlüssel für den
+-- Bild-Cache der Generatoren und fließt in den Inhalts-Hash der Berichte ein.
+CREATE TABLE IF NOT EXISTS unterschriften (
+    rolle TEXT PRIMARY KEY,
+    bild BLOB NOT NULL, -- Originaldatei (PNG, JPEG, ...)
+    sha256 TEXT NOT NULL
+);
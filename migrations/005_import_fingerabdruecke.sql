@@ -0,0 +1,17 @@
+-- migrations/005_import_fingerabdruecke.sql
+-- Fingerabdrücke bereits importierter DOCX-Dateien
+
+-- Unveränderte Dateien (gleiche Größe und Änderungszeit bzw. gleicher Inhalt) werden
+-- bei einem erneuten Import nicht noch einmal analysiert. Gespeichert wird das
+-- Ergebnis der letzten Analyse: der Bericht als JSON oder die Fehlermeldung.
+CREATE TABLE IF NOT EXISTS import_fingerabdruecke (
+    pfad TEXT PRIMARY KEY, -- absoluter, normalisierter Pfad
+    groesse INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    inhalt_hash TEXT NOT NULL, -- SHA-256 des Dateiinhalts
+    parser_version TEXT NOT NULL,
+    bericht_id TEXT, -- NULL, wenn die Analyse fehlgeschlagen ist
+    ergebnis TEXT, -- Analysierter Bericht als JSON
+    fehler TEXT,
+    importiert_am TEXT NOT NULL
+);
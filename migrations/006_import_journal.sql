@@ -0,0 +1,23 @@
+-- migrations/006_import_journal.sql
+-- Journal für große DOCX-Importe
+
+-- Ein Import-Auftrag merkt sich die ausgewählten Quellen (Dateien, Ordner, ZIP-Archive).
+-- Bricht der Import ab (Absturz, Schließen der Anwendung), kann er mit dem Journal
+-- fortgesetzt werden, ohne bereits analysierte Dateien erneut zu lesen.
+CREATE TABLE IF NOT EXISTS import_auftraege (
+    auftrag_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    quellen TEXT NOT NULL, -- JSON-Liste der ausgewählten Quellen
+    erstellt_am TEXT NOT NULL
+);
+
+-- Ergebnis jeder bereits verarbeiteten Datei eines Auftrags
+CREATE TABLE IF NOT EXISTS import_journal (
+    auftrag_id INTEGER NOT NULL,
+    pfad TEXT NOT NULL, -- Pfad wie bei der Aufzählung der Quellen
+    ergebnis TEXT, -- Analysierter Bericht als JSON
+    fehler TEXT,
+    fingerabdruck TEXT, -- Neuer Fingerabdruck als JSON (siehe import_fingerabdruecke)
+    unveraendert INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (auftrag_id, pfad),
+    FOREIGN KEY (auftrag_id) REFERENCES import_auftraege (auftrag_id) ON DELETE CASCADE
+);
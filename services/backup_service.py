@@ -4,17 +4,97 @@
 Dienst zur Kapselung der Logik für den Datenexport und -import.
 """
 
+import hashlib
+import json
 import os
+import uuid
 import zipfile
 import logging
 import shutil
-from typing import Tuple
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Generator, Iterable, Iterator, List, Optional, Tuple
 
 from core import config
 from core.data_manager import DataManager
+from services.zip_schreiber import ParallelerZipSchreiber
 
 logger = logging.getLogger(__name__)
 
+# Dateien, die SQLite neben der Datenbank anlegt; ihr Inhalt steckt bereits im Schnappschuss.
+_SQLITE_BEGLEITDATEIEN = ("-wal", "-shm", "-journal")
+
+# Inhaltsverzeichnis eines Backups im Archiv
+MANIFEST_NAME = "backup_manifest.json"
+MANIFEST_VERSION = 1
+# Konfigurationsschlüssel mit Pfad und Manifest des letzten Backups
+LETZTES_BACKUP_SCHLUESSEL = "letztes_backup"
+# Umfang einer Wiederherstellung und die betroffenen Ordner (erst zur Laufzeit aus config gelesen)
+UMFANG_ALLES = "alles"
+UMFANG_DATENBANK = "datenbank"
+UMFANG_DOKUMENTE = "dokumente"
+_ZIELORDNER: Dict[str, Callable[[], List[str]]] = {
+    UMFANG_ALLES: lambda: [config.DATA_FOLDER, config.OUTPUT_FOLDER],
+    UMFANG_DATENBANK: lambda: [config.DATA_FOLDER],
+    UMFANG_DOKUMENTE: lambda: [config.OUTPUT_FOLDER],
+}
+_ERFOLGSMELDUNGEN = {
+    UMFANG_ALLES: "Alle Daten und Berichte wurden erfolgreich importiert.",
+    UMFANG_DATENBANK: "Die Datenbank wurde erfolgreich wiederhergestellt.",
+    UMFANG_DOKUMENTE: "Die Dokumente wurden erfolgreich wiederhergestellt.",
+}
+# Puffergröße beim Entpacken
+_KOPIER_PUFFER = 1 << 20
+
+
+def _datei_hash(pfad: str) -> str:
+    """Berechnet den SHA-256 des Dateiinhalts."""
+    sha = hashlib.sha256()
+    with open(pfad, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _lade_berichte(verbindung: sqlite3.Connection, jahre: List[int]) -> Dict[str, Dict[str, Any]]:
+    """Lädt die Berichte der angegebenen Jahre mit ihren Tagen aus einer Backup-Datenbank."""
+    query = f"""
+        SELECT b.bericht_id, b.fortlaufende_nr, b.name_azubi, b.jahr, b.kalenderwoche,
+               t.typ, t.stunden, t.taetigkeiten
+        FROM berichte b LEFT JOIN tagebucheintraege t ON t.bericht_id = b.bericht_id
+        WHERE b.jahr IN ({", ".join("?" * len(jahre))})
+        ORDER BY b.bericht_id, t.eintrag_id
+    """
+    berichte: Dict[str, Dict[str, Any]] = {}
+    for bericht_id, nr, name, jahr, kw, typ, stunden, taetigkeiten in verbindung.execute(query, jahre):
+        bericht = berichte.setdefault(bericht_id, {
+            "fortlaufende_nr": nr, "name_azubi": name, "jahr": jahr, "kalenderwoche": kw, "tage_daten": []})
+        if typ is not None:
+            bericht["tage_daten"].append({"typ": typ, "stunden": stunden, "taetigkeiten": taetigkeiten})
+    return berichte
+
+
+def _lies_manifest(zip_path: str) -> Optional[Dict[str, Any]]:
+    """Liest das Manifest eines Backups (None bei Archiven ohne Manifest)."""
+    with zipfile.ZipFile(zip_path, 'r') as zipf:
+        try:
+            with zipf.open(MANIFEST_NAME) as f:
+                return json.load(f)
+        except KeyError:
+            return None
+
+
+def _enthaelt_staende(manifest: Dict[str, Any], staende: Dict[str, str]) -> bool:
+    """Prüft, ob ein Backup alle angegebenen Dateistände (Eintrag -> SHA-256) selbst enthält."""
+    dateien = manifest.get("dateien", {})
+    return bool(staende) and all(
+        name in dateien and dateien[name]["sha256"] == sha256 and dateien[name]["archiv"] == manifest["id"]
+        for name, sha256 in staende.items())
+
+
 class BackupService:
     """
     Stellt Methoden zum Sichern und Wiederherstellen von Anwendungsdaten bereit.
@@ -22,88 +102,490 @@ class BackupService:
     def __init__(self, data_manager: DataManager):
         self.data_manager = data_manager
 
-    def export_all_data_to_zip(self, zip_path: str) -> Tuple[bool, str]:
-        """Sammelt alle Datendateien UND erstellten Berichte und speichert sie in einem ZIP-Archiv."""
+    def export_all_data_to_zip(self, zip_path: str,
+                               fortschritt_callback: Optional[Callable[[str], None]] = None,
+                               vollstaendig: bool = False) -> Tuple[bool, str]:
+        """
+        Sichert die Datenbank, die übrigen Datendateien UND die erstellten Berichte in einem ZIP-Archiv.
+
+        Die Datenbank wird nicht als Datei kopiert, sondern über die Backup-API von SQLite
+        in einen temporären Schnappschuss gesichert, der dann ins Archiv geschrieben wird.
+        Die WAL- und SHM-Dateien der laufenden Verbindung werden nicht gesichert. Komprimiert
+        wird parallel; bereits komprimierte Formate wie DOCX werden nur gespeichert.
+
+        Jedes Archiv enthält ein Manifest aller gesicherten Dateien (Größe, Änderungszeit,
+        SHA-256). Gibt es ein vorheriges Backup, enthält das neue Archiv außer der Datenbank
+        nur die seitdem geänderten Dateien und verweist für alle übrigen auf sein Basis-Archiv.
+
+        Args:
+            zip_path: Der Pfad des zu erstellenden ZIP-Archivs.
+            fortschritt_callback: Optional, erhält Statusmeldungen zum Fortschritt.
+            vollstaendig: Alle Dateien sichern, auch wenn ein vorheriges Backup existiert.
+        """
+        def melde(nachricht: str) -> None:
+            if fortschritt_callback:
+                fortschritt_callback(nachricht)
+
+        def melde_datenbank(verbleibend: int, gesamt: int) -> None:
+            if gesamt:
+                melde(f"Sichere Datenbank... {100 * (gesamt - verbleibend) // gesamt} %")
+
         try:
-            folders_to_backup = [config.DATA_FOLDER, config.OUTPUT_FOLDER]
-            
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for folder in folders_to_backup:
-                    if not os.path.isdir(folder):
-                        logger.warning(f"Zu sichernder Ordner '{folder}' nicht gefunden. Überspringe.")
-                        continue
-                    for root, _, files in os.walk(folder):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            # Speichert die Dateien mit relativem Pfad zum Basisverzeichnis
-                            archive_name = os.path.relpath(file_path, start=config.BASE_DIR)
-                            zipf.write(file_path, arcname=archive_name)
-            
+            basis = None if vollstaendig else self._basis_backup(zip_path)
+            backup_id = uuid.uuid4().hex
+            dateien: Dict[str, Dict[str, Any]] = {}
+            geaendert = 0
+            # Erst in eine temporäre Datei schreiben: Ein abgebrochener Export darf ein vorhandenes
+            # Archiv (womöglich die Basis eines anderen Backups) nicht zerstören.
+            fd, temp_zip = tempfile.mkstemp(prefix=f".{os.path.basename(zip_path)}_", suffix=".tmp",
+                                            dir=os.path.dirname(os.path.abspath(zip_path)))
+            os.close(fd)
+            try:
+                with tempfile.TemporaryDirectory() as temp_ordner, \
+                        zipfile.ZipFile(temp_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                    melde("Sichere Datenbank...")
+                    schnappschuss = os.path.join(temp_ordner, os.path.basename(config.DATABASE_FILE))
+                    self.data_manager.db.sichere_nach(schnappschuss, fortschritt=melde_datenbank)
+                    datenbank_name = self._archivname(config.DATABASE_FILE)
+
+                    melde("Sichere Dateien und Berichte...")
+                    bekannte = basis["dateien"] if basis else {}
+                    with ParallelerZipSchreiber(zipf) as schreiber:
+                        schreiber.schreibe(schnappschuss, datenbank_name)
+                        for file_path in self._zu_sichernde_dateien():
+                            name = self._archivname(file_path)
+                            eintrag = self._manifest_eintrag(file_path, bekannte.get(name))
+                            if eintrag["archiv"] is None:
+                                eintrag["archiv"] = backup_id
+                                schreiber.schreibe(file_path, name)
+                                geaendert += 1
+                            dateien[name] = eintrag
+
+                    manifest = {
+                        "version": MANIFEST_VERSION,
+                        "id": backup_id,
+                        "erstellt_am": datetime.now().isoformat(timespec="seconds"),
+                        "datenbank": datenbank_name,
+                        "basis": {"id": basis["id"], "pfad": basis["pfad"]} if basis else None,
+                        "dateien": dateien,
+                    }
+                    zipf.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False))
+
+                os.replace(temp_zip, zip_path)
+            finally:
+                if os.path.exists(temp_zip):
+                    os.remove(temp_zip)
+
+            # Erst nach einem vollständigen Archiv als Basis für das nächste Backup merken
+            self.data_manager.speichere_konfiguration({LETZTES_BACKUP_SCHLUESSEL: {
+                "id": backup_id, "pfad": os.path.abspath(zip_path)}})
+            if basis:
+                logger.info(f"Inkrementelles Backup nach '{zip_path}' exportiert "
+                            f"({geaendert} von {len(dateien)} Dateien geändert).")
+                return True, (f"Alle Änderungen wurden gesichert ({geaendert} von {len(dateien)} Dateien). "
+                              f"Das Backup baut auf '{os.path.basename(basis['pfad'])}' auf; "
+                              f"bewahren Sie beide Archive auf.")
             logger.info(f"Alle Daten erfolgreich nach '{zip_path}' exportiert.")
             return True, "Alle Daten und Berichte wurden erfolgreich exportiert."
         except Exception as e:
             logger.error(f"Fehler beim Exportieren der Daten nach '{zip_path}'.", exc_info=True)
             return False, f"Fehler beim Exportieren der Daten: {e}"
 
-    def import_all_data_from_zip(self, zip_path: str) -> Tuple[bool, str]:
-        """Extrahiert alle Dateien aus einem ZIP-Archiv in die entsprechenden Ordner."""
+    def letztes_backup(self) -> Optional[Dict[str, Any]]:
+        """Gibt das letzte Backup zurück, auf das ein inkrementelles Backup aufbauen kann (oder None)."""
+        return self._basis_backup(None)
+
+    def _basis_backup(self, zip_path: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Lädt das Manifest des letzten Backups (mit seinem Pfad), wenn es als Basis taugt: Das
+        Archiv und seine Basis-Archive müssen noch unverändert existieren, und keines davon darf
+        vom neuen Archiv überschrieben werden.
+        """
+        letztes = self.data_manager.lade_konfiguration().get(LETZTES_BACKUP_SCHLUESSEL)
+        if not isinstance(letztes, dict) or not os.path.isfile(letztes.get("pfad", "")):
+            return None
+        try:
+            manifest = _lies_manifest(letztes["pfad"])
+            if not manifest or manifest.get("id") != letztes.get("id"):
+                return None
+            kette = self._lade_kette(letztes["pfad"])
+        except (OSError, zipfile.BadZipFile, ValueError, KeyError) as e:
+            logger.warning(f"Das letzte Backup '{letztes['pfad']}' taugt nicht als Basis: {e}")
+            return None
+        ziel = os.path.normcase(os.path.abspath(zip_path)) if zip_path else None
+        if ziel and any(os.path.normcase(os.path.abspath(pfad)) == ziel for pfad in kette.values()):
+            logger.info("Ein Archiv der Backup-Kette würde überschrieben, erstelle ein vollständiges Backup.")
+            return None
+        return dict(manifest, pfad=letztes["pfad"])
+
+    @staticmethod
+    def _manifest_eintrag(file_path: str, alt: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Erstellt den Manifest-Eintrag einer Datei. Ist sie unverändert gegenüber `alt`
+        (gleiche Größe und Änderungszeit oder gleicher Hash), bleibt ihr Archiv erhalten;
+        sonst ist "archiv" None und die Datei muss neu gesichert werden.
+        """
+        stat = os.stat(file_path)
+        eintrag = {"groesse": stat.st_size, "mtime": stat.st_mtime_ns, "sha256": None, "archiv": None}
+        if alt and alt["groesse"] == stat.st_size and alt["mtime"] == stat.st_mtime_ns:
+            eintrag.update(sha256=alt["sha256"], archiv=alt["archiv"])
+            return eintrag
+        eintrag["sha256"] = _datei_hash(file_path)
+        if alt and alt["groesse"] == stat.st_size and alt["sha256"] == eintrag["sha256"]:
+            eintrag["archiv"] = alt["archiv"]
+        return eintrag
+
+    @staticmethod
+    def _lade_kette(zip_path: str, praefixe: Tuple[str, ...] = ("",)) -> Optional[Dict[str, str]]:
+        """
+        Löst die Kette der Basis-Archive eines Backups auf. Wurde ein Basis-Archiv durch ein
+        neueres Backup gleichen Namens ersetzt, das alle benötigten Dateistände selbst enthält,
+        wird stattdessen dieses verwendet.
+
+        Args:
+            zip_path: Das Backup-Archiv.
+            praefixe: Nur Basis-Archive für Einträge mit diesen Pfadanfängen werden benötigt.
+
+        Returns:
+            Backup-ID -> Archivpfad für das Backup und alle benötigten Basis-Archive,
+            oder None für Archive ohne Manifest (ältere Backups).
+
+        Raises:
+            ValueError: Wenn ein benötigtes Basis-Archiv fehlt.
+        """
+        manifest = _lies_manifest(zip_path)
+        if manifest is None:
+            return None
+        # Backup-ID -> {Eintrag: SHA-256} der Dateistände, die aus diesem Archiv gelesen werden
+        benoetigt: Dict[str, Dict[str, str]] = {}
+        for name, eintrag in manifest["dateien"].items():
+            if name.startswith(praefixe):
+                benoetigt.setdefault(eintrag["archiv"], {})[name] = eintrag["sha256"]
+        kette = {manifest["id"]: zip_path}
+        basis = manifest["basis"]
+        while basis and not benoetigt.keys() <= kette.keys():
+            # Basis-Archive werden zuerst neben dem Archiv gesucht, dann am ursprünglichen Ort.
+            kandidaten = [os.path.join(os.path.dirname(os.path.abspath(zip_path)), os.path.basename(basis["pfad"])),
+                          basis["pfad"]]
+            gefunden = None
+            for kandidat in kandidaten:
+                if os.path.isfile(kandidat) and zipfile.is_zipfile(kandidat):
+                    basis_manifest = _lies_manifest(kandidat)
+                    if basis_manifest and basis_manifest["id"] == basis["id"]:
+                        gefunden = kandidat, basis_manifest["basis"]
+                        break
+                    if basis_manifest and _enthaelt_staende(basis_manifest, benoetigt.get(basis["id"], {})):
+                        # Unter dem Namen liegt ein neueres Backup, das dieselben Dateistände selbst enthält.
+                        gefunden = kandidat, None
+                        break
+            if gefunden is None:
+                raise ValueError(f"Das Basis-Backup '{os.path.basename(basis['pfad'])}' wurde nicht gefunden. "
+                                 f"Legen Sie es in denselben Ordner wie '{os.path.basename(zip_path)}'.")
+            kette[basis["id"]] = gefunden[0]
+            basis = gefunden[1]
+        fehlend = benoetigt.keys() - kette.keys()
+        if fehlend:
+            raise ValueError(f"Die Backup-Kette von '{os.path.basename(zip_path)}' ist unvollständig.")
+        return kette
+
+    @staticmethod
+    def _quellen(zip_path: str, kette: Optional[Dict[str, str]], praefixe: Tuple[str, ...]) -> Dict[str, List[str]]:
+        """
+        Gibt für jedes benötigte Archiv die daraus zu lesenden Einträge mit den angegebenen
+        Pfadanfängen zurück: die Datenbank des Backups und jede Datei aus dem Archiv, das
+        ihren Stand enthält.
+        """
+        if kette is None:
+            with zipfile.ZipFile(zip_path, 'r') as zipf:
+                return {zip_path: [name for name in zipf.namelist()
+                                   if name.startswith(praefixe) and not name.endswith("/")]}
+        manifest = _lies_manifest(zip_path)
+        quellen: Dict[str, List[str]] = {}
+        for name, eintrag in manifest["dateien"].items():
+            if name.startswith(praefixe):
+                quellen.setdefault(kette[eintrag["archiv"]], []).append(name)
+        if manifest["datenbank"].startswith(praefixe):
+            quellen.setdefault(zip_path, []).append(manifest["datenbank"])
+        return quellen
+
+    @staticmethod
+    def _archivname(file_path: str) -> str:
+        """Speichert die Dateien mit relativem Pfad zum Basisverzeichnis (wie im ZIP-Archiv mit "/")."""
+        return os.path.relpath(file_path, start=config.BASE_DIR).replace(os.sep, "/")
+
+    @staticmethod
+    def _zu_sichernde_dateien() -> Iterator[str]:
+        """Liefert alle Dateien der Daten- und Ausgabeordner außer der Datenbank und ihren Begleitdateien."""
+        datenbank = os.path.normcase(os.path.abspath(config.DATABASE_FILE))
+        ausgelassen = {datenbank + endung for endung in ("", *_SQLITE_BEGLEITDATEIEN)}
+        for folder in (config.DATA_FOLDER, config.OUTPUT_FOLDER):
+            if not os.path.isdir(folder):
+                logger.warning(f"Zu sichernder Ordner '{folder}' nicht gefunden. Überspringe.")
+                continue
+            for root, _, files in os.walk(folder):
+                for file in files:
+                    file_path = os.path.join(root, file)
+                    if os.path.normcase(os.path.abspath(file_path)) not in ausgelassen:
+                        yield file_path
+
+    def import_all_data_from_zip(self, zip_path: str,
+                                 fortschritt_callback: Optional[Callable[[str], None]] = None,
+                                 umfang: str = UMFANG_ALLES) -> Tuple[bool, str]:
+        """
+        Stellt alle Daten und Berichte aus einem Backup wieder her, oder mit `umfang`
+        nur den Datenordner (UMFANG_DATENBANK) bzw. nur die Dokumente (UMFANG_DOKUMENTE).
+        Gelesen werden nur die dafür benötigten Einträge und Basis-Archive.
+
+        1. Prüfen und Entpacken: Alle Einträge werden in Staging-Ordner neben den Zielordnern
+           gestreamt; zipfile prüft dabei die CRC jedes Eintrags. Anschließend wird die
+           Datenbank mit `PRAGMA integrity_check` und auf ihre Schema-Version geprüft.
+           Die laufende Anwendung bleibt dabei unberührt.
+        2. Austausch: Nur hier ist die Datenbank geschlossen. Die bisherigen Ordner werden
+           umbenannt und die Staging-Ordner an ihre Stelle umbenannt; schlägt ein Schritt
+           fehl, werden die bereits ausgeführten rückgängig gemacht.
+        3. Aufräumen: Die bisherigen Ordner werden gelöscht.
+
+        Args:
+            zip_path: Das Backup-Archiv (bei inkrementellen Backups mit seinen Basis-Archiven).
+            fortschritt_callback: Optional, erhält Statusmeldungen zum Fortschritt.
+            umfang: UMFANG_ALLES, UMFANG_DATENBANK oder UMFANG_DOKUMENTE.
+        """
+        def melde(nachricht: str) -> None:
+            if fortschritt_callback:
+                fortschritt_callback(nachricht)
+
+        zeiten: Dict[str, float] = {}
+        staging: Dict[str, str] = {}
         try:
+            start = time.perf_counter()
             if not zipfile.is_zipfile(zip_path):
                 logger.warning(f"Importversuch mit ungültiger ZIP-Datei: {zip_path}")
                 return False, "Die ausgewählte Datei ist kein gültiges ZIP-Archiv."
 
-            # Temporäre Backup-Pfade
-            data_old = config.DATA_FOLDER + "_old"
-            ausgabe_old = config.OUTPUT_FOLDER + "_old"
-            
-            # Alte Backup-Verzeichnisse entfernen, falls vorhanden
-            if os.path.exists(data_old): shutil.rmtree(data_old)
-            if os.path.exists(ausgabe_old): shutil.rmtree(ausgabe_old)
+            melde("Prüfe und entpacke das Backup...")
+            zielordner = _ZIELORDNER[umfang]()
+            praefixe = tuple(self._archivname(ordner) + "/" for ordner in zielordner)
+            try:
+                kette = self._lade_kette(zip_path, praefixe)
+                for ordner in zielordner:
+                    # Auf demselben Dateisystem wie der Zielordner, damit der Austausch ein Umbenennen ist
+                    os.makedirs(os.path.dirname(ordner), exist_ok=True)
+                    staging[ordner] = tempfile.mkdtemp(prefix=f".{os.path.basename(ordner)}_neu_",
+                                                       dir=os.path.dirname(ordner))
+                self._entpacke_geprueft(self._quellen(zip_path, kette, praefixe), staging)
+                if config.DATA_FOLDER in staging:
+                    self._pruefe_datenbank(os.path.join(
+                        staging[config.DATA_FOLDER], os.path.relpath(config.DATABASE_FILE, config.DATA_FOLDER)))
+            except (ValueError, zipfile.BadZipFile) as e:
+                logger.warning(f"Backup '{zip_path}' ist ungültig: {e}")
+                return False, f"Das Backup kann nicht wiederhergestellt werden: {e}"
+            for ordner in staging:
+                if os.path.exists(ordner + "_old"):
+                    shutil.rmtree(ordner + "_old")
+            zeiten["Prüfen und Entpacken"] = time.perf_counter() - start
 
-            # --- KORREKTUR START ---
-            # Datenbankverbindung schließen, um Sperre aufzuheben
-            self.data_manager.close_db_connection()
-            # --- KORREKTUR ENDE ---
+            melde("Tausche die Daten aus...")
+            start = time.perf_counter()
+            alte_ordner, offline = self._tausche_ordner(staging)
+            zeiten["Austausch"] = time.perf_counter() - start
 
-            # Aktuelle Daten sichern durch Verschieben
-            if os.path.exists(config.DATA_FOLDER):
-                shutil.move(config.DATA_FOLDER, data_old)
-            if os.path.exists(config.OUTPUT_FOLDER):
-                shutil.move(config.OUTPUT_FOLDER, ausgabe_old)
+            melde("Räume auf...")
+            start = time.perf_counter()
+            for ordner in alte_ordner:
+                shutil.rmtree(ordner, ignore_errors=True)
+                if os.path.exists(ordner):
+                    logger.warning(f"Konnte alten Backup-Ordner '{ordner}' nicht löschen. Dies ist kein kritischer Fehler.")
+            zeiten["Aufräumen"] = time.perf_counter() - start
 
-            try:
+            dauer = ", ".join(f"{phase} {sekunden:.2f} s" for phase, sekunden in zeiten.items())
+            logger.info(f"Daten ({umfang}) erfolgreich aus '{zip_path}' importiert ({dauer}; "
+                        f"Datenbank {offline:.2f} s geschlossen).")
+            return True, f"{_ERFOLGSMELDUNGEN[umfang]}\n({dauer})"
+        except Exception as e:
+            logger.error(f"Fehler beim Importieren der Daten aus '{zip_path}'.", exc_info=True)
+            return False, f"Fehler beim Importieren der Daten: {e}"
+        finally:
+            for ordner in staging.values():
+                if os.path.exists(ordner):
+                    shutil.rmtree(ordner, ignore_errors=True)
+
+    def lies_inhalt(self, zip_path: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Ermittelt den Inhalt eines Backups, ohne es zu entpacken. Gelesen werden nur das
+        Manifest bzw. das Inhaltsverzeichnis und die Datenbank (für die Berichte pro Jahr).
+
+        Returns:
+            Ein Tupel (inhalt, error_message). `inhalt` enthält "erstellt_am" und "basis"
+            (nur bei Archiven mit Manifest), "datenbank" (bool), "dokumente" (Anzahl) und
+            "jahre" (Jahr -> Anzahl Berichte).
+        """
+        try:
+            if not zipfile.is_zipfile(zip_path):
+                return None, "Die ausgewählte Datei ist kein gültiges ZIP-Archiv."
+            manifest = _lies_manifest(zip_path)
+            datenbank_name = manifest["datenbank"] if manifest else self._archivname(config.DATABASE_FILE)
+            if manifest:
+                namen = list(manifest["dateien"])
+            else:
                 with zipfile.ZipFile(zip_path, 'r') as zipf:
-                    # Extrahiert alle Dateien in das Basisverzeichnis der Anwendung
-                    zipf.extractall(config.BASE_DIR) 
-                
-                # Wenn erfolgreich, alte Backups löschen (mit Fehlerbehandlung)
-                try:
-                    if os.path.exists(data_old): shutil.rmtree(data_old)
-                    if os.path.exists(ausgabe_old): shutil.rmtree(ausgabe_old)
-                except OSError as e:
-                    logger.warning(f"Konnte alten Backup-Ordner nicht löschen: {e}. Dies ist kein kritischer Fehler.")
-
-                
-                logger.info(f"Alle Daten erfolgreich aus '{zip_path}' importiert.")
-                return True, "Alle Daten und Berichte wurden erfolgreich importiert."
-
-            except Exception as e:
-                # Bei Fehlern den alten Zustand wiederherstellen
-                logger.error(f"Fehler beim Extrahieren des Backups: {e}. Stelle alten Zustand wieder her.", exc_info=True)
-                if os.path.exists(data_old):
-                    if os.path.exists(config.DATA_FOLDER): shutil.rmtree(config.DATA_FOLDER)
-                    shutil.move(data_old, config.DATA_FOLDER)
-                if os.path.exists(ausgabe_old):
-                    if os.path.exists(config.OUTPUT_FOLDER): shutil.rmtree(config.OUTPUT_FOLDER)
-                    shutil.move(ausgabe_old, config.OUTPUT_FOLDER)
-                return False, f"Fehler beim Import: {e}. Der vorherige Zustand wurde wiederhergestellt."
+                    namen = [name for name in zipf.namelist() if not name.endswith("/")]
+            dokumente_praefix = self._archivname(config.OUTPUT_FOLDER) + "/"
+            with zipfile.ZipFile(zip_path, 'r') as zipf:
+                hat_datenbank = datenbank_name in zipf.namelist()
+            jahre: Dict[int, int] = {}
+            if hat_datenbank:
+                with tempfile.TemporaryDirectory() as temp_ordner:
+                    with self._oeffne_datenbank_aus_zip(zip_path, datenbank_name, temp_ordner) as verbindung:
+                        jahre = dict(verbindung.execute(
+                            "SELECT jahr, COUNT(*) FROM berichte GROUP BY jahr ORDER BY jahr").fetchall())
+            return {
+                "erstellt_am": manifest["erstellt_am"] if manifest else None,
+                "basis": os.path.basename(manifest["basis"]["pfad"]) if manifest and manifest["basis"] else None,
+                "datenbank": hat_datenbank,
+                "dokumente": sum(1 for name in namen if name.startswith(dokumente_praefix)),
+                "jahre": jahre,
+            }, None
+        except (ValueError, KeyError, zipfile.BadZipFile, sqlite3.Error, OSError) as e:
+            logger.warning(f"Inhalt des Backups '{zip_path}' nicht lesbar: {e}", exc_info=True)
+            return None, f"Das Backup kann nicht gelesen werden: {e}"
+
+    def importiere_jahre_aus_zip(self, zip_path: str, jahre: Iterable[int]) -> Tuple[bool, str]:
+        """
+        Übernimmt die Berichte der angegebenen Jahre aus der Datenbank eines Backups in die
+        aktuelle Datenbank. Berichte derselben Kalenderwoche werden überschrieben, alle
+        übrigen Daten bleiben unverändert. Aus dem Archiv wird nur die Datenbank gelesen.
+        """
+        jahre = sorted({int(jahr) for jahr in jahre})
+        if not jahre:
+            return False, "Es wurde kein Jahr ausgewählt."
+        try:
+            manifest = _lies_manifest(zip_path)
+            datenbank_name = manifest["datenbank"] if manifest else self._archivname(config.DATABASE_FILE)
+            with tempfile.TemporaryDirectory() as temp_ordner:
+                with self._oeffne_datenbank_aus_zip(zip_path, datenbank_name, temp_ordner) as verbindung:
+                    berichte = _lade_berichte(verbindung, jahre)
+        except (ValueError, KeyError, zipfile.BadZipFile, sqlite3.Error, OSError) as e:
+            logger.warning(f"Berichte aus dem Backup '{zip_path}' nicht lesbar: {e}", exc_info=True)
+            return False, f"Das Backup kann nicht gelesen werden: {e}"
+
+        jahre_text = ", ".join(map(str, jahre))
+        if not berichte:
+            return False, f"Das Backup enthält keine Berichte aus {jahre_text}."
+        if not self.data_manager.importiere_berichte(berichte):
+            return False, "Fehler beim Speichern der Berichte. Details im Log."
+        logger.info(f"{len(berichte)} Berichte aus {jahre_text} aus '{zip_path}' übernommen.")
+        return True, f"{len(berichte)} Bericht(e) aus {jahre_text} übernommen."
 
+    @contextmanager
+    def _oeffne_datenbank_aus_zip(self, zip_path: str, datenbank_name: str,
+                                  temp_ordner: str) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Entpackt nur die Datenbank eines Backups (bei älteren Backups mit ihrer WAL-Datei)
+        geprüft in `temp_ordner` und öffnet sie.
+
+        Raises:
+            KeyError: Wenn das Backup keine Datenbank enthält.
+            ValueError, zipfile.BadZipFile: Wenn sie beschädigt ist.
+        """
+        with zipfile.ZipFile(zip_path, 'r') as zipf:
+            vorhanden = set(zipf.namelist())
+        namen = [name for name in (datenbank_name, datenbank_name + "-wal") if name in vorhanden]
+        if datenbank_name not in namen:
+            raise KeyError(f"Das Backup enthält keine Datenbank ('{datenbank_name}').")
+        ordner_name = self._archivname(config.DATA_FOLDER) + "/"
+        self._entpacke_geprueft({zip_path: namen}, {config.DATA_FOLDER: temp_ordner})
+        pfad = os.path.join(temp_ordner, *datenbank_name[len(ordner_name):].split("/"))
+        self._pruefe_datenbank(pfad)
+        verbindung = sqlite3.connect(pfad)
+        try:
+            yield verbindung
+        finally:
+            verbindung.close()
+
+    def _entpacke_geprueft(self, quellen: Dict[str, List[str]], staging: Dict[str, str]) -> None:
+        """
+        Streamt die Einträge in die Staging-Ordner ihrer Zielordner. Die CRC prüft zipfile
+        beim Lesen bis zum Ende eines Eintrags.
+
+        Raises:
+            zipfile.BadZipFile: Bei einer falschen CRC oder einem beschädigten Archiv.
+            ValueError: Bei Einträgen, die aus dem Zielordner hinausführen würden.
+        """
+        praefixe = {self._archivname(ordner) + "/": ziel for ordner, ziel in staging.items()}
+        for archiv, namen in quellen.items():
+            with zipfile.ZipFile(archiv, 'r') as zipf:
+                for name in namen:
+                    if name == MANIFEST_NAME:
+                        continue
+                    praefix = next((p for p in praefixe if name.startswith(p)), None)
+                    if praefix is None:
+                        logger.warning(f"Eintrag '{name}' gehört zu keinem Datenordner und wird übersprungen.")
+                        continue
+                    relativ = os.path.normpath(name[len(praefix):])
+                    if os.path.isabs(relativ) or relativ.split(os.sep)[0] == os.pardir:
+                        raise ValueError(f"Ungültiger Pfad im Archiv: '{name}'")
+                    ziel = os.path.join(praefixe[praefix], relativ)
+                    os.makedirs(os.path.dirname(ziel), exist_ok=True)
+                    with zipf.open(name) as quelle, open(ziel, "wb") as datei:
+                        shutil.copyfileobj(quelle, datei, _KOPIER_PUFFER)
+
+    def _pruefe_datenbank(self, pfad: str) -> None:
+        """
+        Prüft die entpackte Datenbank auf Integrität und eine unterstützte Schema-Version.
+
+        Raises:
+            ValueError: Wenn die Datenbank fehlt, beschädigt ist oder neuer als die Anwendung.
+        """
+        if not os.path.isfile(pfad):
+            raise ValueError("Das Backup enthält keine Datenbank.")
+        try:
+            verbindung = sqlite3.connect(pfad)
+            try:
+                ergebnis = verbindung.execute("PRAGMA integrity_check;").fetchone()[0]
+                version = verbindung.execute("PRAGMA user_version;").fetchone()[0]
             finally:
-                # --- KORREKTUR START ---
-                # Datenbankverbindung wiederherstellen, egal was passiert
-                self.data_manager.connect_db_connection()
-                # --- KORREKTUR ENDE ---
+                verbindung.close()
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"Die Datenbank im Backup ist beschädigt ({e}).") from e
+        if ergebnis != "ok":
+            raise ValueError(f"Die Datenbank im Backup ist beschädigt ({ergebnis}).")
+        migrationen = [int(datei.split("_")[0]) for datei in os.listdir(self.data_manager.db.migrations_path)
+                       if datei.endswith(".sql") and datei.split("_")[0].isdigit()]
+        if version > max(migrationen, default=0):
+            raise ValueError("Das Backup stammt aus einer neueren Version der Anwendung.")
 
-        except Exception as e:
-            logger.error(f"Fehler beim Importieren der Daten aus '{zip_path}'.", exc_info=True)
-            return False, f"Fehler beim Importieren der Daten: {e}"
\ No newline at end of file
+    def _tausche_ordner(self, staging: Dict[str, str]) -> Tuple[List[str], float]:
+        """
+        Ersetzt die Zielordner durch ihre Staging-Ordner. Wird der Datenordner ersetzt, ist die
+        Datenbank nur währenddessen geschlossen und wird danach (inkl. ausstehender Migrationen)
+        wieder geöffnet.
+
+        Returns:
+            Die umbenannten bisherigen Ordner und die Zeit, die die Datenbank geschlossen war.
+        """
+        umbenannt: List[Tuple[str, str]] = []
+        alte_ordner: List[str] = []
+        datenbank_betroffen = config.DATA_FOLDER in staging
+        if datenbank_betroffen:
+            self.data_manager.close_db_connection()
+        geschlossen = time.perf_counter()
+        try:
+            for ordner, neu in staging.items():
+                if os.path.exists(ordner):
+                    os.rename(ordner, ordner + "_old")
+                    umbenannt.append((ordner, ordner + "_old"))
+                    alte_ordner.append(ordner + "_old")
+                os.rename(neu, ordner)
+                umbenannt.append((neu, ordner))
+        except OSError:
+            logger.error("Austausch der Ordner fehlgeschlagen, stelle den alten Zustand wieder her.", exc_info=True)
+            for quelle, ziel in reversed(umbenannt):
+                os.rename(ziel, quelle)
+            raise
+        finally:
+            if datenbank_betroffen:
+                self.data_manager.connect_db_connection()
+            offline = time.perf_counter() - geschlossen if datenbank_betroffen else 0.0
+        if datenbank_betroffen:
+            self.data_manager.db.run_migrations()
+        return alte_ordner, offline
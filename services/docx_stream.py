@@ -0,0 +1,121 @@
+# services/docx_stream.py
+# -*- coding: utf-8 -*-
+"""
+Liest Absatztexte direkt aus dem `word/document.xml` einer DOCX-Datei.
+
+Statt das ganze Dokument mit python-docx aufzubauen, wird das XML mit `iterparse`
+gestreamt: Jeder Absatz wird gelesen und sofort wieder freigegeben. Die Texte
+entsprechen `Document(pfad).paragraphs[i].text` von python-docx (inkl. Tabulatoren,
+Zeilenumbrüchen und Hyperlinks). Tabellen werden zeilenweise als Listen von Zelltexten
+geliefert.
+"""
+from typing import BinaryIO, Iterator, List, Union
+import zipfile
+
+from lxml import etree
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_BODY = _W + "body"
+W_P = _W + "p"
+W_TBL = _W + "tbl"
+_W_R = _W + "r"
+_W_HYPERLINK = _W + "hyperlink"
+_W_T = _W + "t"
+_W_BR = _W + "br"
+_W_TYPE = _W + "type"
+_W_TR = _W + "tr"
+_W_TC = _W + "tc"
+_W_TR_PR = _W + "trPr"
+_W_TC_PR = _W + "tcPr"
+_W_GRID_BEFORE = _W + "gridBefore"
+_W_GRID_SPAN = _W + "gridSpan"
+_W_VAL = _W + "val"
+# Inhalte eines Runs mit festem Textäquivalent (wie in python-docx)
+_ZEICHEN = {_W + "tab": "\t", _W + "ptab": "\t", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+
+
+def _lauf_text(lauf: etree._Element, teile: List[str]) -> None:
+    """Hängt den Text eines <w:r> an."""
+    for kind in lauf:
+        if kind.tag == _W_T:
+            if kind.text:
+                teile.append(kind.text)
+        elif kind.tag == _W_BR:
+            # Seiten- und Spaltenumbrüche ergeben keinen Text
+            if kind.get(_W_TYPE, "textWrapping") == "textWrapping":
+                teile.append("\n")
+        else:
+            zeichen = _ZEICHEN.get(kind.tag)
+            if zeichen:
+                teile.append(zeichen)
+
+
+def absatz_text(absatz: etree._Element) -> str:
+    """Gibt den Text eines <w:p> zurück (direkte Runs und Runs in Hyperlinks)."""
+    teile: List[str] = []
+    for kind in absatz:
+        if kind.tag == _W_R:
+            _lauf_text(kind, teile)
+        elif kind.tag == _W_HYPERLINK:
+            for lauf in kind:
+                if lauf.tag == _W_R:
+                    _lauf_text(lauf, teile)
+    return "".join(teile)
+
+
+def _spalten(eigenschaften: etree._Element, tag: str) -> int:
+    """Liest einen Spaltenwert wie <w:gridSpan w:val="2"/> aus (0, wenn nicht vorhanden)."""
+    if eigenschaften is None:
+        return 0
+    element = eigenschaften.find(tag)
+    try:
+        return int(element.get(_W_VAL)) if element is not None else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+def tabellen_zeilen(tabelle: etree._Element) -> Iterator[List[str]]:
+    """
+    Liefert die Zeilen einer <w:tbl> als Listen von Zelltexten (Absätze einer Zelle durch
+    Zeilenumbrüche getrennt). Zusammengeführte Zellen werden mit leeren Texten aufgefüllt,
+    damit jeder Eintrag einer Spalte des Tabellenrasters entspricht; die Fortsetzung einer
+    vertikal verbundenen Zelle ist leer.
+    """
+    for zeile in tabelle.iterchildren(_W_TR):
+        zellen = [""] * _spalten(zeile.find(_W_TR_PR), _W_GRID_BEFORE)
+        for zelle in zeile.iterchildren(_W_TC):
+            zellen.append("\n".join(absatz_text(absatz) for absatz in zelle.iter(W_P)).strip())
+            zellen.extend([""] * (_spalten(zelle.find(_W_TC_PR), _W_GRID_SPAN) - 1))
+        yield zellen
+
+
+def iteriere_bloecke(pfad: Union[str, BinaryIO]) -> Iterator[etree._Element]:
+    """
+    Liefert die Absätze und Tabellen direkt unterhalb von <w:body> in Dokumentreihenfolge.
+    `pfad` kann ein Dateipfad oder ein geöffneter, seekbarer Binär-Stream sein.
+    Jedes Element ist nur bis zum nächsten Schritt gültig und wird danach freigegeben.
+
+    Raises:
+        zipfile.BadZipFile, KeyError, etree.XMLSyntaxError: Wenn die Datei kein lesbares DOCX ist.
+    """
+    with zipfile.ZipFile(pfad) as archiv, archiv.open("word/document.xml") as xml:
+        for _, element in etree.iterparse(xml, events=("end",), tag=(W_P, W_TBL),
+                                          resolve_entities=False, no_network=True):
+            eltern = element.getparent()
+            if eltern is None or eltern.tag != W_BODY:
+                continue  # Absätze in Tabellen gehören zur Tabelle
+            yield element
+            # Verarbeitete Elemente freigeben, damit auch große Dokumente wenig Speicher brauchen
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del eltern[0]
+
+
+def lies_absaetze(pfad: Union[str, BinaryIO]) -> Iterator[str]:
+    """
+    Liefert die Texte aller Absätze des Dokumentkörpers (ohne Tabelleninhalte),
+    wie sie `Document.paragraphs` von python-docx liefern würde.
+    """
+    for element in iteriere_bloecke(pfad):
+        if element.tag == W_P:
+            yield absatz_text(element)
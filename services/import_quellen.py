@@ -0,0 +1,185 @@
+# services/import_quellen.py
+# -*- coding: utf-8 -*-
+"""
+Quellen für den DOCX-Import: einzelne Dateien, ganze Ordnerbäume und ZIP-Archive.
+
+Alle Quellen werden lazy als Pfade aufgezählt, sodass auch tausende Dateien weder
+eine große Liste im Speicher noch temporären Platz auf der Festplatte brauchen.
+Dateien in ZIP-Archiven werden als "<archiv>.zip!/<eintrag>" adressiert und beim
+Analysieren direkt aus dem Archiv gelesen, ohne sie zu entpacken.
+
+Geöffnete Archive hält ein `ArchivCache`, der zu einem Importlauf gehört: Jeder Lauf
+übergibt seinen eigenen Cache und schließt ihn am Ende, ohne die Archive eines gleichzeitig
+laufenden Imports anzutasten. Ohne Cache wird ein Cache pro Prozess verwendet (z.B. in
+den Worker-Prozessen der Analyse, die nur zu einem Lauf gehören).
+"""
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+import io
+import logging
+import os
+import threading
+import time
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+ZIP_TRENNER = "!/"
+_DOCX_ENDUNG = ".docx"
+_ZIP_ENDUNG = ".zip"
+_MAX_OFFENE_ARCHIVE = 4
+
+
+def ist_importierbar(name: str) -> bool:
+    """Prüft, ob ein Dateiname ein DOCX-Dokument ist (ohne temporäre Word-Dateien)."""
+    basisname = os.path.basename(name)
+    return basisname.lower().endswith(_DOCX_ENDUNG) and not basisname.startswith("~$")
+
+
+class ArchivCache:
+    """
+    Hält die während eines Importlaufs geöffneten Archive, damit das Inhaltsverzeichnis
+    nicht für jeden Eintrag neu gelesen wird. Als Kontextmanager verwendbar.
+    """
+    def __init__(self, max_offen: int = _MAX_OFFENE_ARCHIVE):
+        self.max_offen = max_offen
+        self._archive: Dict[Tuple[str, int, int], zipfile.ZipFile] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ArchivCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.schliesse()
+
+    def oeffne_archiv(self, archiv: str) -> zipfile.ZipFile:
+        """Öffnet ein Archiv oder gibt das bereits geöffnete zurück, solange es unverändert ist."""
+        stat = os.stat(archiv)
+        schluessel = (os.path.abspath(archiv), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            zf = self._archive.get(schluessel)
+            if zf is None:
+                zf = zipfile.ZipFile(archiv)
+                if len(self._archive) >= self.max_offen:
+                    self._archive.pop(next(iter(self._archive))).close()
+                self._archive[schluessel] = zf
+            return zf
+
+    def lies(self, archiv: str, eintrag: str) -> bytes:
+        """Liest einen Eintrag; Lesezugriffe auf dasselbe ZipFile werden serialisiert."""
+        zf = self.oeffne_archiv(archiv)
+        with self._lock:
+            return zf.read(eintrag)
+
+    def schliesse(self) -> None:
+        """Schließt alle Archive dieses Caches."""
+        with self._lock:
+            for zf in self._archive.values():
+                zf.close()
+            self._archive.clear()
+
+
+# Cache für Aufrufe ohne eigenen Cache, z.B. in Worker-Prozessen
+_prozess_archive = ArchivCache()
+
+
+def iteriere_quellen(pfade: Iterable[str], archive: Optional[ArchivCache] = None) -> Iterator[str]:
+    """
+    Zählt alle importierbaren Dokumente der angegebenen Quellen auf.
+
+    Args:
+        pfade: Dateien (.docx), Ordner (rekursiv) oder ZIP-Archive, gemischt.
+        archive: Der Archiv-Cache des Importlaufs (Standard: der Cache des Prozesses).
+
+    Yields:
+        Pfade einzelner Dokumente; Einträge in Archiven als "<archiv>!/<eintrag>".
+    """
+    for pfad in pfade:
+        if os.path.isdir(pfad):
+            yield from durchsuche_ordner(pfad, archive)
+        elif pfad.lower().endswith(_ZIP_ENDUNG):
+            yield from zip_eintraege(pfad, archive)
+        else:
+            yield pfad
+
+
+def durchsuche_ordner(ordner: str, archive: Optional[ArchivCache] = None) -> Iterator[str]:
+    """
+    Durchsucht einen Ordnerbaum mit `os.scandir` nach DOCX-Dateien und ZIP-Archiven.
+    Unterordner werden erst betreten, wenn der aktuelle Ordner abgearbeitet ist.
+    """
+    offen = [ordner]
+    while offen:
+        aktuell = offen.pop()
+        try:
+            with os.scandir(aktuell) as eintraege:
+                unterordner = []
+                for eintrag in eintraege:
+                    if eintrag.is_dir(follow_symlinks=False):
+                        unterordner.append(eintrag.path)
+                    elif ist_importierbar(eintrag.name):
+                        yield eintrag.path
+                    elif eintrag.name.lower().endswith(_ZIP_ENDUNG):
+                        yield from zip_eintraege(eintrag.path, archive)
+        except OSError as e:
+            logger.warning(f"Ordner '{aktuell}' kann nicht gelesen werden: {e}")
+            continue
+        offen.extend(sorted(unterordner, reverse=True))
+
+
+def zip_eintraege(archiv: str, archive: Optional[ArchivCache] = None) -> Iterator[str]:
+    """Zählt die DOCX-Dateien in einem ZIP-Archiv auf, ohne sie zu entpacken."""
+    try:
+        infos = (archive or _prozess_archive).oeffne_archiv(archiv).infolist()
+    except (OSError, zipfile.BadZipFile) as e:
+        logger.warning(f"ZIP-Archiv '{archiv}' kann nicht gelesen werden: {e}")
+        return
+    for info in infos:
+        if not info.is_dir() and ist_importierbar(info.filename):
+            yield f"{archiv}{ZIP_TRENNER}{info.filename}"
+
+
+def zerlege(pfad: str) -> Tuple[str, Optional[str]]:
+    """Zerlegt einen Quellpfad in (Datei oder Archiv, Eintrag im Archiv oder None)."""
+    position = pfad.lower().find(_ZIP_ENDUNG + ZIP_TRENNER)
+    if position < 0:
+        return pfad, None
+    ende = position + len(_ZIP_ENDUNG)
+    return pfad[:ende], pfad[ende + len(ZIP_TRENNER):]
+
+
+def normalisiere(pfad: str) -> str:
+    """Gibt einen eindeutigen, absoluten Schlüssel für eine Quelle zurück (z.B. für Fingerabdrücke)."""
+    archiv, eintrag = zerlege(pfad)
+    normalisiert = os.path.normcase(os.path.abspath(archiv))
+    return normalisiert if eintrag is None else f"{normalisiert}{ZIP_TRENNER}{eintrag}"
+
+
+def oeffne(pfad: str, archive: Optional[ArchivCache] = None) -> Union[str, io.BytesIO]:
+    """
+    Gibt eine Quelle so zurück, dass python-docx und `zipfile` sie öffnen können:
+    normale Dateien als Pfad, Einträge in Archiven als BytesIO (nur im Speicher).
+
+    Raises:
+        OSError, KeyError, zipfile.BadZipFile: Wenn die Quelle nicht gelesen werden kann.
+    """
+    archiv, eintrag = zerlege(pfad)
+    if eintrag is None:
+        return pfad
+    return io.BytesIO((archive or _prozess_archive).lies(archiv, eintrag))
+
+
+def fingerabdruck(pfad: str, archive: Optional[ArchivCache] = None) -> Tuple[int, float, Optional[str]]:
+    """
+    Gibt Größe, Änderungszeit und - falls ohne Lesen des Inhalts bekannt - einen
+    Inhalts-Schlüssel zurück. Für Archiveinträge ist das die CRC32 aus dem Archiv.
+
+    Raises:
+        OSError, KeyError, zipfile.BadZipFile: Wenn die Quelle nicht gelesen werden kann.
+    """
+    archiv, eintrag = zerlege(pfad)
+    if eintrag is None:
+        stat = os.stat(pfad)
+        return stat.st_size, stat.st_mtime, None
+    info = (archive or _prozess_archive).oeffne_archiv(archiv).getinfo(eintrag)
+    return info.file_size, time.mktime(info.date_time + (0, 0, -1)), f"crc32:{info.CRC:08x}"
+
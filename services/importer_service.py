@@ -4,32 +4,477 @@
 Dienst zur Kapselung der Logik für den Import von DOCX-Berichtsheften.
 """
 
+import hashlib
+import itertools
+import json
 import logging
 import re
 import os
-from typing import Dict, Optional, Any, List, Tuple
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional, Any, Iterable, Iterator, List, Set, Tuple, TYPE_CHECKING
 from docx import Document
 from datetime import datetime
+from lxml import etree
 
 from core import config
+from core.logic import BerichtsheftLogik
+from services import docx_stream, import_quellen
+
+if TYPE_CHECKING:
+    from core.data_manager import DataManager
 
 logger = logging.getLogger(__name__)
 
+# Bei Änderungen an der Auswertung erhöhen, damit zwischengespeicherte Ergebnisse verworfen werden.
+PARSER_VERSION = "3"
+
+# Ergebnis der Analyse einer Datei: (Pfad, Kontext oder None, Fehlermeldung oder None)
+ParseErgebnis = Tuple[str, Optional[Dict[str, Any]], Optional[str]]
+
+# Kopfangaben eines Berichts; alle Muster ignorieren Groß-/Kleinschreibung.
+_KOPF_MUSTER = re.compile(
+    r"Ausbildungsnachweis\s*Nr\.?\s*(?P<nr>\d+)"
+    r"|Azubi:\s*(?P<name>.*?);"
+    r"|Zeitraum:\s*(?P<von>\d{2}\.\d{2}\.\d{4})",
+    re.IGNORECASE,
+)
+_KOPF_GRUPPEN = tuple(_KOPF_MUSTER.groupindex)
+# Ein Tagesabschnitt beginnt mit einem Wochentag am Anfang eines Absatzes, z.B. "Montag; Typ: ..."
+_TAG_MUSTER = re.compile(r"^\s*(" + "|".join(config.DAYS_IN_WEEK) + r")\s*;", re.IGNORECASE)
+_TYP_MUSTER = re.compile(r"Typ:\s*(\w+)", re.IGNORECASE)
+_STUNDEN_MUSTER = re.compile(r"Gesamtstunden:\s*([\d:]+)", re.IGNORECASE)
+
+# Kopfangaben in Tabellenvorlagen (z.B. IHK-Ausbildungsnachweis); Beschriftung und Wert
+# können in derselben oder in benachbarten Zellen stehen. Beschriftungen beginnen an einer
+# Wortgrenze ("Firmenname:" ist kein Name); ein bloßes "Name:" nur am Anfang der Zelle.
+_TABELLEN_KOPF_MUSTER = re.compile(
+    r"(?:nachweis|bericht)\s*-?\s*(?:nr\.?|nummer)\s*:?\s*(?P<nr>\d+)"
+    r"|(?:\b(?:name\s+des\s+auszubildenden|name\s*,\s*vorname|vorname\s*,?\s*name|auszubildender?|azubi)"
+    r"|^\s*name)"
+    r"\s*:\s*(?P<name>[^;\t\n]*?[^;\t\n\s])\s*(?:$|[;\t\n])"
+    r"|\b(?:zeitraum|woche|vom|von)\b\D{0,20}?(?P<von>\d{1,2}\.\d{1,2}\.(?:\d{4}|\d{2}))\b",
+    re.IGNORECASE | re.MULTILINE,
+)
+_DATUM_MUSTER = re.compile(r"\b(\d{1,2}\.\d{1,2}\.(?:\d{4}|\d{2}))\b")
+# Wochentag am Anfang einer Zelle, ausgeschrieben oder abgekürzt ("Montag", "Mo.", "Mo 08.01.")
+_TABELLEN_TAG_MUSTER = re.compile(
+    r"^\s*(" + "|".join(f"{tag[:2]}(?:{tag[2:]})?" for tag in config.DAYS_IN_WEEK) + r")\b",
+    re.IGNORECASE,
+)
+_TAGE_NACH_KUERZEL = {tag[:2].lower(): tag for tag in config.DAYS_IN_WEEK}
+# Spaltenüberschriften der Tagestabelle
+_STUNDEN_SPALTE_MUSTER = re.compile(r"stunden|std\b", re.IGNORECASE)
+_TAETIGKEIT_SPALTE_MUSTER = re.compile(
+    r"t[äa]tigkeit|arbeiten|unterweisung|unterricht|inhalt|beschreibung", re.IGNORECASE)
+_TYP_SPALTE_MUSTER = re.compile(r"^\s*(?:typ|art|lernort)\b", re.IGNORECASE)
+# Stundenangaben wie "8", "7,5", "7.5", "7:30" oder "8 Std."
+_STUNDEN_WERT_MUSTER = re.compile(
+    r"^\s*(\d{1,2})(?:([:,.])(\d{1,2}))?\s*(?:h|std\.?|stunden)?\s*$", re.IGNORECASE)
+# Typ eines Tages, wenn er am Anfang der Tätigkeiten oder in einer eigenen Spalte steht
+_TYP_TEXT_MUSTER = re.compile(r"^\s*(?:(Berufs)?schule|(Urlaub)|(Krank)\w*|(Feiertag))\b", re.IGNORECASE)
+
+# Einstufung eines eingelesenen Berichts gegenüber der Datenbank
+IMPORT_NEU = "neu"
+IMPORT_IDENTISCH = "identisch"
+IMPORT_GEAENDERT = "geaendert"
+# Mehrere Dateien des Imports enthalten unterschiedliche Fassungen derselben Woche
+IMPORT_KONFLIKT = "konflikt"
+
+# Bei wenigen Dateien lohnt sich der Start von Worker-Prozessen nicht.
+_MIN_DATEIEN_PARALLEL = 4
+# Aufträge pro Worker, die gleichzeitig in der Warteschlange liegen dürfen
+_AUFTRAEGE_PRO_WORKER = 2
+
+
+@dataclass
+class DateiErgebnis:
+    """Ergebnis des Imports einer einzelnen Datei."""
+    pfad: str
+    context: Optional[Dict[str, Any]]
+    fehler: Optional[str]
+    # Neu zu speichernde Zeile für die Tabelle import_fingerabdruecke (None: nichts zu speichern)
+    fingerabdruck: Optional[Dict[str, Any]] = None
+    # Datei und Bericht sind seit dem letzten Import unverändert; es gibt nichts zu tun.
+    unveraendert: bool = False
+
+    def als_journal_eintrag(self) -> Dict[str, Any]:
+        """Gibt das Ergebnis als Zeile für die Tabelle import_journal zurück."""
+        return {
+            "pfad": self.pfad,
+            "ergebnis": json.dumps(self.context, ensure_ascii=False) if self.context else None,
+            "fehler": self.fehler,
+            "fingerabdruck": json.dumps(self.fingerabdruck, ensure_ascii=False) if self.fingerabdruck else None,
+            "unveraendert": int(self.unveraendert),
+        }
+
+    @classmethod
+    def aus_journal_eintrag(cls, eintrag: Dict[str, Any]) -> "DateiErgebnis":
+        """Stellt ein Ergebnis aus einer Zeile der Tabelle import_journal wieder her."""
+        return cls(
+            eintrag["pfad"],
+            json.loads(eintrag["ergebnis"]) if eintrag["ergebnis"] else None,
+            eintrag["fehler"],
+            json.loads(eintrag["fingerabdruck"]) if eintrag["fingerabdruck"] else None,
+            bool(eintrag["unveraendert"]),
+        )
+
+
+@dataclass
+class ImportPlan:
+    """
+    Ergebnis eines Probelaufs: alle eingelesenen Berichte und ihre Einstufung gegenüber
+    der Datenbank. Gespeichert wird erst, wenn der Plan (ganz oder teilweise) übernommen wird.
+    """
+    # Import-Auftrag, dessen Journal die Ergebnisse enthält (None ohne Journal)
+    auftrag_id: Optional[int] = None
+    # Bericht-ID -> Kontext (bei mehreren Dateien der zuletzt eingelesene)
+    berichte: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Bericht-ID -> Speicher-Hashes aller Fassungen im Import
+    hashes: Dict[str, Set[str]] = field(default_factory=dict)
+    # Bericht-ID -> Einstufung (IMPORT_NEU, IMPORT_IDENTISCH, ...)
+    status: Dict[str, str] = field(default_factory=dict)
+    # Fingerabdrücke der Dateien, gespeichert nur zusammen mit ihrem Bericht
+    fingerabdruecke: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    # Fingerabdrücke ohne zu speichernden Bericht (fehlerhafte oder unveränderte Dateien)
+    sonstige_fingerabdruecke: List[Dict[str, Any]] = field(default_factory=list)
+    fehler: Dict[str, str] = field(default_factory=dict)
+    erfolgreich: int = 0
+    uebersprungen: int = 0
+    fehlerhaft: int = 0
+
+    def fuege_hinzu(self, ergebnis: DateiErgebnis) -> Optional[str]:
+        """Nimmt das Ergebnis einer Datei auf und gibt eine Meldung dazu zurück (oder None)."""
+        context = ergebnis.context
+        if ergebnis.unveraendert:
+            self.uebersprungen += 1
+            if ergebnis.fehler:
+                self.fehler[ergebnis.pfad] = f"{ergebnis.fehler} (unverändert seit dem letzten Import)"
+        elif context:
+            bericht_id = f"{context['jahr']}-{int(context['kalenderwoche']):02d}"
+            fassungen = self.hashes.setdefault(bericht_id, set())
+            fassungen.add(BerichtsheftLogik.berechne_speicher_hash(context))
+            if bericht_id in self.berichte and len(fassungen) > 1:
+                logger.warning(f"Abweichende Fassungen für Bericht '{bericht_id}' im Import.")
+                self.fehler[ergebnis.pfad] = f"Abweichender doppelter Bericht für KW {bericht_id}."
+            self.berichte[bericht_id] = context
+            self.erfolgreich += 1
+        else:
+            self.fehlerhaft += 1
+            self.fehler[ergebnis.pfad] = ergebnis.fehler or "Unbekannter Fehler."
+        if ergebnis.fingerabdruck:
+            if context and not ergebnis.unveraendert:
+                self.fingerabdruecke.setdefault(bericht_id, []).append(ergebnis.fingerabdruck)
+            else:
+                self.sonstige_fingerabdruecke.append(ergebnis.fingerabdruck)
+        return self.fehler.get(ergebnis.pfad)
+
+    def vergleiche(self, gespeichert: Dict[str, str]) -> None:
+        """
+        Stuft alle eingelesenen Berichte anhand ihrer Speicher-Hashes ein.
+
+        Args:
+            gespeichert: Bericht-ID -> Speicher-Hash der Datenbank (`DataManager.lade_bericht_hashes`).
+        """
+        importiert = set(self.berichte)
+        neu = importiert - gespeichert.keys()
+        konflikte = {bericht_id for bericht_id in importiert if len(self.hashes[bericht_id]) > 1}
+        identisch = {bericht_id for bericht_id in importiert - neu - konflikte
+                     if gespeichert[bericht_id] in self.hashes[bericht_id]}
+        self.status = {bericht_id: IMPORT_KONFLIKT if bericht_id in konflikte else
+                       IMPORT_NEU if bericht_id in neu else
+                       IMPORT_IDENTISCH if bericht_id in identisch else IMPORT_GEAENDERT
+                       for bericht_id in importiert}
+
+    def nach_status(self, status: str) -> List[str]:
+        """Gibt die Bericht-IDs mit der angegebenen Einstufung sortiert zurück."""
+        return sorted(bericht_id for bericht_id, wert in self.status.items() if wert == status)
+
+
+def _tag_spalte(zeile: List[str]) -> Optional[int]:
+    """Gibt den Index der ersten Zelle zurück, die mit einem Wochentag beginnt (oder None)."""
+    for index, zelle in enumerate(zeile):
+        if zelle:
+            return index if _TABELLEN_TAG_MUSTER.match(zelle) else None
+    return None
+
+
+def _beschriftete_texte(zeile: List[str]) -> Iterator[str]:
+    """Liefert die Zelltexte; steht eine Beschriftung ("Name:") allein, folgt ihr Wert aus der nächsten Zelle."""
+    zellen = [zelle for zelle in zeile if zelle]
+    for index, zelle in enumerate(zellen):
+        if zelle.endswith(":") and index + 1 < len(zellen):
+            yield f"{zelle} {zellen[index + 1]}"
+        else:
+            yield zelle
+
+
+def _zelle(zeile: List[str], index: Optional[int]) -> str:
+    """Gibt den Text einer Zelle zurück (leer, wenn die Spalte fehlt)."""
+    return zeile[index].strip() if index is not None and index < len(zeile) else ""
+
+
+def _minuten(text: str) -> int:
+    """Wandelt eine Stundenangabe wie "8", "7,5" oder "7:30" in Minuten um (0, wenn keine)."""
+    treffer = _STUNDEN_WERT_MUSTER.match(text)
+    if not treffer:
+        return 0
+    stunden, trenner, rest = treffer.groups()
+    if not rest:
+        return int(stunden) * 60
+    if trenner == ":":
+        return int(stunden) * 60 + int(rest)
+    return int(stunden) * 60 + round(float(f"0.{rest}") * 60)
+
+
+def _typ_aus_text(text: str) -> Optional[str]:
+    """Erkennt Schule, Urlaub, Krank oder Feiertag am Anfang eines Textes."""
+    treffer = _TYP_TEXT_MUSTER.match(text)
+    if not treffer:
+        return None
+    if treffer.group(2):
+        return "Urlaub"
+    if treffer.group(3):
+        return "Krank"
+    if treffer.group(4):
+        return "Feiertag"
+    return "Schule"
+
+
+def _tabellen_spalten(ueberschrift: List[str], tag_zeilen: List[List[str]],
+                      tag_index: Optional[int]) -> Dict[str, Optional[int]]:
+    """
+    Ordnet die Spalten der Tagestabelle zu: zuerst über die Überschriftenzeile; fehlende
+    Spalten über den Inhalt (Stunden: die meisten Stundenangaben, Tätigkeiten: der meiste Text).
+    """
+    spalten: Dict[str, Optional[int]] = {"taetigkeiten": None, "stunden": None, "typ": None}
+    for index, text in enumerate(ueberschrift):
+        if index == tag_index or not text:
+            continue
+        if spalten["typ"] is None and _TYP_SPALTE_MUSTER.match(text):
+            spalten["typ"] = index
+        elif spalten["stunden"] is None and _STUNDEN_SPALTE_MUSTER.search(text) and not _TAETIGKEIT_SPALTE_MUSTER.search(text):
+            spalten["stunden"] = index
+        elif spalten["taetigkeiten"] is None and _TAETIGKEIT_SPALTE_MUSTER.search(text):
+            spalten["taetigkeiten"] = index
+
+    breite = max((len(zeile) for zeile in tag_zeilen), default=0)
+    belegt = {tag_index, *spalten.values()}
+    if spalten["stunden"] is None:
+        angaben = {index: sum(1 for zeile in tag_zeilen if _minuten(_zelle(zeile, index)))
+                   for index in range(breite) if index not in belegt}
+        if angaben and max(angaben.values()) > 0:
+            spalten["stunden"] = max(angaben, key=angaben.get)
+            belegt.add(spalten["stunden"])
+    if spalten["taetigkeiten"] is None:
+        textmenge = {index: sum(len(_zelle(zeile, index)) for zeile in tag_zeilen)
+                     for index in range(breite) if index not in belegt}
+        if textmenge:
+            spalten["taetigkeiten"] = max(textmenge, key=textmenge.get)
+    return spalten
+
+
+def _datei_hash(pfad: str) -> str:
+    """Berechnet den SHA-256 des Dateiinhalts."""
+    sha = hashlib.sha256()
+    with open(pfad, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _parse_datei(file_path: str) -> ParseErgebnis:
+    """Einstiegspunkt der Worker-Prozesse; liegt auf Modulebene, damit er übertragen werden kann."""
+    context, error = ImporterService().parse_docx(file_path)
+    return file_path, context, error
+
+
 class ImporterService:
     """
     Liest Daten aus einem vorhandenen DOCX-Berichtsheft und wandelt sie in ein strukturiertes Format um.
     """
-    def _extract_from_regex(self, text: str, pattern: str) -> Optional[str]:
-        """Hilfsfunktion, um einen Wert mit Regex aus einem Text zu extrahieren."""
-        match = re.search(pattern, text, re.IGNORECASE) # Ignoriert Groß/Kleinschreibung
-        return match.group(1).strip() if match else None
+    def __init__(self, data_manager: Optional["DataManager"] = None):
+        """
+        Args:
+            data_manager: Optional für den Abgleich mit den Fingerabdrücken bereits importierter Dateien.
+        """
+        self.data_manager = data_manager
 
-    def parse_docx(self, file_path: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    def importiere_dateien(self, file_paths: Iterable[str], cancel_event: Optional[threading.Event] = None,
+                           max_workers: Optional[int] = None,
+                           journal: Optional[Dict[str, Dict[str, Any]]] = None,
+                           archive: Optional[import_quellen.ArchivCache] = None) -> Iterator[DateiErgebnis]:
+        """
+        Analysiert nur neue oder geänderte Dateien; für alle anderen wird das gespeicherte
+        Ergebnis des letzten Imports verwendet.
+
+        Eine Datei gilt als unverändert, wenn Größe und Änderungszeit übereinstimmen oder,
+        falls nicht, ihr Inhalts-Hash. Wurde ihr Bericht inzwischen gelöscht, wird das
+        gespeicherte Ergebnis erneut geliefert, ohne die Datei zu analysieren.
+
+        Args:
+            file_paths: Die Pfade der DOCX-Dateien (auch als Generator).
+            cancel_event: Optionales Event zum Abbrechen.
+            max_workers: Anzahl der Worker-Prozesse für die Analyse.
+            journal: Optional die Journal-Einträge eines unterbrochenen Imports (Pfad -> Zeile);
+                     diese Dateien werden weder geprüft noch analysiert.
+            archive: Der Archiv-Cache des Importlaufs für Einträge in ZIP-Archiven.
+
+        Yields:
+            Ein DateiErgebnis pro Datei, in der Reihenfolge der Fertigstellung.
+        """
+        journal = journal or {}
+        bekannte = self.data_manager.lade_import_fingerabdruecke() if self.data_manager else {}
+        bericht_ids = self.data_manager.lade_bericht_ids() if self.data_manager else set()
+        neue_fingerabdruecke: Dict[str, Dict[str, Any]] = {}
+        aus_cache: Deque[DateiErgebnis] = deque()
+
+        def zu_analysieren() -> Iterator[str]:
+            for pfad in file_paths:
+                if pfad in journal:
+                    aus_cache.append(DateiErgebnis.aus_journal_eintrag(journal[pfad]))
+                    continue
+                try:
+                    ergebnis = self._pruefe_fingerabdruck(pfad, bekannte, bericht_ids, archive)
+                except (OSError, KeyError, zipfile.BadZipFile) as e:
+                    aus_cache.append(DateiErgebnis(pfad, None, f"Datei nicht lesbar: {e}"))
+                    continue
+                if isinstance(ergebnis, DateiErgebnis):
+                    aus_cache.append(ergebnis)
+                else:
+                    neue_fingerabdruecke[pfad] = ergebnis
+                    yield pfad
+
+        for pfad, context, fehler in self.parse_parallel(zu_analysieren(), cancel_event, max_workers, archive):
+            while aus_cache:
+                yield aus_cache.popleft()
+            fingerabdruck = neue_fingerabdruecke.pop(pfad)
+            fingerabdruck.update(
+                bericht_id=f"{context['jahr']}-{int(context['kalenderwoche']):02d}" if context else None,
+                ergebnis=json.dumps(context, ensure_ascii=False) if context else None,
+                fehler=fehler,
+            )
+            yield DateiErgebnis(pfad, context, fehler, fingerabdruck)
+        while aus_cache:
+            yield aus_cache.popleft()
+
+    @staticmethod
+    def _pruefe_fingerabdruck(pfad: str, bekannte: Dict[str, Dict[str, Any]],
+                              bericht_ids: Set[str], archive: Optional[import_quellen.ArchivCache] = None) -> Any:
+        """
+        Vergleicht eine Datei mit ihrem gespeicherten Fingerabdruck.
+
+        Returns:
+            Ein DateiErgebnis aus dem gespeicherten Ergebnis oder, wenn die Datei analysiert
+            werden muss, den neuen (noch unvollständigen) Fingerabdruck.
+
+        Raises:
+            OSError, KeyError, zipfile.BadZipFile: Wenn die Quelle nicht gelesen werden kann.
+        """
+        schluessel = import_quellen.normalisiere(pfad)
+        groesse, mtime, inhalt_schluessel = import_quellen.fingerabdruck(pfad, archive)
+        alt = bekannte.get(schluessel)
+        if alt is not None and alt["parser_version"] != PARSER_VERSION:
+            alt = None
+        gleiche_datei = alt is not None and alt["groesse"] == groesse and alt["mtime"] == mtime
+        if gleiche_datei:
+            inhalt_hash = alt["inhalt_hash"]
+        else:
+            # Für Archiveinträge genügt die CRC32 aus dem Archiv, ohne den Inhalt zu entpacken.
+            inhalt_hash = inhalt_schluessel or _datei_hash(pfad)
+        neu = {"pfad": schluessel, "groesse": groesse, "mtime": mtime,
+               "inhalt_hash": inhalt_hash, "parser_version": PARSER_VERSION}
+        if alt is None or alt["inhalt_hash"] != inhalt_hash:
+            return neu
+
+        # Inhalt unverändert: gespeichertes Ergebnis verwenden
+        context = json.loads(alt["ergebnis"]) if alt["ergebnis"] else None
+        fingerabdruck = None if gleiche_datei else dict(
+            neu, bericht_id=alt["bericht_id"], ergebnis=alt["ergebnis"], fehler=alt["fehler"])
+        unveraendert = context is None or alt["bericht_id"] in bericht_ids
+        return DateiErgebnis(pfad, context, alt["fehler"], fingerabdruck, unveraendert)
+
+    def parse_parallel(self, file_paths: Iterable[str], cancel_event: Optional[threading.Event] = None,
+                       max_workers: Optional[int] = None,
+                       archive: Optional[import_quellen.ArchivCache] = None) -> Iterator[ParseErgebnis]:
+        """
+        Analysiert mehrere DOCX-Dateien parallel in Worker-Prozessen und liefert die
+        Ergebnisse in der Reihenfolge, in der sie fertig werden.
+        Es werden nur so viele Dateien auf einmal eingereicht, wie Worker beschäftigt
+        werden können; `file_paths` darf daher auch ein Generator sein.
+
+        Args:
+            file_paths: Die Pfade der DOCX-Dateien.
+            cancel_event: Optionales Event; ist es gesetzt, werden keine weiteren Dateien gestartet.
+            max_workers: Anzahl der Worker-Prozesse (Standard: Anzahl der CPU-Kerne).
+            archive: Der Archiv-Cache für Dateien, die im aufrufenden Thread analysiert werden.
+
+        Yields:
+            Tupel (Pfad, Kontext, Fehlermeldung) wie bei `parse_docx`.
+        """
+        pfade = iter(file_paths)
+        erste = list(itertools.islice(pfade, _MIN_DATEIEN_PARALLEL))
+        if len(erste) < _MIN_DATEIEN_PARALLEL:
+            yield from self._parse_sequenziell(erste, cancel_event, archive)
+            return
+        pfade = itertools.chain(erste, pfade)
+
+        worker = max_workers or os.cpu_count() or 1
+        try:
+            executor = ProcessPoolExecutor(max_workers=worker)
+        except (OSError, NotImplementedError) as e:
+            logger.warning(f"Worker-Prozesse nicht verfügbar, analysiere Dateien nacheinander: {e}")
+            yield from self._parse_sequenziell(pfade, cancel_event, archive)
+            return
+
+        laufend: Dict[Future, str] = {}
+        try:
+            while True:
+                while len(laufend) < worker * _AUFTRAEGE_PRO_WORKER and not (cancel_event and cancel_event.is_set()):
+                    pfad = next(pfade, None)
+                    if pfad is None:
+                        break
+                    laufend[executor.submit(_parse_datei, pfad)] = pfad
+                if not laufend:
+                    break
+                fertig, _ = wait(laufend, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in fertig:
+                    pfad = laufend.pop(future)
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        # z.B. ein abgestürzter Worker-Prozess (BrokenProcessPool)
+                        logger.error(f"Fehler beim Analysieren der Datei '{os.path.basename(pfad)}': {e}", exc_info=True)
+                        yield pfad, None, f"Allgemeiner Fehler: {e}"
+                if cancel_event and cancel_event.is_set():
+                    logger.info(f"Import abgebrochen, {len(laufend)} laufende Analysen werden verworfen.")
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _parse_sequenziell(self, file_paths: Iterable[str], cancel_event: Optional[threading.Event],
+                           archive: Optional[import_quellen.ArchivCache] = None) -> Iterator[ParseErgebnis]:
+        """Analysiert die Dateien nacheinander im aufrufenden Thread."""
+        for pfad in file_paths:
+            if cancel_event and cancel_event.is_set():
+                return
+            context, error = self.parse_docx(pfad, archive)
+            yield pfad, context, error
+
+    def parse_docx(self, file_path: str,
+                   archive: Optional[import_quellen.ArchivCache] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """
         Analysiert eine einzelne DOCX-Datei und extrahiert die Berichtsdaten.
+        Absätze und Tabellen werden direkt aus dem XML gestreamt; nur wenn das fehlschlägt,
+        wird das Dokument mit python-docx geöffnet.
 
         Args:
-            file_path: Der Pfad zur DOCX-Datei.
+            file_path: Der Pfad zur DOCX-Datei oder zu einem Eintrag in einem ZIP-Archiv
+                       (siehe services.import_quellen).
+            archive: Optional der Archiv-Cache des Importlaufs.
 
         Returns:
             Ein Tupel (context, error_message). Bei Erfolg ist error_message None.
@@ -39,79 +484,201 @@ class ImporterService:
             return None, "Temporäre Datei übersprungen."
             
         try:
-            doc = Document(file_path)
-            full_text = "\n".join([p.text for p in doc.paragraphs])
-
-            context: Dict[str, Any] = {}
-
-            # Robustere Regex-Muster, die mehr Variationen zulassen
-            context["fortlaufende_nr"] = self._extract_from_regex(full_text, r"Ausbildungsnachweis\s*Nr\.?\s*(\d+)")
-            context["name_azubi"] = self._extract_from_regex(full_text, r"Azubi:\s*(.*?);")
-            zeitraum_von_str = self._extract_from_regex(full_text, r"Zeitraum:\s*(\d{2}\.\d{2}\.\d{4})")
-            
-            if not context["fortlaufende_nr"]:
-                return None, "Konnte 'Berichtsnummer' nicht finden."
-            if not context["name_azubi"]:
-                return None, "Konnte 'Name des Azubis' nicht finden."
-            if not zeitraum_von_str:
-                return None, "Konnte 'Zeitraum' nicht finden."
-
-            start_datum = datetime.strptime(zeitraum_von_str, "%d.%m.%Y").date()
-            jahr, kw, _ = start_datum.isocalendar()
-            context["jahr"] = str(jahr)
-            context["kalenderwoche"] = str(kw)
-            context["fortlaufende_nr"] = int(context["fortlaufende_nr"])
-
-            tage_daten: List[Dict[str, str]] = []
-            
-            # Verbesserte Logik zur Erkennung von Tagesabschnitten
-            # Wir suchen nach einem Wochentag am Anfang eines Paragraphen
-            day_pattern = re.compile(r"^\s*(" + "|".join(config.DAYS_IN_WEEK) + r")\s*;", re.IGNORECASE)
-            
-            current_day_data = {}
-            for para in doc.paragraphs:
-                match = day_pattern.match(para.text)
-                if match:
-                    # Wenn ein neuer Tag gefunden wird, den vorherigen speichern
-                    if current_day_data:
-                        tage_daten.append(current_day_data)
-                    
-                    # Neuen Tag initialisieren
-                    current_day_data = {
-                        "tag_name": match.group(1).capitalize(),
-                        "typ": self._extract_from_regex(para.text, r"Typ:\s*(\w+)") or "Betrieb",
-                        "stunden": self._extract_from_regex(para.text, r"Gesamtstunden:\s*([\d:]+)") or "0:00",
-                        "taetigkeiten": ""
-                    }
-                elif current_day_data:
-                    # Text zum aktuellen Tag hinzufügen
-                    if para.text.strip():
-                        # Behält Zeilenumbrüche bei
-                        if current_day_data["taetigkeiten"]:
-                            current_day_data["taetigkeiten"] += "\n"
-                        current_day_data["taetigkeiten"] += para.text.strip()
-            
-            # Letzten erfassten Tag hinzufügen
-            if current_day_data:
-                tage_daten.append(current_day_data)
-
-            # Sortieren und mit leeren Tagen auffüllen
-            sorted_tage = {tag_data['tag_name']: tag_data for tag_data in tage_daten}
-            final_tage_daten = []
-            for day_name in config.DAYS_IN_WEEK:
-                final_tage_daten.append(sorted_tage.get(day_name, {
-                    "typ": "-", "stunden": "0:00", "taetigkeiten": "-"
-                }))
-
-            context["tage_daten"] = final_tage_daten
-            
-            if not any(day['taetigkeiten'] and day['taetigkeiten'] != '-' for day in context["tage_daten"]):
-                 return None, "Keine Tätigkeiten im Bericht gefunden."
-
-            logger.info(f"Datei '{os.path.basename(file_path)}' erfolgreich analysiert.")
-            return context, None
+            try:
+                context, error = self.analysiere_bloecke(docx_stream.iteriere_bloecke(import_quellen.oeffne(file_path, archive)))
+            except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError) as e:
+                logger.debug(f"Schnelles Einlesen von '{os.path.basename(file_path)}' fehlgeschlagen ({e}), "
+                             f"verwende python-docx.")
+                doc = Document(import_quellen.oeffne(file_path, archive))
+                context, error = self.analysiere_bloecke(
+                    element for element in doc.element.body
+                    if element.tag in (docx_stream.W_P, docx_stream.W_TBL))
+            if context:
+                logger.info(f"Datei '{os.path.basename(file_path)}' erfolgreich analysiert.")
+            return context, error
 
         except Exception as e:
             logger.error(f"Fehler beim Analysieren der Datei '{os.path.basename(file_path)}': {e}", exc_info=True)
             return None, f"Allgemeiner Fehler: {e}"
-        
\ No newline at end of file
+
+    def analysiere_bloecke(self, bloecke: Iterable[etree._Element]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Wählt die passende Auswertung für die Absätze und Tabellen eines Dokuments.
+        Zuerst wird das Absatzformat dieser Anwendung ausgewertet; die Absätze werden dabei
+        direkt weitergereicht. Schlägt das fehl und enthält das Dokument eine Tabelle mit
+        Wochentagen, wird es als Tabellenvorlage ausgewertet (`analysiere_tabellen`).
+
+        Args:
+            bloecke: Die <w:p>- und <w:tbl>-Elemente des Dokumentkörpers in Dokumentreihenfolge.
+
+        Returns:
+            Ein Tupel (context, error_message). Bei Erfolg ist error_message None.
+        """
+        # Alle Blöcke als Zeilen von Zelltexten; ein Absatz ist eine Zeile mit einer Zelle.
+        zeilen: List[List[str]] = []
+
+        def absaetze() -> Iterator[str]:
+            for element in bloecke:
+                if element.tag == docx_stream.W_P:
+                    text = docx_stream.absatz_text(element)
+                    zeilen.append([text])
+                    yield text
+                else:
+                    zeilen.extend(docx_stream.tabellen_zeilen(element))
+
+        context, error = self.analysiere_absaetze(absaetze())
+        if context is None and any(len(zeile) > 1 and _tag_spalte(zeile) is not None for zeile in zeilen):
+            logger.debug("Absatzformat nicht erkannt, werte das Dokument als Tabellenvorlage aus.")
+            return self.analysiere_tabellen(zeilen)
+        return context, error
+
+    def analysiere_absaetze(self, absaetze: Iterable[str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Wertet die Absatztexte eines Berichts in einem einzigen Durchlauf aus.
+        Kopfangaben werden gesucht, bis alle gefunden sind; ein Absatz, der mit einem
+        Wochentag und ";" beginnt, startet einen neuen Tag, alle folgenden Absätze
+        sind dessen Tätigkeiten.
+
+        Args:
+            absaetze: Die Absatztexte in Dokumentreihenfolge.
+
+        Returns:
+            Ein Tupel (context, error_message). Bei Erfolg ist error_message None.
+        """
+        kopf: Dict[str, str] = {}
+        tage_daten: List[Dict[str, str]] = []
+        current_day_data: Dict[str, str] = {}
+
+        for text in absaetze:
+            if len(kopf) < len(_KOPF_GRUPPEN):
+                for treffer in _KOPF_MUSTER.finditer(text):
+                    kopf.setdefault(treffer.lastgroup, treffer.group(treffer.lastgroup).strip())
+
+            match = _TAG_MUSTER.match(text)
+            if match:
+                # Wenn ein neuer Tag gefunden wird, den vorherigen speichern
+                if current_day_data:
+                    tage_daten.append(current_day_data)
+                typ = _TYP_MUSTER.search(text)
+                stunden = _STUNDEN_MUSTER.search(text)
+                current_day_data = {
+                    "tag_name": match.group(1).capitalize(),
+                    "typ": typ.group(1).strip() if typ else "Betrieb",
+                    "stunden": stunden.group(1).strip() if stunden else "0:00",
+                    "taetigkeiten": ""
+                }
+            elif current_day_data and text.strip():
+                # Text zum aktuellen Tag hinzufügen; Zeilenumbrüche bleiben erhalten
+                if current_day_data["taetigkeiten"]:
+                    current_day_data["taetigkeiten"] += "\n"
+                current_day_data["taetigkeiten"] += text.strip()
+
+        # Letzten erfassten Tag hinzufügen
+        if current_day_data:
+            tage_daten.append(current_day_data)
+
+        return self._erstelle_context(kopf, tage_daten)
+
+    def analysiere_tabellen(self, zeilen: List[List[str]]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Wertet ein Berichtsheft im Tabellenformat aus, wie es z.B. die IHK-Vorlagen verwenden:
+        eine Zeile je Wochentag (Fortsetzungszeilen mit leerer Tageszelle gehören zum selben
+        Tag) mit Spalten für Tätigkeiten und Stunden. Die Spalten werden über ihre
+        Überschriften erkannt, sonst über ihren Inhalt. Stunden mehrerer Zeilen eines Tages
+        werden addiert. Kopfangaben werden in allen übrigen Absätzen und Zellen gesucht.
+
+        Args:
+            zeilen: Alle Absätze (als Zeilen mit einer Zelle) und Tabellenzeilen des Dokuments.
+
+        Returns:
+            Ein Tupel (context, error_message). Bei Erfolg ist error_message None.
+        """
+        kopf: Dict[str, str] = {}
+        kopf_texte: List[str] = []
+        tag_zeilen: List[Tuple[str, List[str]]] = []
+        ueberschrift: List[str] = []
+        tag_index: Optional[int] = None
+        aktueller_tag: Optional[str] = None
+
+        for zeile in zeilen:
+            index = _tag_spalte(zeile) if len(zeile) > 1 else None
+            if index is not None and (tag_index is None or index == tag_index):
+                tag_index = index
+                treffer = _TABELLEN_TAG_MUSTER.match(zeile[index])
+                aktueller_tag = _TAGE_NACH_KUERZEL[treffer.group(1)[:2].lower()]
+                tag_zeilen.append((aktueller_tag, zeile))
+            elif aktueller_tag and tag_index is not None and len(zeile) > tag_index and not zeile[tag_index]:
+                tag_zeilen.append((aktueller_tag, zeile))  # Fortsetzung des Tages
+            else:
+                aktueller_tag = None
+                if tag_index is None and len(zeile) > 1:
+                    ueberschrift = zeile
+                kopf_texte.extend(_beschriftete_texte(zeile))
+
+        for text in kopf_texte:
+            if len(kopf) == len(_KOPF_GRUPPEN):
+                break
+            for treffer in _TABELLEN_KOPF_MUSTER.finditer(text):
+                kopf.setdefault(treffer.lastgroup, treffer.group(treffer.lastgroup).strip())
+        if "von" not in kopf:
+            # Ohne Beschriftung: das erste Datum im Kopf oder in der Tageszelle des ersten Tages
+            for text in kopf_texte + [zeile[tag_index] for _, zeile in tag_zeilen[:1]]:
+                datum = _DATUM_MUSTER.search(text)
+                if datum:
+                    kopf["von"] = datum.group(1)
+                    break
+
+        spalten = _tabellen_spalten(ueberschrift, [zeile for _, zeile in tag_zeilen], tag_index)
+        tage: Dict[str, Dict[str, Any]] = {}
+        for tag_name, zeile in tag_zeilen:
+            tag = tage.setdefault(tag_name, {"tag_name": tag_name, "typ": "", "minuten": 0, "texte": []})
+            text = _zelle(zeile, spalten["taetigkeiten"])
+            if text:
+                tag["texte"].append(text)
+            minuten = _minuten(_zelle(zeile, spalten["stunden"]))
+            if minuten:
+                tag["minuten"] += minuten
+            typ = _zelle(zeile, spalten["typ"])
+            if typ and not tag["typ"]:
+                tag["typ"] = _typ_aus_text(typ) or typ.split()[0].capitalize()
+
+        tage_daten = [{
+            "tag_name": tag["tag_name"],
+            "typ": tag["typ"] or _typ_aus_text("\n".join(tag["texte"])) or "Betrieb",
+            "stunden": f"{tag['minuten'] // 60:02d}:{tag['minuten'] % 60:02d}",
+            "taetigkeiten": "\n".join(tag["texte"]),
+        } for tag in tage.values()]
+        return self._erstelle_context(kopf, tage_daten)
+
+    @staticmethod
+    def _erstelle_context(kopf: Dict[str, str], tage_daten: List[Dict[str, str]]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Prüft die Kopfangaben und baut daraus und aus den Tagen den Kontext eines Berichts."""
+        if not kopf.get("nr"):
+            return None, "Konnte 'Berichtsnummer' nicht finden."
+        if not kopf.get("name"):
+            return None, "Konnte 'Name des Azubis' nicht finden."
+        if not kopf.get("von"):
+            return None, "Konnte 'Zeitraum' nicht finden."
+
+        context: Dict[str, Any] = {"fortlaufende_nr": int(kopf["nr"]), "name_azubi": kopf["name"]}
+        try:
+            start_datum = datetime.strptime(kopf["von"], "%d.%m.%Y").date()
+        except ValueError:
+            try:
+                start_datum = datetime.strptime(kopf["von"], "%d.%m.%y").date()
+            except ValueError:
+                return None, f"Ungültiges Datum im Zeitraum: '{kopf['von']}'."
+        jahr, kw, _ = start_datum.isocalendar()
+        context["jahr"] = str(jahr)
+        context["kalenderwoche"] = str(kw)
+
+        # Sortieren und mit leeren Tagen auffüllen
+        sorted_tage = {tag_data['tag_name']: tag_data for tag_data in tage_daten}
+        context["tage_daten"] = [
+            sorted_tage.get(day_name, {"typ": "-", "stunden": "0:00", "taetigkeiten": "-"})
+            for day_name in config.DAYS_IN_WEEK
+        ]
+
+        if not any(day['taetigkeiten'] and day['taetigkeiten'] != '-' for day in context["tage_daten"]):
+            return None, "Keine Tätigkeiten im Bericht gefunden."
+        return context, None
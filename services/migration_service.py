@@ -0,0 +1,319 @@
+# services/migration_service.py
+# -*- coding: utf-8 -*-
+"""
+Übernimmt die Daten der alten JSON-Dateien (vor der SQLite-Datenbank) in die Datenbank.
+
+Die Dateien werden nicht mit `json.load` am Stück geladen, sondern Element für Element
+gestreamt. Berichte werden in Batches über `DataManager.importiere_berichte` geschrieben;
+der Fortschritt (Byte-Position in der Datei) wird in derselben Transaktion in der
+Konfiguration gespeichert. Eine abgebrochene Migration setzt daher beim nächsten Start
+genau nach dem letzten gespeicherten Batch fort, und eine abgeschlossene wird nicht
+wiederholt, solange sich die Datei nicht ändert.
+"""
+import codecs
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from core import config
+from core.data_manager import DataManager
+
+logger = logging.getLogger(__name__)
+
+# Konfigurationsschlüssel für den Fortschritt pro Datei
+FORTSCHRITT_SCHLUESSEL = "json_migration"
+_BATCH_GROESSE = 200
+_LESEBLOCK = 1 << 16
+_LEERZEICHEN = " \t\n\r\ufeff"  # inkl. Byte Order Mark
+_BERICHT_ID_MUSTER = re.compile(r"^(\d{4})-(\d{1,2})$")
+
+# Callback (Dateiname, Anteil 0..1, Anzahl übernommener Einträge)
+MigrationsCallback = Callable[[str, float, int], None]
+
+
+class _JsonStrom:
+    """Liest JSON-Werte aus einer Binärdatei und führt die Byte-Position mit."""
+
+    def __init__(self, datei: Any, basis: int):
+        self.datei = datei
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json_decoder = json.JSONDecoder()
+        self.puffer = ""
+        self.pos = 0
+        self.basis = basis  # Byte-Position von puffer[0]
+        self.eof = False
+
+    def nachladen(self) -> bool:
+        """Liest den nächsten Block; gibt False zurück, wenn das Dateiende erreicht ist."""
+        if self.eof:
+            return False
+        daten = self.datei.read(_LESEBLOCK)
+        self.eof = not daten
+        self.puffer += self.decoder.decode(daten, final=self.eof)
+        return not self.eof
+
+    def zeichen(self) -> Optional[str]:
+        """Überspringt Leerraum und gibt das nächste Zeichen zurück (None am Dateiende)."""
+        while True:
+            while self.pos < len(self.puffer) and self.puffer[self.pos] in _LEERZEICHEN:
+                self.pos += 1
+            if self.pos < len(self.puffer):
+                return self.puffer[self.pos]
+            if not self.nachladen():
+                return None
+
+    def erwarte(self, erwartet: str) -> None:
+        """Liest ein bestimmtes Trennzeichen."""
+        gefunden = self.zeichen()
+        if gefunden != erwartet:
+            raise ValueError(f"'{erwartet}' erwartet, '{gefunden}' gefunden (Byte {self.position()}).")
+        self.pos += 1
+
+    def wert(self) -> Any:
+        """Liest einen vollständigen JSON-Wert; lädt nach, solange er unvollständig ist."""
+        self.zeichen()
+        while True:
+            try:
+                wert, ende = self.json_decoder.raw_decode(self.puffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.nachladen():
+                    raise
+                continue
+            # Eine Zahl am Pufferende könnte abgeschnitten sein
+            if ende == len(self.puffer) and self.nachladen():
+                continue
+            self.pos = ende
+            return wert
+
+    def position(self) -> int:
+        """Gibt die Byte-Position des nächsten ungelesenen Zeichens zurück und verwirft Gelesenes."""
+        self.basis += len(self.puffer[:self.pos].encode("utf-8"))
+        self.puffer = self.puffer[self.pos:]
+        self.pos = 0
+        return self.basis
+
+
+def iteriere_json(pfad: str, start: int = 0) -> Iterator[Tuple[Optional[str], Any, int]]:
+    """
+    Liefert die Elemente eines JSON-Objekts oder -Arrays auf oberster Ebene einzeln.
+
+    Args:
+        pfad: Die JSON-Datei (UTF-8).
+        start: Byte-Position, an der fortgesetzt wird (eine zuvor gelieferte Position).
+
+    Yields:
+        Tupel (Schlüssel oder None bei Arrays, Wert, Byte-Position nach dem Element).
+
+    Raises:
+        OSError: Wenn die Datei nicht gelesen werden kann.
+        ValueError: Wenn die Datei kein gültiges JSON-Objekt oder -Array ist.
+    """
+    with open(pfad, "rb") as datei:
+        strom = _JsonStrom(datei, 0)
+        oeffnend = strom.zeichen()
+        if oeffnend not in ("{", "["):
+            raise ValueError("JSON-Objekt oder -Array erwartet.")
+        ist_objekt = oeffnend == "{"
+        schliessend = "}" if ist_objekt else "]"
+        strom.pos += 1
+        erstes = start == 0
+        if start:
+            datei.seek(start)
+            strom = _JsonStrom(datei, start)
+
+        while True:
+            naechstes = strom.zeichen()
+            if naechstes is None:
+                raise ValueError("Unerwartetes Dateiende.")
+            if naechstes == schliessend:
+                return
+            if not erstes:
+                strom.erwarte(",")
+            erstes = False
+            schluessel = None
+            if ist_objekt:
+                schluessel = strom.wert()
+                if not isinstance(schluessel, str):
+                    raise ValueError("Schlüssel erwartet.")
+                strom.erwarte(":")
+            wert = strom.wert()
+            yield schluessel, wert, strom.position()
+
+
+def normalisiere_bericht(schluessel: Optional[str], daten: Any) -> Optional[Dict[str, Any]]:
+    """
+    Wandelt einen Bericht aus der alten JSON-Datei in einen Kontext für die Datenbank um.
+    Jahr und Kalenderwoche werden notfalls aus dem Schlüssel ("2024-39") gelesen.
+
+    Returns:
+        Den Kontext oder None, wenn der Eintrag kein verwertbarer Bericht ist.
+    """
+    if not isinstance(daten, dict) or not isinstance(daten.get("tage_daten"), list):
+        return None
+    context = dict(daten)
+    treffer = _BERICHT_ID_MUSTER.match(schluessel or "")
+    if treffer:
+        context.setdefault("jahr", treffer.group(1))
+        context.setdefault("kalenderwoche", treffer.group(2))
+    try:
+        context["jahr"] = int(context["jahr"])
+        context["kalenderwoche"] = int(context["kalenderwoche"])
+        context["fortlaufende_nr"] = int(context.get("fortlaufende_nr") or 0)
+    except (KeyError, TypeError, ValueError):
+        return None
+    context["name_azubi"] = str(context.get("name_azubi") or "")
+    context["tage_daten"] = [tag for tag in context["tage_daten"] if isinstance(tag, dict)]
+    return context
+
+
+class MigrationService:
+    """
+    Migriert die alten Dateien `berichtsheft_konfig.json`, `berichts_daten.json` und
+    `templates.json`. Vorhandene Daten in der Datenbank haben Vorrang: Bei der
+    Konfiguration bleiben vorhandene Schlüssel, Vorlagen werden zusammengeführt, und
+    Berichte, deren Bericht-ID schon gespeichert ist, werden nicht überschrieben.
+    """
+    def __init__(self, data_manager: DataManager, batch_groesse: int = _BATCH_GROESSE):
+        self.data_manager = data_manager
+        self.batch_groesse = batch_groesse
+        self.dateien = {
+            "konfiguration": config.KONFIG_DATEI_OLD,
+            "berichte": config.BERICHTS_DATEI_OLD,
+            "vorlagen": config.VORLAGEN_DATEI_OLD,
+        }
+
+    def offene_dateien(self) -> List[str]:
+        """Gibt die Arten der Dateien zurück, die vorhanden und noch nicht (vollständig) migriert sind."""
+        fortschritt = self._lade_fortschritt()
+        offen = []
+        for art, pfad in self.dateien.items():
+            zustand = self._zustand(art, pfad, fortschritt)
+            if zustand is not None and not zustand["fertig"]:
+                offen.append(art)
+        return offen
+
+    def migriere(self, callback: Optional[MigrationsCallback] = None,
+                 cancel_event: Optional[threading.Event] = None) -> Tuple[bool, str]:
+        """
+        Führt alle offenen Migrationen aus bzw. setzt sie fort.
+
+        Args:
+            callback: Optionaler Fortschritts-Callback (Dateiname, Anteil, Anzahl).
+            cancel_event: Optionales Event; bei Abbruch bleibt der letzte Batch gespeichert.
+
+        Returns:
+            Ein Tupel (Erfolg, Meldung).
+        """
+        fortschritt = self._lade_fortschritt()
+        meldungen = []
+        for art, pfad in self.dateien.items():
+            zustand = self._zustand(art, pfad, fortschritt)
+            if zustand is None or zustand["fertig"]:
+                continue
+            fortschritt[art] = zustand
+            try:
+                if art == "berichte":
+                    erfolg = self._migriere_berichte(pfad, fortschritt, callback, cancel_event)
+                else:
+                    erfolg = self._migriere_klein(art, pfad, fortschritt)
+            except (OSError, ValueError) as e:
+                logger.error(f"Migration von '{pfad}' fehlgeschlagen: {e}", exc_info=True)
+                return False, f"Die Datei '{os.path.basename(pfad)}' konnte nicht übernommen werden: {e}"
+            if cancel_event is not None and cancel_event.is_set():
+                return False, "Migration unterbrochen; sie wird beim nächsten Start fortgesetzt."
+            if not erfolg:
+                return False, f"Die Daten aus '{os.path.basename(pfad)}' konnten nicht gespeichert werden."
+            meldung = f"{os.path.basename(pfad)}: {zustand['anzahl']} Einträge"
+            if zustand.get("vorhanden"):
+                meldung += f" ({zustand['vorhanden']} bereits vorhandene Berichte beibehalten)"
+            meldungen.append(meldung)
+        if not meldungen:
+            return True, "Keine alten Daten zu übernehmen."
+        logger.info(f"JSON-Migration abgeschlossen ({', '.join(meldungen)}).")
+        return True, "Alte Daten übernommen: " + ", ".join(meldungen) + "."
+
+    def _lade_fortschritt(self) -> Dict[str, Dict[str, Any]]:
+        fortschritt = self.data_manager.lade_konfiguration().get(FORTSCHRITT_SCHLUESSEL)
+        return fortschritt if isinstance(fortschritt, dict) else {}
+
+    @staticmethod
+    def _zustand(art: str, pfad: str, fortschritt: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Gibt den gespeicherten Zustand einer Datei zurück; hat sich die Datei seitdem
+        geändert, beginnt die Migration von vorn. None, wenn die Datei nicht existiert.
+        """
+        try:
+            stat = os.stat(pfad)
+        except OSError:
+            return None
+        zustand = fortschritt.get(art)
+        if isinstance(zustand, dict) and zustand.get("groesse") == stat.st_size and zustand.get("mtime") == stat.st_mtime:
+            return zustand
+        return {"groesse": stat.st_size, "mtime": stat.st_mtime, "offset": 0, "anzahl": 0, "fertig": False}
+
+    def _migriere_berichte(self, pfad: str, fortschritt: Dict[str, Dict[str, Any]],
+                           callback: Optional[MigrationsCallback],
+                           cancel_event: Optional[threading.Event]) -> bool:
+        """
+        Streamt die Berichte und schreibt sie in Batches samt Fortschritt. Wochen, die schon
+        in der Datenbank stehen (z.B. in der App bearbeitet), bleiben unverändert.
+        """
+        zustand = fortschritt["berichte"]
+        name = os.path.basename(pfad)
+        batch: Dict[str, Dict[str, Any]] = {}
+        vorhanden = self.data_manager.lade_bericht_ids()
+
+        def speichern() -> bool:
+            erfolg = self.data_manager.importiere_berichte(batch, konfiguration={FORTSCHRITT_SCHLUESSEL: fortschritt})
+            batch.clear()
+            if callback:
+                callback(name, zustand["offset"] / max(zustand["groesse"], 1), zustand["anzahl"])
+            return erfolg
+
+        for schluessel, daten, offset in iteriere_json(pfad, zustand["offset"]):
+            context = normalisiere_bericht(schluessel, daten)
+            bericht_id = f"{context['jahr']}-{context['kalenderwoche']:02d}" if context else None
+            if context is None:
+                logger.warning(f"Eintrag '{schluessel}' in '{name}' ist kein gültiger Bericht und wird übersprungen.")
+            elif bericht_id in vorhanden:
+                logger.info(f"Bericht {bericht_id} ist bereits gespeichert; der alte Stand aus '{name}' wird übersprungen.")
+                zustand["vorhanden"] = zustand.get("vorhanden", 0) + 1
+            else:
+                batch[bericht_id] = context
+                zustand["anzahl"] += 1
+            zustand["offset"] = offset
+            if len(batch) >= self.batch_groesse:
+                if not speichern():
+                    return False
+                if cancel_event is not None and cancel_event.is_set():
+                    logger.info(f"Migration von '{name}' bei Byte {offset} unterbrochen.")
+                    return True
+        zustand["fertig"] = True
+        return speichern()
+
+    def _migriere_klein(self, art: str, pfad: str, fortschritt: Dict[str, Dict[str, Any]]) -> bool:
+        """Übernimmt die (kleine) Konfigurations- oder Vorlagendatei in einem Schritt."""
+        zustand = fortschritt[art]
+        if art == "konfiguration":
+            vorhanden = self.data_manager.lade_konfiguration()
+            neu = {schluessel: wert for schluessel, wert, _ in iteriere_json(pfad)
+                   if schluessel is not None and schluessel not in vorhanden}
+            zustand.update(anzahl=len(neu), fertig=True)
+            return self.data_manager.speichere_konfiguration(dict(neu, **{FORTSCHRITT_SCHLUESSEL: fortschritt}))
+
+        vorlagen = self.data_manager.lade_vorlagen()
+        bekannt = set(vorlagen)
+        for _, wert, _ in iteriere_json(pfad):
+            # Eine Liste von Texten oder ein Objekt mit solchen Listen
+            for text in (wert if isinstance(wert, list) else [wert]):
+                if isinstance(text, str) and text.strip() and text not in bekannt:
+                    vorlagen.append(text)
+                    bekannt.add(text)
+                    zustand["anzahl"] += 1
+        if not self.data_manager.speichere_vorlagen(vorlagen):
+            return False
+        zustand["fertig"] = True
+        return self.data_manager.speichere_konfiguration({FORTSCHRITT_SCHLUESSEL: fortschritt})
@@ -0,0 +1,190 @@
+# services/ordner_ueberwachung.py
+# -*- coding: utf-8 -*-
+"""
+Überwacht einen Ordner (inkl. Unterordnern) auf neue oder geänderte DOCX-Dateien.
+
+Ein Hintergrund-Thread fragt den Ordner in festen Abständen ab. Dabei wird nicht jedes
+Mal der ganze Baum gelesen: Für jedes Verzeichnis ist die Änderungszeit gespeichert, und
+nur Verzeichnisse, deren Änderungszeit sich geändert hat, werden erneut mit `os.scandir`
+gelesen. So werden neue, umbenannte und gelöschte Dateien erkannt. Eine Datei, die an
+Ort und Stelle überschrieben wird, ändert die Änderungszeit ihres Verzeichnisses nicht;
+deshalb werden die bereits gemeldeten Dateien bei jeder Abfrage einzeln geprüft.
+
+Gemeldet wird eine Datei erst, wenn Größe und Änderungszeit über zwei Abfragen gleich
+geblieben sind, damit halb kopierte Dateien nicht importiert werden.
+"""
+import logging
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from services.import_quellen import ist_importierbar
+
+logger = logging.getLogger(__name__)
+
+ABFRAGE_INTERVALL_SEKUNDEN = 5.0
+
+# Größe und Änderungszeit (ns) einer Datei
+Signatur = Tuple[int, int]
+
+
+def _signatur(pfad: str) -> Optional[Signatur]:
+    """Gibt Größe und Änderungszeit einer Datei zurück (None, wenn sie nicht mehr existiert)."""
+    try:
+        stat = os.stat(pfad)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class OrdnerUeberwachung:
+    """
+    Fragt einen Ordner im Hintergrund ab und ruft den Callback mit den Pfaden neuer
+    oder geänderter DOCX-Dateien auf. Der Callback läuft im Überwachungs-Thread.
+    """
+    def __init__(self, ordner: str, callback: Callable[[List[str]], None],
+                 intervall: float = ABFRAGE_INTERVALL_SEKUNDEN):
+        self.ordner = ordner
+        self.callback = callback
+        self.intervall = intervall
+        # Verzeichnis -> Änderungszeit (ns) beim letzten Lesen
+        self._verzeichnisse: Dict[str, int] = {}
+        # Verzeichnis -> darin zuletzt gesehene DOCX-Dateien bzw. Unterverzeichnisse
+        self._dateien_je_ordner: Dict[str, Set[str]] = {}
+        self._unterordner: Dict[str, Set[str]] = {}
+        # Bereits gemeldete Dateien und ihre Signatur
+        self._gemeldet: Dict[str, Signatur] = {}
+        # Neue oder geänderte Dateien, die noch nicht stabil sind
+        self._ausstehend: Dict[str, Signatur] = {}
+        # Nicht lesbare Verzeichnisse werden nur einmal gemeldet
+        self._nicht_lesbar: Set[str] = set()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Startet die Überwachung in einem Daemon-Thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._lauf, name="OrdnerUeberwachung", daemon=True)
+        self._thread.start()
+        logger.info(f"Überwachung von '{self.ordner}' gestartet.")
+
+    def stop(self, timeout: float = 5.0) -> bool:
+        """
+        Beendet die Überwachung und wartet kurz auf das Ende des Threads.
+
+        Returns:
+            False, wenn der Thread (z.B. mitten in einem Import) noch läuft.
+        """
+        self._stop_event.set()
+        beendet = True
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            beendet = not self._thread.is_alive()
+            self._thread = None
+        logger.info(f"Überwachung von '{self.ordner}' beendet.")
+        return beendet
+
+    def _lauf(self) -> None:
+        """Hauptschleife des Überwachungs-Threads."""
+        while not self._stop_event.is_set():
+            try:
+                dateien = self.pruefe()
+                if dateien:
+                    self.callback(dateien)
+            except Exception:
+                logger.error(f"Fehler bei der Überwachung von '{self.ordner}'.", exc_info=True)
+            self._stop_event.wait(self.intervall)
+
+    def pruefe(self) -> List[str]:
+        """
+        Führt eine Abfrage aus.
+
+        Returns:
+            Die Dateien, die seit der letzten Abfrage stabil neu oder geändert sind.
+        """
+        bereit = []
+        for pfad, alt in list(self._ausstehend.items()):
+            neu = _signatur(pfad)
+            if neu is None:
+                del self._ausstehend[pfad]
+            elif neu == alt:
+                del self._ausstehend[pfad]
+                self._gemeldet[pfad] = neu
+                bereit.append(pfad)
+            else:
+                self._ausstehend[pfad] = neu
+
+        # An Ort und Stelle überschriebene Dateien; stabil sind sie frühestens bei der nächsten Abfrage
+        for pfad, gemeldet in list(self._gemeldet.items()):
+            neu = _signatur(pfad)
+            if neu is not None and neu != gemeldet and pfad not in self._ausstehend:
+                self._ausstehend[pfad] = neu
+
+        for verzeichnis in self._geaenderte_verzeichnisse():
+            self._lies_verzeichnis(verzeichnis)
+        return sorted(bereit)
+
+    def _geaenderte_verzeichnisse(self) -> List[str]:
+        """Gibt die Verzeichnisse zurück, die seit dem letzten Lesen geändert wurden."""
+        if not self._verzeichnisse:
+            return [self.ordner]
+        geaendert = []
+        for verzeichnis, mtime in list(self._verzeichnisse.items()):
+            if verzeichnis not in self._verzeichnisse:
+                continue  # bereits mit einem übergeordneten Verzeichnis entfernt
+            try:
+                if os.stat(verzeichnis).st_mtime_ns != mtime:
+                    geaendert.append(verzeichnis)
+            except OSError:
+                self._vergiss_verzeichnis(verzeichnis)
+        return geaendert
+
+    def _lies_verzeichnis(self, verzeichnis: str) -> None:
+        """Liest ein Verzeichnis neu ein; neue Unterverzeichnisse werden sofort mitgelesen."""
+        offen = [verzeichnis]
+        while offen:
+            aktuell = offen.pop()
+            dateien: Set[str] = set()
+            unterordner: Set[str] = set()
+            try:
+                # Änderungszeit vor dem Lesen merken, damit spätere Änderungen nicht verloren gehen
+                mtime = os.stat(aktuell).st_mtime_ns
+                with os.scandir(aktuell) as eintraege:
+                    for eintrag in eintraege:
+                        if eintrag.is_dir(follow_symlinks=False):
+                            unterordner.add(eintrag.path)
+                            if eintrag.path not in self._verzeichnisse:
+                                offen.append(eintrag.path)
+                        elif ist_importierbar(eintrag.name):
+                            dateien.add(eintrag.path)
+                            stat = eintrag.stat()
+                            signatur = (stat.st_size, stat.st_mtime_ns)
+                            if self._gemeldet.get(eintrag.path) != signatur and eintrag.path not in self._ausstehend:
+                                self._ausstehend[eintrag.path] = signatur
+            except OSError as e:
+                if aktuell not in self._nicht_lesbar:
+                    logger.warning(f"Verzeichnis '{aktuell}' kann nicht gelesen werden: {e}")
+                    self._nicht_lesbar.add(aktuell)
+                self._vergiss_verzeichnis(aktuell)
+                continue
+            self._nicht_lesbar.discard(aktuell)
+
+            for entfernt in self._dateien_je_ordner.get(aktuell, set()) - dateien:
+                self._gemeldet.pop(entfernt, None)
+                self._ausstehend.pop(entfernt, None)
+            for entfernt in self._unterordner.get(aktuell, set()) - unterordner:
+                self._vergiss_verzeichnis(entfernt)
+            self._verzeichnisse[aktuell] = mtime
+            self._dateien_je_ordner[aktuell] = dateien
+            self._unterordner[aktuell] = unterordner
+
+    def _vergiss_verzeichnis(self, verzeichnis: str) -> None:
+        """Entfernt ein (gelöschtes) Verzeichnis samt Unterverzeichnissen aus dem Index."""
+        for unterordner in self._unterordner.pop(verzeichnis, set()):
+            self._vergiss_verzeichnis(unterordner)
+        for datei in self._dateien_je_ordner.pop(verzeichnis, set()):
+            self._gemeldet.pop(datei, None)
+            self._ausstehend.pop(datei, None)
+        self._verzeichnisse.pop(verzeichnis, None)
@@ -0,0 +1,126 @@
+# services/zip_schreiber.py
+# -*- coding: utf-8 -*-
+"""
+Schreibt Dateien in ein ZIP-Archiv und komprimiert sie dabei parallel.
+
+Bereits komprimierte Formate (DOCX, PDF, Bilder, ...) werden unverändert gespeichert,
+da ein erneutes Deflate kaum Platz spart. Alle übrigen Dateien werden in Worker-Threads
+mit zlib komprimiert, das während der Kompression den GIL freigibt. Geschrieben wird
+nur im aufrufenden Thread, ein Eintrag nach dem anderen.
+
+zipfile bietet keine öffentliche Schnittstelle, um bereits komprimierte Daten als Eintrag
+zu schreiben (auch nicht, um Einträge ohne erneute Kompression zwischen Archiven zu
+kopieren). Das Schreiben der fertigen Einträge bildet daher `ZipFile.open(zinfo, "w")`
+nach. Fehlt dem ZipFile eines der dafür benötigten Attribute, schreibt der
+ParallelerZipSchreiber alle Dateien regulär mit `ZipFile.write`.
+"""
+import logging
+import os
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Formate, die bereits komprimiert sind und daher mit ZIP_STORED gespeichert werden
+BEREITS_KOMPRIMIERT = frozenset({
+    ".docx", ".xlsx", ".pptx", ".odt", ".ods", ".pdf", ".zip", ".gz",
+    ".png", ".jpg", ".jpeg", ".gif", ".webp",
+})
+# Größere Dateien werden im aufrufenden Thread gestreamt, statt sie im Speicher zu komprimieren.
+MAX_GROESSE_PARALLEL = 32 << 20
+# Aufträge pro Worker, die gleichzeitig im Speicher liegen dürfen
+_AUFTRAEGE_PRO_WORKER = 2
+
+# Attribute von zipfile.ZipFile, die das direkte Schreiben eines Eintrags voraussetzt
+_BENOETIGTE_ATTRIBUTE = ("fp", "start_dir", "filelist", "NameToInfo", "_writecheck", "_didModify")
+
+# Ergebnis eines Workers: (Daten, CRC32, unkomprimierte Größe, komprimiert?)
+_Komprimiert = Tuple[bytes, int, int, bool]
+
+
+def _komprimiere(pfad: str) -> _Komprimiert:
+    """Liest und komprimiert eine Datei; bringt die Kompression nichts, bleiben die Daten roh."""
+    with open(pfad, "rb") as f:
+        daten = f.read()
+    kompressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    komprimiert = kompressor.compress(daten) + kompressor.flush()
+    if len(komprimiert) >= len(daten):
+        return daten, zlib.crc32(daten), len(daten), False
+    return komprimiert, zlib.crc32(daten), len(daten), True
+
+
+class ParallelerZipSchreiber:
+    """
+    Fügt Dateien zu einem zum Schreiben geöffneten ZipFile hinzu.
+    Vor dem Schließen des ZipFile muss `schliesse` aufgerufen werden (oder `with` verwendet werden).
+    """
+    def __init__(self, zipf: zipfile.ZipFile, max_workers: Optional[int] = None):
+        self.zipf = zipf
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ZipSchreiber")
+        self._laufend: Deque[Tuple[zipfile.ZipInfo, Future]] = deque()
+        self.parallel = all(hasattr(zipf, attribut) for attribut in _BENOETIGTE_ATTRIBUTE)
+        if not self.parallel:
+            logger.warning("ZipFile unterstützt das direkte Schreiben nicht, komprimiere ohne Worker.")
+
+    def __enter__(self) -> "ParallelerZipSchreiber":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.schliesse()
+        else:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def schreibe(self, pfad: str, name: str) -> None:
+        """Fügt die Datei `pfad` unter dem Namen `name` zum Archiv hinzu."""
+        zinfo = zipfile.ZipInfo.from_file(pfad, name)
+        if os.path.splitext(name)[1].lower() in BEREITS_KOMPRIMIERT:
+            self.zipf.write(pfad, arcname=name, compress_type=zipfile.ZIP_STORED)
+        elif zinfo.file_size > MAX_GROESSE_PARALLEL or not self.parallel:
+            self.zipf.write(pfad, arcname=name, compress_type=zipfile.ZIP_DEFLATED)
+        else:
+            self._laufend.append((zinfo, self._executor.submit(_komprimiere, pfad)))
+        # Komprimierte Einträge in Auftragsreihenfolge schreiben; bei voller Warteschlange auf den ältesten warten
+        while self._laufend and (self._laufend[0][1].done()
+                                 or len(self._laufend) >= self.max_workers * _AUFTRAEGE_PRO_WORKER):
+            self._schreibe_naechsten()
+
+    def schliesse(self) -> None:
+        """Schreibt alle ausstehenden Einträge und beendet die Worker."""
+        try:
+            while self._laufend:
+                self._schreibe_naechsten()
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _schreibe_naechsten(self) -> None:
+        """Schreibt den ältesten ausstehenden Eintrag, sobald sein Worker fertig ist."""
+        zinfo, future = self._laufend.popleft()
+        daten, crc, groesse, komprimiert = future.result()
+        zinfo.compress_type = zipfile.ZIP_DEFLATED if komprimiert else zipfile.ZIP_STORED
+        self._schreibe_roh(zinfo, daten, crc, groesse)
+
+    def _schreibe_roh(self, zinfo: zipfile.ZipInfo, daten: bytes, crc: int, groesse: int) -> None:
+        """
+        Schreibt einen Eintrag mit bereits komprimierten (oder rohen) Daten so, wie es
+        `ZipFile.open(zinfo, "w")` und das Schließen des Eintrags bei einer seekbaren Datei tun.
+        """
+        zipf = self.zipf
+        zinfo.file_size = groesse
+        zinfo.compress_size = len(daten)
+        zinfo.CRC = crc
+        zinfo.flag_bits = 0
+        zip64 = max(groesse, len(daten)) > zipfile.ZIP64_LIMIT
+        zipf.fp.seek(zipf.start_dir)
+        zinfo.header_offset = zipf.fp.tell()
+        zipf._writecheck(zinfo)
+        zipf._didModify = True
+        zipf.fp.write(zinfo.FileHeader(zip64))
+        zipf.fp.write(daten)
+        zipf.start_dir = zipf.fp.tell()
+        zipf.filelist.append(zinfo)
+        zipf.NameToInfo[zinfo.filename] = zinfo
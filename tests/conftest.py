@@ -0,0 +1,27 @@
+# tests/conftest.py
+# -*- coding: utf-8 -*-
+"""
+Gemeinsame Fixtures der Tests.
+"""
+import pytest
+from typing import Generator
+import sys
+import os
+
+# Fügt das Hauptverzeichnis des Projekts zum Python-Pfad hinzu
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from db.database import Database
+from core.data_manager import DataManager
+
+
+@pytest.fixture
+def db_manager() -> Generator[DataManager, None, None]:
+    """Fixture, das eine saubere In-Memory-DB und einen DataManager für jeden Test bereitstellt."""
+    migrations_root_path = os.path.join(os.path.dirname(__file__), '..', 'migrations')
+    db = Database(":memory:", migrations_root_path)
+    db.connect()
+    db.run_migrations()
+    manager = DataManager(db)
+    yield manager
+    db.close()
@@ -0,0 +1,223 @@
+# tests/test_backup.py
+# -*- coding: utf-8 -*-
+import os
+import sqlite3
+import sys
+import zipfile
+import zlib
+
+import pytest
+
+# Fügt das Hauptverzeichnis des Projekts zum Python-Pfad hinzu
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import config
+from core.data_manager import DataManager
+from db.database import Database
+from services.backup_service import UMFANG_DOKUMENTE, BackupService
+from services.zip_schreiber import ParallelerZipSchreiber
+
+
+def bericht(kw: int, taetigkeit: str = "Aufgabe") -> dict:
+    """Ein minimaler Berichtskontext für die Kalenderwoche `kw` in 2024."""
+    return {
+        "fortlaufende_nr": kw, "name_azubi": "Max Mustermann", "jahr": 2024, "kalenderwoche": kw,
+        "tage_daten": [{"typ": "Betrieb", "stunden": "08:00", "taetigkeiten": f"{taetigkeit} {kw}"}] * 5,
+    }
+
+
+@pytest.fixture
+def umgebung(tmp_path, monkeypatch):
+    """Eine Dateidatenbank und ein Ausgabeordner in einem temporären Basisverzeichnis."""
+    basis = tmp_path / "app"
+    monkeypatch.setattr(config, "BASE_DIR", str(basis))
+    monkeypatch.setattr(config, "DATA_FOLDER", str(basis / "data"))
+    monkeypatch.setattr(config, "OUTPUT_FOLDER", str(basis / "Ausbildungsnachweise"))
+    monkeypatch.setattr(config, "DATABASE_FILE", str(basis / "data" / "berichtsheft.db"))
+    db = Database(config.DATABASE_FILE, os.path.join(os.path.dirname(__file__), '..', 'migrations'))
+    db.connect()
+    db.run_migrations()
+    data_manager = DataManager(db)
+    os.makedirs(os.path.join(config.OUTPUT_FOLDER, "2024"))
+    with open(os.path.join(config.OUTPUT_FOLDER, "2024", "KW01.docx"), "wb") as f:
+        f.write(b"docx")
+    yield data_manager
+    db.close()
+
+
+def test_export_sichert_konsistenten_schnappschuss_ohne_wal(umgebung: DataManager, tmp_path):
+    """Testet, dass die Datenbank per Backup-API gesichert wird und WAL/SHM fehlen."""
+    assert umgebung.aktualisiere_bericht(bericht(1))
+    assert os.path.exists(config.DATABASE_FILE + "-wal")
+    meldungen = []
+
+    zip_path = str(tmp_path / "backup.zip")
+    erfolg, _ = BackupService(umgebung).export_all_data_to_zip(zip_path, meldungen.append)
+
+    assert erfolg
+    with zipfile.ZipFile(zip_path) as zipf:
+        namen = set(zipf.namelist())
+        assert zipf.testzip() is None
+        # DOCX ist bereits komprimiert und wird nur gespeichert, die Datenbank wird komprimiert.
+        assert zipf.getinfo("Ausbildungsnachweise/2024/KW01.docx").compress_type == zipfile.ZIP_STORED
+        assert zipf.getinfo("data/berichtsheft.db").compress_type == zipfile.ZIP_DEFLATED
+        zipf.extract("data/berichtsheft.db", tmp_path / "entpackt")
+    assert namen == {"data/berichtsheft.db", "Ausbildungsnachweise/2024/KW01.docx", "backup_manifest.json"}
+    assert any(meldung.endswith("100 %") for meldung in meldungen)
+    with sqlite3.connect(tmp_path / "entpackt" / "data" / "berichtsheft.db") as kopie:
+        assert kopie.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        assert kopie.execute("SELECT bericht_id FROM berichte").fetchall() == [("2024-01",)]
+
+
+def test_paralleler_zip_schreiber_schreibt_gueltige_eintraege(tmp_path):
+    """Testet, dass die parallel komprimierten Einträge mit Namen, Kompression und CRC lesbar sind."""
+    dateien = {
+        "daten/text.json": b'{"taetigkeiten": "Tests und Dokumentation"}' * 500,
+        "daten/zufall.bin": os.urandom(4096),  # nicht komprimierbar: wird roh gespeichert
+        "berichte/KW01.docx": b"PK docx",
+        "daten/leer.txt": b"",
+    }
+    for name, inhalt in dateien.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_bytes(inhalt)
+
+    zip_path = tmp_path / "archiv.zip"
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+        with ParallelerZipSchreiber(zipf, max_workers=2) as schreiber:
+            assert schreiber.parallel
+            for name in dateien:
+                schreiber.schreibe(str(tmp_path / name), name)
+        zipf.writestr("manifest.json", "{}")
+
+    with zipfile.ZipFile(zip_path) as zipf:
+        assert zipf.testzip() is None
+        assert zipf.namelist() == [*dateien, "manifest.json"]
+        assert {info.filename: info.compress_type for info in zipf.infolist()} == {
+            "daten/text.json": zipfile.ZIP_DEFLATED, "daten/zufall.bin": zipfile.ZIP_STORED,
+            "berichte/KW01.docx": zipfile.ZIP_STORED, "daten/leer.txt": zipfile.ZIP_STORED,
+            "manifest.json": zipfile.ZIP_DEFLATED}
+        for name, inhalt in dateien.items():
+            assert zipf.getinfo(name).CRC == zlib.crc32(inhalt)
+            assert zipf.read(name) == inhalt
+
+
+def test_inkrementelles_backup_und_wiederherstellung_der_kette(umgebung: DataManager, tmp_path):
+    """Testet, dass ein inkrementelles Backup nur Änderungen enthält und mit seiner Basis wiederhergestellt wird."""
+    service = BackupService(umgebung)
+    ausgabe = os.path.join(config.OUTPUT_FOLDER, "2024")
+    with open(os.path.join(ausgabe, "KW02.docx"), "wb") as f:
+        f.write(b"kw2")
+    voll = str(tmp_path / "voll.zip")
+    assert service.export_all_data_to_zip(voll)[0]
+
+    with open(os.path.join(ausgabe, "KW03.docx"), "wb") as f:
+        f.write(b"kw3")
+    os.remove(os.path.join(ausgabe, "KW02.docx"))
+    inkrementell = str(tmp_path / "inkrementell.zip")
+    assert service.export_all_data_to_zip(inkrementell)[0]
+    with zipfile.ZipFile(inkrementell) as zipf:
+        assert set(zipf.namelist()) == {"data/berichtsheft.db", "Ausbildungsnachweise/2024/KW03.docx",
+                                        "backup_manifest.json"}
+
+    # Wiederherstellen des inkrementellen Backups holt KW01 aus der Basis, KW02 bleibt gelöscht.
+    os.remove(os.path.join(ausgabe, "KW01.docx"))
+    erfolg, meldung = service.import_all_data_from_zip(inkrementell)
+    assert erfolg, meldung
+    assert sorted(os.listdir(ausgabe)) == ["KW01.docx", "KW03.docx"]
+
+    # Ohne Basis-Archiv ist die Kette nicht auflösbar; die Daten bleiben unverändert.
+    os.remove(voll)
+    erfolg, meldung = service.import_all_data_from_zip(inkrementell)
+    assert not erfolg and "voll.zip" in meldung
+    assert sorted(os.listdir(ausgabe)) == ["KW01.docx", "KW03.docx"]
+
+
+def test_wechselnde_archivnamen_zerstoeren_keine_kette(umgebung: DataManager, tmp_path):
+    """Testet, dass ein Backup über ein Archiv der Kette vollständig wird und beide Archive wiederherstellbar bleiben."""
+    service = BackupService(umgebung)
+    ausgabe = os.path.join(config.OUTPUT_FOLDER, "2024")
+    archiv_a, archiv_b = str(tmp_path / "A.zip"), str(tmp_path / "B.zip")
+    assert service.export_all_data_to_zip(archiv_a)[0]
+    with open(os.path.join(ausgabe, "KW02.docx"), "wb") as f:
+        f.write(b"kw2")
+    assert service.export_all_data_to_zip(archiv_b)[0]
+    with open(os.path.join(ausgabe, "KW03.docx"), "wb") as f:
+        f.write(b"kw3")
+
+    # A.zip ist die Basis von B.zip und wird daher vollständig neu geschrieben.
+    erfolg, meldung = service.export_all_data_to_zip(archiv_a)
+    assert erfolg and "baut auf" not in meldung
+    with zipfile.ZipFile(archiv_a) as zipf:
+        assert {"Ausbildungsnachweise/2024/KW01.docx", "Ausbildungsnachweise/2024/KW03.docx"} <= set(zipf.namelist())
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    for archiv, erwartet in ((archiv_b, ["KW01.docx", "KW02.docx"]),
+                             (archiv_a, ["KW01.docx", "KW02.docx", "KW03.docx"])):
+        erfolg, meldung = service.import_all_data_from_zip(archiv)
+        assert erfolg, meldung
+        assert sorted(os.listdir(ausgabe)) == erwartet
+
+
+def test_wiederherstellung_prueft_crc_vor_dem_austausch(umgebung: DataManager, tmp_path):
+    """Testet, dass ein beschädigtes Archiv erkannt wird, bevor die aktuellen Daten angetastet werden."""
+    service = BackupService(umgebung)
+    bericht_pfad = os.path.join(config.OUTPUT_FOLDER, "2024", "KW01.docx")
+    with open(bericht_pfad, "wb") as f:
+        f.write(b"INHALT-KW01")
+    zip_path = str(tmp_path / "backup.zip")
+    assert service.export_all_data_to_zip(zip_path, vollstaendig=True)[0]
+
+    # DOCX-Einträge werden unkomprimiert gespeichert; ein geändertes Byte verletzt die CRC.
+    with open(zip_path, "rb") as f:
+        daten = f.read()
+    kaputt = str(tmp_path / "kaputt.zip")
+    with open(kaputt, "wb") as f:
+        f.write(daten.replace(b"INHALT-KW01", b"INHALT-XXXX"))
+    os.remove(bericht_pfad)
+
+    erfolg, meldung = service.import_all_data_from_zip(kaputt)
+    assert not erfolg and "CRC" in meldung
+    assert os.listdir(os.path.dirname(bericht_pfad)) == []
+    assert sorted(os.listdir(tmp_path / "app")) == ["Ausbildungsnachweise", "data"]
+
+    erfolg, meldung = service.import_all_data_from_zip(zip_path)
+    assert erfolg and "Austausch" in meldung
+    with open(bericht_pfad, "rb") as f:
+        assert f.read() == b"INHALT-KW01"
+    assert sorted(os.listdir(tmp_path / "app")) == ["Ausbildungsnachweise", "data"]
+    # Die Datenbank ist nach dem Austausch wieder geöffnet
+    assert umgebung.aktualisiere_bericht(bericht(2))
+
+
+def test_teilweise_wiederherstellung(umgebung: DataManager, tmp_path, monkeypatch):
+    """Testet Inhaltsanzeige, Übernahme einzelner Jahre und das Wiederherstellen nur der Dokumente."""
+    service = BackupService(umgebung)
+    alt = dict(bericht(1), jahr=2023)
+    assert umgebung.importiere_berichte({"2023-01": alt, "2024-01": bericht(1)})
+    zip_path = str(tmp_path / "backup.zip")
+    assert service.export_all_data_to_zip(zip_path)[0]
+
+    inhalt, fehler = service.lies_inhalt(zip_path)
+    assert fehler is None
+    assert (inhalt["datenbank"], inhalt["dokumente"], inhalt["jahre"]) == (True, 1, {2023: 1, 2024: 1})
+
+    # Aktuellen Stand ändern: 2023 gelöscht, 2024 bearbeitet, Dokument gelöscht
+    assert umgebung.loesche_bericht("2023-01")
+    assert umgebung.aktualisiere_bericht(bericht(1, "Neu"))
+    os.remove(os.path.join(config.OUTPUT_FOLDER, "2024", "KW01.docx"))
+
+    gelesen = []
+    original_open = zipfile.ZipFile.open
+    monkeypatch.setattr(zipfile.ZipFile, "open",
+                        lambda self, name, *args, **kwargs: gelesen.append(getattr(name, "filename", name))
+                        or original_open(self, name, *args, **kwargs))
+    assert service.importiere_jahre_aus_zip(zip_path, [2023]) == (True, "1 Bericht(e) aus 2023 übernommen.")
+    assert set(gelesen) == {"backup_manifest.json", "data/berichtsheft.db"}
+    berichte = umgebung.lade_berichte()
+    assert set(berichte) == {"2023-01", "2024-01"}
+    assert berichte["2024-01"]["tage_daten"][0]["taetigkeiten"] == "Neu 1"
+
+    erfolg, _ = service.import_all_data_from_zip(zip_path, umfang=UMFANG_DOKUMENTE)
+    assert erfolg
+    assert os.path.exists(os.path.join(config.OUTPUT_FOLDER, "2024", "KW01.docx"))
+    assert umgebung.lade_berichte()["2024-01"]["tage_daten"][0]["taetigkeiten"] == "Neu 1"
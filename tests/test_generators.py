@@ -0,0 +1,237 @@
+# tests/test_generators.py
+# -*- coding: utf-8 -*-
+import threading
+import pytest
+import sys
+import os
+
+# Fügt das Hauptverzeichnis des Projekts zum Python-Pfad hinzu
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import config
+from generators import registry
+from generators.base_generator import GenerierungAbgebrochen
+from generators.docx_generator import DocxGenerator
+
+
+@pytest.fixture
+def context() -> dict:
+    """Fixture mit einem vollständigen Render-Kontext für eine Woche."""
+    return {
+        "fortlaufende_nr": 7,
+        "name_azubi": "Max Mustermann",
+        "jahr": 2024,
+        "kalenderwoche": 40,
+        "zeitraum_von": "30.09.2024",
+        "zeitraum_bis": "04.10.2024",
+        "ausbildungsjahr": 2,
+        "erstellungsdatum_bericht": "04.10.2024",
+        "tage_daten": [
+            {"typ": "Betrieb", "stunden": "08:00", "taetigkeiten": "Programmieren\nCode-Review"},
+            {"typ": "Schule", "stunden": "06:00", "taetigkeiten": "Lernen"},
+            {"typ": "Urlaub", "stunden": "0:00", "taetigkeiten": "-"},
+        ],
+    }
+
+
+@pytest.fixture
+def output_folder(tmp_path, monkeypatch) -> str:
+    """Leitet den Ausgabeordner in ein temporäres Verzeichnis um."""
+    monkeypatch.setattr(config, "OUTPUT_FOLDER", str(tmp_path))
+    return str(tmp_path)
+
+
+def test_generate_meldet_fortschritt(context: dict, output_folder: str):
+    """Testet, dass alle Schritte in der richtigen Reihenfolge gemeldet werden."""
+    schritte = []
+    DocxGenerator(context).generate("bericht.docx", progress_callback=lambda s, a: schritte.append((s, a)))
+
+    assert [s for s, _ in schritte] == ["Kopfzeile", "Hauptteil", "Fußzeile", "Speichern", "Fertig"]
+    assert schritte[-1][1] == 1.0
+    assert os.path.exists(os.path.join(output_folder, "bericht.docx"))
+
+
+def test_generate_abbruch_schreibt_keine_datei(context: dict, output_folder: str):
+    """Testet, dass ein gesetztes Abbruch-Event die Erstellung vor dem Speichern beendet."""
+    cancel_event = threading.Event()
+    cancel_event.set()
+
+    with pytest.raises(GenerierungAbgebrochen):
+        DocxGenerator(context).generate("bericht.docx", cancel_event=cancel_event)
+    assert not os.path.exists(os.path.join(output_folder, "bericht.docx"))
+
+
+def test_render_to_bytes_ohne_dateisystem(context: dict, output_folder: str):
+    """Testet, dass die In-Memory-Ausgabe ein gültiges DOCX liefert und nichts auf die Platte schreibt."""
+    daten = DocxGenerator(context).render_to_bytes()
+
+    assert daten.startswith(b"PK")
+    assert os.listdir(output_folder) == []
+
+
+def test_registry_laedt_und_registriert_formate(monkeypatch):
+    """Testet die Format-Registry: Standardformate, zusätzliche Formate und unbekannte Formate."""
+    monkeypatch.setattr(registry, "_FORMATE", dict(registry._FORMATE))
+
+    assert registry.lade_generator_klasse("docx") is DocxGenerator
+    registry.registriere_format("txt", DocxGenerator)
+    assert registry.verfuegbare_formate()[-1] == "txt"
+    assert registry.lade_generator_klasse("txt") is DocxGenerator
+    with pytest.raises(ValueError):
+        registry.lade_generator_klasse("odt")
+
+
+def test_pdf_zeilenumbruch_entspricht_fpdf():
+    """Testet, dass der vorberechnete Umbruch mit dem Umbruch von fpdf übereinstimmt."""
+    from generators.pdf_generator import PdfGenerator
+    from generators.pdf_layout import leere_caches, zeilen_umbrechen
+
+    generator = PdfGenerator({})
+    generator._setup_document()
+    pdf = generator.pdf
+    pdf.set_font('Verdana', '', 11)
+    texte = [
+        "• Programmieren",
+        "• " + "Besprechung mit dem Ausbilder über das Lernfeld Netzwerktechnik " * 4,
+        "• " + "Donaudampfschifffahrtsgesellschaftskapitän" * 5,
+        "• Mehrere   Leerzeichen   und Überlänge " + "x" * 120,
+        "• Weiches­Trennzeichen und geschütztes Leerzeichen " * 3,
+    ]
+    leere_caches()
+    for text in texte:
+        erwartet = pdf.multi_cell(0, 6, text, dry_run=True, output="LINES")
+        assert list(zeilen_umbrechen(pdf, text)) == erwartet
+        assert list(zeilen_umbrechen(pdf, text)) == erwartet  # aus dem Cache
+
+
+def test_layout_wird_einmal_aufgebaut_und_geteilt(context: dict):
+    """Testet, dass beide Formate dasselbe zwischengespeicherte Layout-Modell verwenden."""
+    from generators.layout import erstelle_layout, leere_cache
+    from generators.pdf_generator import PdfGenerator
+
+    leere_cache()
+    layout = DocxGenerator(context).layout
+
+    assert PdfGenerator(dict(context)).layout is layout
+    assert len(layout.tage) == len(config.DAYS_IN_WEEK)
+    assert [p.text for p in layout.tage[0].punkte] == ["Programmieren", "Code-Review"]
+    assert [p.text for p in layout.tage[-1].punkte] == ["-"]
+    context["name_azubi"] = "Erika Musterfrau"
+    assert erstelle_layout(context) is not layout
+
+
+def test_vorschau_rendert_nur_geaenderte_abschnitte(context: dict, monkeypatch):
+    """Testet, dass die Vorschau nach einer Änderung an einem Tag nur dessen Abschnitt neu zeichnet."""
+    from generators.layout import erstelle_layout
+    from generators.preview_renderer import VorschauRenderer
+
+    renderer = VorschauRenderer(px_pro_mm=1.0)
+    gezeichnet = []
+    original = renderer._zeichne
+    monkeypatch.setattr(renderer, "_zeichne", lambda zeilen: gezeichnet.append(zeilen) or original(zeilen))
+
+    bild = renderer.rendere(erstelle_layout(context))
+    assert bild.size == (210, 297)
+    assert len(gezeichnet) == len(config.DAYS_IN_WEEK) + 2  # Kopf, Tage, Fußzeile
+
+    gezeichnet.clear()
+    context["tage_daten"][1] = {"typ": "Schule", "stunden": "06:00", "taetigkeiten": "Lernen\nPrüfung"}
+    renderer.rendere(erstelle_layout(context))
+    assert [zeile[1] for zeile in gezeichnet[0]][1:] == ["• Lernen", "• Prüfung"]
+    assert len(gezeichnet) == 1
+
+
+def test_unterschriftsbild_wird_einmal_vorbereitet_und_eingebettet(context: dict):
+    """Testet, dass ein Unterschriftsbild einmal vorbereitet und in DOCX und PDF eingebettet wird."""
+    import io
+    import zipfile
+    from PIL import Image
+    from core.logic import BerichtsheftLogik
+    from generators import bild_cache
+    from generators.pdf_generator import PdfGenerator
+
+    original = io.BytesIO()
+    Image.new("RGBA", (800, 400), (0, 0, 80, 255)).save(original, format="PNG")
+    schluessel = bild_cache.registriere_bild(original.getvalue())
+    bild = bild_cache.lade_bild(schluessel)
+    assert (bild.breite_px, bild.hoehe_px) == (360, 180)
+    assert bild_cache.registriere_bild(original.getvalue()) == schluessel
+
+    hash_ohne_bild = BerichtsheftLogik.berechne_inhalts_hash(context)
+    context["unterschriften"] = {"azubi": schluessel, "ausbilder": schluessel}
+    assert BerichtsheftLogik.berechne_inhalts_hash(context) != hash_ohne_bild
+
+    docx = zipfile.ZipFile(io.BytesIO(DocxGenerator(context).render_to_bytes()))
+    assert [name for name in docx.namelist() if name.startswith("word/media/")] == ["word/media/image1.png"]
+    for _ in range(2):
+        # Beide Unterschriften verwenden dasselbe Bild; es wird einmal eingebettet (Bild und Alphamaske)
+        pdf = PdfGenerator(context).render_to_bytes()
+        assert (pdf.count(b"/Subtype /Image"), pdf.count(b"/SMask")) == (2, 1)
+
+
+def test_docx_vorlage_wird_einmal_kompiliert_und_gefuellt(context: dict, tmp_path, monkeypatch):
+    """Testet Platzhalter über mehrere Runs, wiederholte Tagesblöcke und den Plan-Cache."""
+    import io
+    from docx import Document
+    from generators import docx_template
+
+    vorlage = Document()
+    absatz = vorlage.add_paragraph()
+    absatz.add_run("Nr. {{fortlauf")
+    absatz.add_run("ende_nr}} & {{name_azubi}}")
+    for text in ("{{#tage}}", "{{tag_name}}: {{stunden}}", "{{#punkte}}", "{{punkt}}", "{{/punkte}}", "{{/tage}}"):
+        vorlage.add_paragraph(text)
+    zeile = vorlage.add_table(rows=1, cols=2).rows[0].cells
+    zeile[0].text = "{{#tage}}{{typ}}"
+    zeile[1].text = "{{taetigkeiten}}{{/tage}}"
+    pfad = str(tmp_path / "vorlage.docx")
+    vorlage.save(pfad)
+
+    docx_template.leere_cache()
+    kompiliert = []
+    original = docx_template.kompiliere_vorlage
+    monkeypatch.setattr(docx_template, "kompiliere_vorlage", lambda daten: kompiliert.append(1) or original(daten))
+    context["docx_vorlage"] = {"pfad": pfad, "sha256": docx_template.vorlagen_schluessel(pfad)}
+
+    for _ in range(2):
+        ergebnis = Document(io.BytesIO(docx_template.DocxVorlagenGenerator(context).render_to_bytes()))
+    assert len(kompiliert) == 1
+
+    texte = [p.text for p in ergebnis.paragraphs]
+    assert texte[0] == "Nr. 7 & Max Mustermann"
+    assert texte[1:4] == ["Montag: 08:00", "Programmieren", "Code-Review"]
+    assert len(ergebnis.tables[0].rows) == len(config.DAYS_IN_WEEK)
+    assert [zelle.text for zelle in ergebnis.tables[0].rows[0].cells] == ["Betrieb", "Programmieren\nCode-Review"]
+
+    with pytest.raises(ValueError):
+        kaputt = Document()
+        kaputt.add_paragraph("{{#tage}}")
+        puffer = io.BytesIO()
+        kaputt.save(puffer)
+        docx_template.kompiliere_vorlage(puffer.getvalue())
+
+
+def test_html_archiv_schreibt_nur_geaenderte_seiten(context: dict, tmp_path):
+    """Testet, dass ein erneuter Export nur geänderte Berichte schreibt und entfernte Seiten löscht."""
+    import copy
+    from generators import html_archiv
+
+    def kontexte(*wochen, geaendert=None):
+        for kw in wochen:
+            kopie = copy.deepcopy(context)
+            kopie["kalenderwoche"] = kw
+            if kw == geaendert:
+                kopie["tage_daten"][0]["taetigkeiten"] = "Dokumentation"
+            yield f"2024-{kw:02d}", kopie
+
+    ziel = str(tmp_path)
+    erste = list(kontexte(40, 41, 42))
+    assert html_archiv.schreibe_archiv(erste, ziel) == {"erstellt": 3, "unveraendert": 0, "entfernt": 0}
+    assert not any("html_zurueck" in kontext for _, kontext in erste)  # Kontexte des Aufrufers bleiben unverändert
+    assert html_archiv.schreibe_archiv(kontexte(40, 41, 42), ziel) == {"erstellt": 0, "unveraendert": 3, "entfernt": 0}
+    assert html_archiv.schreibe_archiv(kontexte(40, 41, geaendert=41), ziel) == {"erstellt": 1, "unveraendert": 1, "entfernt": 1}
+
+    assert sorted(os.listdir(tmp_path / "2024")) == ["KW40.html", "KW41.html", "index.html"]
+    assert "Dokumentation" in (tmp_path / "2024" / "KW41.html").read_text(encoding="utf-8")
+    assert 'href="KW42.html"' not in (tmp_path / "2024" / "index.html").read_text(encoding="utf-8")
+    assert "2024/index.html" in (tmp_path / "index.html").read_text(encoding="utf-8")
@@ -0,0 +1,228 @@
+# tests/test_importer.py
+# -*- coding: utf-8 -*-
+import threading
+import pytest
+import sys
+import os
+
+# Fügt das Hauptverzeichnis des Projekts zum Python-Pfad hinzu
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.data_manager import DataManager
+from generators.docx_generator import DocxGenerator
+from services.importer_service import ImporterService
+
+
+def erstelle_bericht(ordner, kw: int, taetigkeit: str = "Aufgabe") -> str:
+    """Erstellt einen Bericht dieser Anwendung als DOCX-Datei und gibt den Pfad zurück."""
+    context = {
+        "fortlaufende_nr": kw,
+        "name_azubi": "Max Mustermann",
+        "zeitraum_von": f"{kw * 7 - 6:02d}.01.2024" if kw <= 4 else "05.02.2024",
+        "zeitraum_bis": "",
+        "ausbildungsjahr": 1,
+        "tage_daten": [{"typ": "Betrieb", "stunden": "08:00", "taetigkeiten": f"{taetigkeit} {kw}\nCode-Review"}] * 5,
+    }
+    pfad = os.path.join(ordner, f"bericht_{kw}.docx")
+    with open(pfad, "wb") as f:
+        DocxGenerator(context).render_to_stream(f)
+    return pfad
+
+
+@pytest.fixture
+def berichte(tmp_path) -> list:
+    """Vier gültige Berichte und eine beschädigte Datei."""
+    pfade = [erstelle_bericht(str(tmp_path), kw) for kw in range(1, 5)]
+    kaputt = tmp_path / "kaputt.docx"
+    kaputt.write_bytes(b"kein docx")
+    return pfade + [str(kaputt)]
+
+
+def test_parse_parallel_liefert_alle_ergebnisse(berichte: list):
+    """Testet, dass die parallele Analyse dieselben Ergebnisse wie die sequenzielle liefert."""
+    service = ImporterService()
+    parallel = {pfad: (context, fehler) for pfad, context, fehler in service.parse_parallel(berichte, max_workers=2)}
+
+    assert set(parallel) == set(berichte)
+    for pfad in berichte:
+        assert parallel[pfad] == service.parse_docx(pfad)
+    assert parallel[berichte[0]][0]["kalenderwoche"] == "1"
+    assert parallel[berichte[-1]][0] is None and parallel[berichte[-1]][1]
+
+
+def test_parse_parallel_bricht_ab(berichte: list):
+    """Testet, dass nach dem Abbruch keine weiteren Dateien gestartet werden."""
+    cancel_event = threading.Event()
+    cancel_event.set()
+
+    assert list(ImporterService().parse_parallel(berichte, cancel_event, max_workers=2)) == []
+
+
+def test_gestreamte_absaetze_entsprechen_python_docx(tmp_path):
+    """Testet, dass der schnelle Leser dieselben Absatztexte liefert wie python-docx."""
+    from docx import Document
+    from docx.enum.text import WD_BREAK
+    from services import docx_stream
+
+    doc = Document()
+    absatz = doc.add_paragraph("Montag;\tTyp: Betrieb")
+    absatz.add_run("Zeile 1").add_break()
+    absatz.add_run("Zeile 2").add_break(WD_BREAK.PAGE)
+    doc.add_table(rows=1, cols=1).rows[0].cells[0].text = "In einer Tabelle"
+    doc.add_paragraph("Nach der Tabelle")
+    pfad = str(tmp_path / "absaetze.docx")
+    doc.save(pfad)
+
+    assert list(docx_stream.lies_absaetze(pfad)) == [p.text for p in Document(pfad).paragraphs]
+
+
+def test_reimport_ueberspringt_unveraenderte_dateien(db_manager: DataManager, tmp_path, monkeypatch):
+    """Testet, dass nur neue oder geänderte Dateien erneut analysiert werden."""
+    from core.controller import AppController
+
+    controller = AppController(db_manager)
+    pfade = [erstelle_bericht(str(tmp_path), kw) for kw in (1, 2)]
+    analysiert = []
+    original = ImporterService.parse_docx
+    monkeypatch.setattr(ImporterService, "parse_docx",
+                        lambda self, pfad, *args: analysiert.append(os.path.basename(pfad))
+                        or original(self, pfad, *args))
+
+    assert controller.import_docx_berichte(pfade)[:4] == (2, 0, 0, True)
+    assert controller.import_docx_berichte(pfade)[:3] == (0, 2, 0)
+    assert len(analysiert) == 2
+
+    erstelle_bericht(str(tmp_path), 2, taetigkeit="Geändert")
+    db_manager.loesche_bericht("2024-01")
+    assert controller.import_docx_berichte(pfade)[:4] == (2, 0, 0, True)
+    assert analysiert == ["bericht_1.docx", "bericht_2.docx", "bericht_2.docx"]
+    assert db_manager.lade_berichte()["2024-02"]["tage_daten"][0]["taetigkeiten"].startswith("Geändert")
+
+
+def test_import_aus_ordnerbaum_und_zip_archiv(db_manager: DataManager, tmp_path):
+    """Testet, dass Ordner rekursiv und ZIP-Archive ohne Entpacken importiert werden."""
+    import zipfile
+    from core.controller import AppController
+    from services import import_quellen
+
+    unterordner = tmp_path / "2024" / "Januar"
+    unterordner.mkdir(parents=True)
+    erstelle_bericht(str(unterordner), 1)
+    archiv_quelle = tmp_path.parent / f"{tmp_path.name}_zip"
+    archiv_quelle.mkdir()
+    with zipfile.ZipFile(tmp_path / "alt.zip", "w") as archiv:
+        for kw in (2, 3):
+            archiv.write(erstelle_bericht(str(archiv_quelle), kw), f"berichte/bericht_{kw}.docx")
+        archiv.writestr("berichte/notizen.txt", "keine Berichte")
+
+    quellen = sorted(import_quellen.iteriere_quellen([str(tmp_path)]))
+    assert [os.path.relpath(q, tmp_path) for q in quellen] == [
+        os.path.join("2024", "Januar", "bericht_1.docx"),
+        "alt.zip!/berichte/bericht_2.docx",
+        "alt.zip!/berichte/bericht_3.docx",
+    ]
+
+    controller = AppController(db_manager)
+    assert controller.import_docx_berichte([str(tmp_path)])[:4] == (3, 0, 0, True)
+    assert set(db_manager.lade_berichte()) == {"2024-01", "2024-02", "2024-03"}
+    assert controller.import_docx_berichte([str(tmp_path)])[:3] == (0, 3, 0)
+
+    # Jeder Importlauf hat seinen eigenen Archiv-Cache; schließt ein Lauf seinen, liest der andere weiter.
+    with import_quellen.ArchivCache() as erster_lauf:
+        assert import_quellen.oeffne(quellen[1], erster_lauf).read(2) == b"PK"
+        with import_quellen.ArchivCache() as zweiter_lauf:
+            assert import_quellen.oeffne(quellen[2], zweiter_lauf).read(2) == b"PK"
+        assert import_quellen.oeffne(quellen[2], erster_lauf).read(2) == b"PK"
+
+
+def test_probelauf_stuft_berichte_ein_und_speichert_nur_freigegebene(db_manager: DataManager, tmp_path):
+    """Testet den Abgleich per Inhalts-Hash und dass nur die freigegebenen Berichte gespeichert werden."""
+    from core.controller import AppController
+    from services.importer_service import IMPORT_GEAENDERT, IMPORT_IDENTISCH, IMPORT_KONFLIKT, IMPORT_NEU
+
+    controller = AppController(db_manager)
+    alt = tmp_path / "alt"
+    alt.mkdir()
+    assert controller.import_docx_berichte([erstelle_bericht(str(alt), kw) for kw in (1, 2)])[3] is True
+
+    neu = tmp_path / "neu"
+    (neu / "zweite").mkdir(parents=True)
+    erstelle_bericht(str(neu), 1)
+    erstelle_bericht(str(neu), 2, taetigkeit="Geändert")
+    erstelle_bericht(str(neu), 3)
+    erstelle_bericht(str(neu), 4)
+    erstelle_bericht(str(neu / "zweite"), 4, taetigkeit="Andere Fassung")
+
+    plan = controller.plane_docx_import([str(neu)])
+    assert plan.status == {"2024-01": IMPORT_IDENTISCH, "2024-02": IMPORT_GEAENDERT,
+                           "2024-03": IMPORT_NEU, "2024-04": IMPORT_KONFLIKT}
+    assert db_manager.lade_bericht_ids() == {"2024-01", "2024-02"}
+
+    assert controller.uebernehme_import_plan(plan, plan.nach_status(IMPORT_NEU)) is True
+    gespeichert = db_manager.lade_berichte()
+    assert set(gespeichert) == {"2024-01", "2024-02", "2024-03"}
+    assert gespeichert["2024-02"]["tage_daten"][0]["taetigkeiten"].startswith("Aufgabe")
+    # Nicht freigegebene Dateien werden beim nächsten Import erneut angeboten
+    assert controller.plane_docx_import([str(neu)]).nach_status(IMPORT_GEAENDERT) == ["2024-02"]
+
+
+def test_unterbrochener_import_wird_aus_dem_journal_fortgesetzt(db_manager: DataManager, tmp_path, monkeypatch):
+    """Testet, dass nach einem Abbruch nur die noch nicht verarbeiteten Dateien analysiert werden."""
+    from core.controller import AppController
+
+    controller = AppController(db_manager)
+    for kw in (1, 2, 3):
+        erstelle_bericht(str(tmp_path), kw)
+    analysiert = []
+    original = ImporterService.parse_docx
+    monkeypatch.setattr(ImporterService, "parse_docx",
+                        lambda self, pfad, *args: analysiert.append(os.path.basename(pfad))
+                        or original(self, pfad, *args))
+
+    abbruch = threading.Event()
+    controller.plane_docx_import([str(tmp_path)], lambda *_: abbruch.set(), abbruch)
+    assert controller.offener_import_auftrag()["anzahl"] == 1
+    assert db_manager.lade_bericht_ids() == set()
+
+    # z.B. nach einem Neustart der Anwendung: neuer Controller, gleiches Journal
+    plan = AppController(db_manager).setze_docx_import_fort()
+    assert len(plan.berichte) == 3
+    assert sorted(analysiert) == ["bericht_1.docx", "bericht_2.docx", "bericht_3.docx"]
+    assert AppController(db_manager).uebernehme_import_plan(plan) is True
+    assert db_manager.lade_bericht_ids() == {"2024-01", "2024-02", "2024-03"}
+    assert controller.offener_import_auftrag() is None
+
+
+def test_tabellenvorlage_wird_erkannt(tmp_path):
+    """Testet den Import eines Berichtshefts im Tabellenformat (z.B. IHK-Vorlage)."""
+    from docx import Document
+
+    doc = Document()
+    doc.add_paragraph("Ausbildungsnachweis Nr. 7")
+    kopf = doc.add_table(rows=3, cols=2)
+    for zeile, werte in enumerate([("Firmenname:", "Muster GmbH"), ("Name, Vorname:", "Erika Musterfrau"),
+                                   ("Ausbildungswoche vom:", "15.01.2024")]):
+        for spalte, wert in enumerate(werte):
+            kopf.cell(zeile, spalte).text = wert
+    doc.add_paragraph()
+    zeilen = [("Tag", "Ausgeführte Arbeiten", "Stunden"), ("Montag", "Server eingerichtet", "5"),
+              ("", "Dokumentation", "3,5"), ("Dienstag", "Berufsschule: Mathe", "8"), ("Freitag", "Review", "7:30")]
+    tabelle = doc.add_table(rows=len(zeilen), cols=3)
+    for zeile, werte in enumerate(zeilen):
+        for spalte, wert in enumerate(werte):
+            tabelle.cell(zeile, spalte).text = wert
+    tabelle.cell(1, 0).merge(tabelle.cell(2, 0))  # Tageszelle über zwei Zeilen
+    pfad = str(tmp_path / "ihk.docx")
+    doc.save(pfad)
+
+    context, fehler = ImporterService().parse_docx(pfad)
+
+    assert fehler is None
+    assert (context["fortlaufende_nr"], context["name_azubi"], context["jahr"], context["kalenderwoche"]) == \
+        (7, "Erika Musterfrau", "2024", "3")
+    montag, dienstag, mittwoch, _, freitag = context["tage_daten"]
+    assert montag == {"tag_name": "Montag", "typ": "Betrieb", "stunden": "08:30",
+                      "taetigkeiten": "Server eingerichtet\nDokumentation"}
+    assert (dienstag["typ"], dienstag["stunden"]) == ("Schule", "08:00")
+    assert mittwoch["taetigkeiten"] == "-"
+    assert freitag["stunden"] == "07:30"
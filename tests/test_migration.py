@@ -0,0 +1,70 @@
+# tests/test_migration.py
+# -*- coding: utf-8 -*-
+import json
+import threading
+import sys
+import os
+
+# Fügt das Hauptverzeichnis des Projekts zum Python-Pfad hinzu
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import config
+from core.data_manager import DataManager
+from services import migration_service
+from services.migration_service import MigrationService
+
+
+def test_json_migration_ist_fortsetzbar(db_manager: DataManager, tmp_path, monkeypatch):
+    """Testet, dass die alten JSON-Dateien gestreamt, in Batches gespeichert und nach Abbruch fortgesetzt werden."""
+    berichte = {
+        f"2023-{kw:02d}": {"fortlaufende_nr": kw, "name_azubi": "Jörg Müller",
+                           "tage_daten": [{"typ": "Betrieb", "stunden": "08:00", "taetigkeiten": f"Übung {kw} – ä€"}] * 5}
+        for kw in range(1, 8)
+    }
+    berichte["kaputt"] = {"name_azubi": "ohne Tage"}
+    for name, daten in (("BERICHTS_DATEI_OLD", berichte),
+                        ("KONFIG_DATEI_OLD", {"name_azubi": "Alt", "ausbildungsbeginn": "01.09.2022"}),
+                        ("VORLAGEN_DATEI_OLD", ["Code-Review", "Besprechung"])):
+        pfad = tmp_path / f"{name}.json"
+        pfad.write_text(json.dumps(daten, ensure_ascii=False, indent=2), encoding="utf-8")
+        monkeypatch.setattr(config, name, str(pfad))
+    # Kleine Leseblöcke, damit Werte und Umlaute über Blockgrenzen hinweg gelesen werden
+    monkeypatch.setattr(migration_service, "_LESEBLOCK", 7)
+    db_manager.speichere_konfiguration({"name_azubi": "Neu"})
+    db_manager.speichere_vorlagen(["Besprechung"])
+
+    abbruch = threading.Event()
+    service = MigrationService(db_manager, batch_groesse=3)
+    assert service.migriere(lambda datei, anteil, anzahl: abbruch.set(), abbruch)[0] is False
+    assert len(db_manager.lade_bericht_ids()) == 3
+    assert service.offene_dateien() == ["berichte", "vorlagen"]
+
+    assert MigrationService(db_manager, batch_groesse=3).migriere()[0] is True
+    gespeichert = db_manager.lade_berichte()
+    assert set(gespeichert) == {f"2023-{kw:02d}" for kw in range(1, 8)}
+    assert gespeichert["2023-07"]["tage_daten"][0]["taetigkeiten"] == "Übung 7 – ä€"
+    konfiguration = db_manager.lade_konfiguration()
+    assert konfiguration["name_azubi"] == "Neu" and konfiguration["ausbildungsbeginn"] == "01.09.2022"
+    assert db_manager.lade_vorlagen() == ["Besprechung", "Code-Review"]
+    assert service.offene_dateien() == []
+
+
+def test_json_migration_ueberschreibt_keine_vorhandenen_berichte(db_manager: DataManager, tmp_path, monkeypatch):
+    """Testet, dass in der App bearbeitete Wochen nicht vom alten Stand aus der JSON-Datei ersetzt werden."""
+    alt = {f"2023-{kw:02d}": {"fortlaufende_nr": kw, "name_azubi": "Jörg Müller",
+                              "tage_daten": [{"typ": "Betrieb", "stunden": "08:00", "taetigkeiten": "ALT aus JSON"}] * 5}
+           for kw in (1, 2)}
+    pfad = tmp_path / "berichts_daten.json"
+    pfad.write_text(json.dumps(alt, ensure_ascii=False), encoding="utf-8")
+    for name in ("BERICHTS_DATEI_OLD", "KONFIG_DATEI_OLD", "VORLAGEN_DATEI_OLD"):
+        monkeypatch.setattr(config, name, str(pfad if name == "BERICHTS_DATEI_OLD" else tmp_path / "fehlt.json"))
+    assert db_manager.aktualisiere_bericht({
+        "fortlaufende_nr": 1, "name_azubi": "Jörg Müller", "jahr": 2023, "kalenderwoche": 1,
+        "tage_daten": [{"typ": "Betrieb", "stunden": "08:00", "taetigkeiten": "NEU in der App bearbeitet"}] * 5})
+
+    erfolg, meldung = MigrationService(db_manager).migriere()
+
+    assert erfolg and "1 bereits vorhandene" in meldung
+    berichte = db_manager.lade_berichte()
+    assert berichte["2023-01"]["tage_daten"][0]["taetigkeiten"] == "NEU in der App bearbeitet"
+    assert berichte["2023-02"]["tage_daten"][0]["taetigkeiten"] == "ALT aus JSON"
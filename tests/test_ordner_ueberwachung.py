@@ -0,0 +1,61 @@
+# tests/test_ordner_ueberwachung.py
+# -*- coding: utf-8 -*-
+import sys
+import os
+
+# Fügt das Hauptverzeichnis des Projekts zum Python-Pfad hinzu
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.controller import AppController
+from core.data_manager import DataManager
+from services.ordner_ueberwachung import OrdnerUeberwachung
+from tests.test_importer import erstelle_bericht
+
+
+def test_ueberwachter_ordner_meldet_nur_stabile_neue_dateien(db_manager: DataManager, tmp_path):
+    """Testet die Ordnerüberwachung und den automatischen Import der gemeldeten Dateien."""
+    erster = erstelle_bericht(str(tmp_path), 1)
+    ueberwachung = OrdnerUeberwachung(str(tmp_path), lambda pfade: None)
+    # Erst gemeldet, wenn die Datei bei zwei Abfragen unverändert ist
+    assert ueberwachung.pruefe() == []
+    assert ueberwachung.pruefe() == [erster]
+    assert ueberwachung.pruefe() == []
+
+    unterordner = tmp_path / "2024"
+    unterordner.mkdir()
+    zweiter = erstelle_bericht(str(unterordner), 2)
+    assert ueberwachung.pruefe() == []
+    assert ueberwachung.pruefe() == [zweiter]
+
+    # Überschreiben an Ort und Stelle ändert die Änderungszeit des Ordners nicht
+    mtime_ordner = os.stat(tmp_path).st_mtime_ns
+    with open(erster, "ab") as f:
+        f.write(b"\0")
+    assert os.stat(tmp_path).st_mtime_ns == mtime_ordner
+    assert ueberwachung.pruefe() == []
+    assert ueberwachung.pruefe() == [erster]
+    os.truncate(erster, os.path.getsize(erster) - 1)
+    assert ueberwachung.pruefe() == []
+    assert ueberwachung.pruefe() == [erster]
+
+    controller = AppController(db_manager)
+    assert controller.importiere_automatisch([erster, zweiter]) == (2, True)
+    assert db_manager.lade_bericht_ids() == {"2024-01", "2024-02"}
+    # Unveränderte Dateien werden nicht erneut übernommen
+    assert controller.importiere_automatisch([erster]) == (0, True)
+
+
+def test_automatischer_import_uebernimmt_keine_konflikte(db_manager: DataManager, tmp_path):
+    """Widersprüchliche Dateien derselben Woche warten auf die Freigabe im manuellen Import."""
+    eindeutig = erstelle_bericht(str(tmp_path), 1)
+    unterordner = tmp_path / "kopie"
+    unterordner.mkdir()
+    erste_fassung = erstelle_bericht(str(tmp_path), 2)
+    zweite_fassung = erstelle_bericht(str(unterordner), 2, taetigkeit="Andere Aufgabe")
+
+    controller = AppController(db_manager)
+    assert controller.importiere_automatisch([eindeutig, erste_fassung, zweite_fassung]) == (1, True)
+    assert db_manager.lade_bericht_ids() == {"2024-01"}
+    # Die Dateien der Konflikt-Woche gelten nicht als importiert
+    plan = controller.plane_docx_import([erste_fassung, zweite_fassung])
+    assert set(plan.status) == {"2024-02"}
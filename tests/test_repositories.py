@@ -1,29 +1,15 @@
 # tests/test_repositories.py
 # -*- coding: utf-8 -*-
 import pytest
-from typing import Generator
 import sys
 import os
 
 # Fügt das Hauptverzeichnis des Projekts zum Python-Pfad hinzu
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from db.database import Database
 from db.models import Bericht, Tagebucheintrag, Vorlage
 from core.data_manager import DataManager # Der neue DataManager als Fassade
 
-@pytest.fixture
-def db_manager() -> Generator[DataManager, None, None]:
-    """Fixture, das eine saubere In-Memory-DB und einen DataManager für jeden Test bereitstellt."""
-    migrations_root_path = os.path.join(os.path.dirname(__file__), '..', 'migrations')
-    os.makedirs(migrations_root_path, exist_ok=True)
-    
-    db = Database(":memory:", migrations_root_path)
-    db.connect()
-    db.run_migrations()
-    manager = DataManager(db)
-    yield manager
-    db.close()
 
 def test_speichere_und_lade_konfiguration(db_manager: DataManager):
     """Testet das Speichern und Laden von Konfigurationsdaten."""
@@ -92,4 +78,51 @@ def test_speichere_und_lade_vorlagen(db_manager: DataManager):
     
     loaded_vorlagen = db_manager.lade_vorlagen()
     assert len(loaded_vorlagen) == 2
-    assert "Vorlage B" in loaded_vorlagen
\ No newline at end of file
+    assert "Vorlage B" in loaded_vorlagen
+
+
+def test_speichere_und_lade_ausgabe_manifest(db_manager: DataManager):
+    """Testet das Speichern, Ersetzen und gefilterte Laden von Manifest-Einträgen."""
+    assert db_manager.speichere_manifest_eintrag("2024-40", "docx", "hash-a", "1", "a.docx") is True
+    assert db_manager.speichere_manifest_eintrag("2024-40", "pdf", "hash-b", "1", "a.pdf") is True
+    assert db_manager.speichere_manifest_eintrag("2024-40", "docx", "hash-c", "2", "b.docx") is True
+
+    manifest = db_manager.lade_ausgabe_manifest("docx")
+    assert list(manifest) == [("2024-40", "docx")]
+    assert manifest[("2024-40", "docx")]["inhalt_hash"] == "hash-c"
+    assert manifest[("2024-40", "docx")]["dateiname"] == "b.docx"
+    assert len(db_manager.lade_ausgabe_manifest()) == 2
+
+
+def test_ausgabe_index_erkennt_fehlende_und_veraltete_dateien(db_manager: DataManager, tmp_path, monkeypatch):
+    """Testet Ausgabe-Index, Abgleich beim Start und Statusermittlung über den Controller."""
+    from core import config
+    from core.controller import AppController, AUSGABE_AKTUELL, AUSGABE_FEHLT, AUSGABE_VERALTET
+
+    monkeypatch.setattr(config, "OUTPUT_FOLDER", str(tmp_path))
+    controller = AppController(db_manager)
+    db_manager.speichere_konfiguration({"name_azubi": "Max Mustermann", "startdatum_ausbildung": "01.08.2023"})
+    for kw in (40, 41):
+        db_manager.aktualisiere_bericht({
+            "jahr": 2024, "kalenderwoche": kw, "fortlaufende_nr": kw, "name_azubi": "Max Mustermann",
+            "tage_daten": [{"tag_name": "Montag", "typ": "Betrieb", "stunden": "08:00", "taetigkeiten": "Programmieren"}]
+        })
+
+    assert controller.ermittle_ausgabe_status("docx") == {"2024-40": AUSGABE_FEHLT, "2024-41": AUSGABE_FEHLT}
+    assert controller.regeneriere_berichte("docx")["erstellt"] == ["2024-40", "2024-41"]
+    eintrag = db_manager.lade_ausgabe_manifest("docx")[("2024-40", "docx")]
+    assert eintrag["groesse"] == os.path.getsize(tmp_path / eintrag["dateiname"])
+    assert controller.finde_ausgabedatei("2024-40") == str(tmp_path / eintrag["dateiname"])
+
+    # Datei 40 wird extern verändert, Datei 41 gelöscht
+    with open(tmp_path / eintrag["dateiname"], "ab") as f:
+        f.write(b"extern")
+    pfad_41 = controller.finde_ausgabedatei("2024-41", "docx")
+    os.remove(pfad_41)
+
+    assert controller.gleiche_ausgabe_index_ab() == 1
+    assert ("2024-41", "docx") not in db_manager.lade_ausgabe_manifest("docx")
+    assert controller.ermittle_ausgabe_status("docx") == {"2024-40": AUSGABE_VERALTET, "2024-41": AUSGABE_FEHLT}
+    assert controller.finde_ausgabedatei("2024-41") is None
+    controller.regeneriere_berichte("docx")
+    assert set(controller.ermittle_ausgabe_status("docx").values()) == {AUSGABE_AKTUELL}